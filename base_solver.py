@@ -1,8 +1,13 @@
 import collections.abc as abc
+import typing
 import numpy as np
 import numpy.typing as npt
 
 import constraints
+import heuristics
+import single_agent_planner
+import search_limits
+import worker_pool
 
 
 class BaseSolver:
@@ -27,6 +32,10 @@ class BaseSolver:
     :param num_of_agents:   {int}       The number of agents within the environment. Extracted from the supplied goal or 
                                         start positions.
     :param heuristics:      {list}      List containing the heuristics.
+    :param cache_heuristics:{bool}      Flag controlling if heuristics are taken from the process wide heuristics cache
+    :param low_level:       {function}  Low-level search used to plan the path of a single agent, either
+                                        single_agent_planner.a_star or sipp.sipp
+    :param workers:         {int}       Number of worker processes used for work that is independent between agents
     """
 
     def __init__(self,
@@ -36,6 +45,9 @@ class BaseSolver:
                  score_func: abc.Callable[[list[list[tuple[int, int]]]], int],
                  heuristics_func: abc.Callable[[npt.NDArray[bool], tuple[int, int]], dict[tuple[int, int], int]],
                  printing: bool,
+                 cache_heuristics: bool = True,
+                 low_level: abc.Callable[..., typing.Optional[list[tuple[int, int]]]] = single_agent_planner.a_star,
+                 workers: int = 1,
                  **kwargs) -> None:
         """
             Initialise an instance of the BaseSolver class. Calls heuristics_func to fill self.heuristics with data for
@@ -52,7 +64,19 @@ class BaseSolver:
         :param printing:        {bool}      Flag to enable and disable printing within the model. This allows for the
                                             user to specify if they would like to receive the solver outcome after every 
                                             run or not. True enables printing while false disables this behaviour. 
+        :param cache_heuristics:{bool}      Flag controlling if heuristics are taken from the process wide heuristics
+                                            cache. Disabling it recomputes the heuristics for every solver instance.
+        :param low_level:       {function}  Low-level search used to plan the path of a single agent, either
+                                            single_agent_planner.a_star or sipp.sipp
+        :param workers:         {int}       Number of worker processes. With more than one the heuristics of the agents
+                                            are computed in parallel by worker_pool.map_heuristics, which requires a
+                                            picklable heuristics function, and solvers may plan the agents of their
+                                            root in parallel. Results are always returned in the order of the agents.
+
+        :raise:                             ValueError
         """
+        if workers < 1:
+            raise ValueError(f"workers has to be at least 1, got {workers}")
         self.CPU_time: float = 0.0
         self.my_map = my_map
         self.starts = starts
@@ -60,20 +84,43 @@ class BaseSolver:
         self.score_func = score_func
         self.heuristics_func = heuristics_func
         self.printing = printing
+        self.cache_heuristics = cache_heuristics
+        self.low_level = low_level
+        self.workers = workers
 
         self.num_of_agents = len(goals)
-        self.heuristics = []
 
         # compute heuristics for the low-level search
-        for goal in self.goals:
-            self.heuristics.append(self.heuristics_func(my_map, goal))
+        compute = None
+        if self.workers > 1 and self.num_of_agents > 1:
+            def compute(missing: list[tuple[int, int]]) -> list[abc.Mapping[tuple[int, int], int]]:
+                return worker_pool.map_heuristics(my_map, missing, self.heuristics_func, self.workers)
+        if self.cache_heuristics:
+            self.heuristics = heuristics.CACHE.get_all(my_map, self.goals, self.heuristics_func, compute)
+        elif compute is not None:
+            self.heuristics = compute(self.goals)
+        else:
+            self.heuristics = [self.heuristics_func(my_map, goal) for goal in self.goals]
 
-    def find_solution(self, base_constraints: list[constraints.Constraint]) -> list[list[tuple[int, int]]]:
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[search_limits.SearchLimits] = None) -> list[list[tuple[int, int]]]:
         """
             Find solution function, used as a template for the the main solvers
 
-        :param base_constraints:    {list}  Constraints to be considered during the solve procedure
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token shared by all
+                                                    searches of the solver. When exceeded a SearchAborted exception is
+                                                    raised with the counters of solver_stats attached
 
-        :raise:                             NotImplementedError
+        :raise:                                     NotImplementedError
         """
         raise NotImplementedError
+
+    def solver_stats(self) -> dict[str, typing.Any]:
+        """
+            Counters describing the progress of the solver, attached to SearchAborted exceptions raised by find_solution
+
+        :return:    {dict}  counters indexed by name
+        """
+        return {"CPU time": self.CPU_time}
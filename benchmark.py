@@ -0,0 +1,192 @@
+"""
+Micro benchmarks for the performance critical parts of the solvers.
+
+Run from the repository root, for example: python benchmark.py constraints
+"""
+import argparse
+import glob
+import time as timer
+import numpy as np
+
+import map_gen
+import constraints
+import run_experiments
+from cbs import CBSSolver
+from independent import IndependentSolver
+from prioritized import PrioritizedPlanningSolver, PrioritizedPortfolioSolver
+from single_agent_planner import compute_heuristics, a_star, get_sum_of_cost
+from search_limits import SearchStats
+
+
+def bench_constraint_table(map_path: str = "maps/assignment_2.map", agents: int = 40, queries: int = 20000) -> None:
+    """
+        Plans agents one after another in the same way as the prioritized solver and measures the time of a single
+        ConstraintTable.is_constrained call after every planned agent. With a constant cost per lookup the time per
+        expansion stays flat while the number of constraints grows with every planned agent.
+
+    :param map_path:    {str}   map to generate the agents on
+    :param agents:      {int}   number of agents to plan
+    :param queries:     {int}   number of lookups timed after every planned agent
+    """
+    my_map, starts, goals = map_gen.MapGenerator(map_path).generate(agents)
+    free = [(x, y) for x in range(my_map.shape[0]) for y in range(my_map.shape[1]) if not my_map[x, y]]
+    probes = [(free[i % len(free)], free[(i * 7) % len(free)], i % 60) for i in range(queries)]
+
+    constraint_list: list[constraints.Constraint] = []
+    print(f"{'planned agents':>15} {'constraints':>12} {'ns / lookup':>12}")
+    for a in range(agents):
+        path = a_star(my_map, starts[a], goals[a], compute_heuristics(my_map, goals[a]), a, constraint_list)
+        if path is None:  # agent is blocked by the previously planned agents
+            continue
+        for t, path_vertex in enumerate(path[:-1]):
+            constraint_list.append(constraints.Constraint(True, a, t + 1, path_vertex, path[t + 1]))
+        constraint_list.append(constraints.Constraint(True, a, len(path), path[-1], infinite=True))
+
+        table = constraints.ConstraintTable(constraint_list, agents)
+        start_time = timer.perf_counter()
+        for current_loc, next_loc, step in probes:
+            table.is_constrained(current_loc, next_loc, step)
+        elapsed = timer.perf_counter() - start_time
+        if (a + 1) % 5 == 0 or a == 0:
+            print(f"{a + 1:>15} {len(constraint_list):>12} {elapsed / queries * 1e9:>12.0f}")
+
+
+def bench_a_star(map_path: str = "maps/assignment_3.map", agents: int = 40, repeats: int = 5) -> None:
+    """
+        Measures the node expansion rate of the low-level search. The agents are planned one after another in the same
+        way as the prioritized solver, so later searches have to avoid the paths of all previous agents. Every search is
+        repeated to reduce timing noise, the heuristics are computed beforehand and not part of the measurement.
+
+    :param map_path:    {str}   map to generate the agents on
+    :param agents:      {int}   number of agents to plan
+    :param repeats:     {int}   number of times every search is repeated
+    """
+    my_map, starts, goals = map_gen.MapGenerator(map_path).generate(agents)
+    h_values = [compute_heuristics(my_map, goal) for goal in goals]
+
+    constraint_list: list[constraints.Constraint] = []
+    stats = SearchStats()
+    elapsed = 0.0
+    for a in range(agents):
+        table = constraints.ConstraintTable(constraint_list, a)
+        start_time = timer.perf_counter()
+        for _ in range(repeats):
+            path = a_star(my_map, starts[a], goals[a], h_values[a], a, [], table, stats)
+        elapsed += timer.perf_counter() - start_time
+        if path is None:  # agent is blocked by the previously planned agents
+            continue
+        for t, path_vertex in enumerate(path[:-1]):
+            constraint_list.append(constraints.Constraint(True, a, t + 1, path_vertex, path[t + 1]))
+        constraint_list.append(constraints.Constraint(True, a, len(path), path[-1], infinite=True))
+
+    print(f"{'searches':>10} {'expanded':>10} {'generated':>10} {'time [s]':>10} {'expansions / s':>15}")
+    print(f"{agents * repeats:>10} {stats.expanded:>10} {stats.generated:>10} {elapsed:>10.3f} "
+          f"{stats.expanded / elapsed:>15.0f}")
+
+
+def bench_cbs_heuristics(pattern: str = "instances/test_*.txt") -> None:
+    """
+        Solves every instance with CBS using each of the high-level heuristics and reports the summed number of expanded
+        and generated nodes together with the share of expanded nodes saved compared to the search without heuristic.
+        All heuristics are admissible, so the sum of costs has to be equal for all of them.
+
+    :param pattern: {str}   glob pattern of the instances to solve
+    """
+    instances = [run_experiments.import_mapf_instance(file) for file in sorted(glob.glob(pattern))]
+    print(f"{'heuristic':>10} {'cost':>8} {'expanded':>10} {'generated':>10} {'time [s]':>10} {'saved':>8}")
+    baseline = None
+    for heuristic in CBSSolver.HEURISTICS:
+        cost = expanded = generated = 0
+        start_time = timer.perf_counter()
+        for my_map, starts, goals in instances:
+            solver = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, heuristic=heuristic)
+            cost += get_sum_of_cost(solver.find_solution([]))
+            expanded += solver.num_of_expanded
+            generated += solver.num_of_generated
+        elapsed = timer.perf_counter() - start_time
+        if baseline is None:
+            baseline = expanded
+        print(f"{heuristic:>10} {cost:>8} {expanded:>10} {generated:>10} {elapsed:>10.3f} "
+              f"{1 - expanded / baseline:>8.1%}")
+
+
+def bench_parallel_root(size: int = 96, agent_counts: tuple[int, ...] = (50, 100, 200), workers: int = 4) -> None:
+    """
+        Compares the serial and the parallel computation of the heuristics and of the independently planned paths of
+        the agents for increasing numbers of agents. The agents are placed on an open map with a pillar in every fourth
+        cell, the heuristics cache is disabled so every solver computes its heuristics again. The parallel paths have to
+        equal the serial ones.
+
+    :param size:            {int}   width and height of the map
+    :param agent_counts:    {tuple} numbers of agents to plan
+    :param workers:         {int}   number of worker processes of the parallel runs
+    """
+    my_map = np.zeros((size, size), dtype=bool)
+    my_map[2::4, 2::4] = True
+    free = [(y, x) for y in range(size) for x in range(size) if not my_map[y, x]]
+    rng = np.random.default_rng(0)
+    print(f"{'agents':>8} {'workers':>8} {'heuristics [s]':>15} {'paths [s]':>10} {'speedup':>8}")
+    for agents in agent_counts:
+        picks = rng.choice(len(free), 2 * agents, replace=False)
+        starts, goals = [free[i] for i in picks[:agents]], [free[i] for i in picks[agents:]]
+        serial = None
+        for num_workers in (1, workers):
+            start_time = timer.perf_counter()
+            solver = IndependentSolver(my_map, starts, goals, printing=False, cache_heuristics=False,
+                                       workers=num_workers)
+            heuristics_time = timer.perf_counter() - start_time
+            start_time = timer.perf_counter()
+            paths = solver.find_solution([])
+            paths_time = timer.perf_counter() - start_time
+            if serial is None:
+                serial = (paths, heuristics_time + paths_time)
+            elif paths != serial[0]:
+                raise AssertionError(f"parallel paths of {agents} agents differ from the serial paths")
+            print(f"{agents:>8} {num_workers:>8} {heuristics_time:>15.3f} {paths_time:>10.3f} "
+                  f"{serial[1] / (heuristics_time + paths_time):>8.2f}")
+
+
+def bench_portfolio(size: int = 96, agents: int = 150, orderings: int = 4, workers: int = 4) -> None:
+    """
+        Compares a single prioritized planner with the portfolio of priority orders, returning the first solution and
+        the cheapest one. The agents are placed on the open map with pillars of bench_parallel_root. The cost and run
+        time of every ordering of the cheapest run are printed as well.
+
+    :param size:        {int}   width and height of the map
+    :param agents:      {int}   number of agents to plan
+    :param orderings:   {int}   number of priority orders of the portfolio
+    :param workers:     {int}   number of worker processes of the portfolio
+    """
+    my_map = np.zeros((size, size), dtype=bool)
+    my_map[2::4, 2::4] = True
+    free = [(y, x) for y in range(size) for x in range(size) if not my_map[y, x]]
+    picks = np.random.default_rng(0).choice(len(free), 2 * agents, replace=False)
+    starts, goals = [free[i] for i in picks[:agents]], [free[i] for i in picks[agents:]]
+    print(f"{'solver':>16} {'cost':>8} {'time [s]':>9}")
+    start_time = timer.perf_counter()
+    paths = PrioritizedPlanningSolver(my_map, starts, goals, printing=False).find_solution([])
+    print(f"{'prioritized':>16} {get_sum_of_cost(paths):>8} {timer.perf_counter() - start_time:>9.3f}")
+    for first_success in (True, False):
+        start_time = timer.perf_counter()
+        solver = PrioritizedPortfolioSolver(my_map, starts, goals, printing=False, orderings=orderings,
+                                            first_success=first_success, seed=0, workers=workers)
+        paths = solver.find_solution([])
+        name = "portfolio first" if first_success else "portfolio best"
+        print(f"{name:>16} {get_sum_of_cost(paths):>8} {timer.perf_counter() - start_time:>9.3f}")
+    for entry in solver.portfolio_stats:
+        print(f"{entry['ordering']:>16} {str(entry['cost']):>8} {entry.get('CPU time', 0):>9.3f} {entry['status']}")
+
+
+BENCHMARKS = {"constraints": bench_constraint_table,
+              "a_star": bench_a_star,
+              "cbs_heuristics": bench_cbs_heuristics,
+              "parallel_root": bench_parallel_root,
+              "portfolio": bench_portfolio}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs micro benchmarks of the solver components")
+    parser.add_argument("benchmark", type=str, choices=sorted(BENCHMARKS.keys()),
+                        help="The benchmark to run")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark]()
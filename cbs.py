@@ -1,4 +1,6 @@
+import collections
 from collections import abc
+import sys
 import time as timer
 import numpy as np
 import numpy.typing as npt
@@ -6,22 +8,53 @@ import heapq
 import typing
 import constraints
 import collisions
+import conflict_graph
+import joint_planner
+import mdd
+import node_store
+import utils
+import worker_pool
 
-from single_agent_planner import compute_heuristics, a_star, get_sum_of_cost
+from single_agent_planner import a_star, compute_heuristics, get_sum_of_cost, get_longest_path_cost
+from search_limits import SearchStats, SearchLimits, SearchAborted, BudgetExceeded
 import base_solver
 
+# Classes of collisions, a collision is cardinal if resolving it increases the path cost of both agents involved
+NON_CARDINAL = 0
+SEMI_CARDINAL = 1
+CARDINAL = 2
+
+# constraint set hashes of CBS nodes are sums of constraint hashes modulo 2 ** 64
+KEY_MASK = (1 << 64) - 1
+
 
 class CBSNode:
     """
         Individual node on the tree generated by CBS. Primarily used as a memory object to simplify code
-        understandability
-
-    :param cost:        {int}   Cost of the paths planned in this Node base on the chosen cost function
-    :param constraints: {list}  Constraints used for planning the paths
-    :param paths:       {list}  Currently planned paths
-    :param collisions:  {dict}  All occurring collisions in the paths indexed by a tuple of indices of the colliding
-                                agents
-    :param idx:         {int}   Unique index of the node
+        understandability. Nodes only store the constraints they add to their parent in a chain that is shared with
+        the parent, the constraint tables of the agents are shared with the parent unless the added constraints affect
+        them.
+
+    :param chain:           {tuple} Constraints added by this node followed by the chain of the parent node
+    :param constraints:     {list}  Property returning all constraints used for planning the paths
+    :param cost:            {int}   Cost of the paths planned in this Node base on the chosen cost function
+    :param paths:           {list}  Currently planned paths
+    :param collisions:      {dict}  All occurring collisions in the paths indexed by a tuple of indices of the colliding
+                                    agents
+    :param idx:             {int}   Unique index of the node
+    :param tables:          {list}  Constraint table of every agent containing all constraints of this node
+    :param lower_bounds:    {list}  Lower bound on the optimal path cost of every agent proven by the low-level search
+    :param lower_bound:     {int}   Lower bound on the cost of the optimal solution below this node
+    :param mdds:            {list}  MDD of the optimal paths of every agent, built on demand and shared with the parent
+                                    for agents whose constraint table is shared
+    :param h_value:         {int}   Admissible estimate of the cost increase required to resolve all collisions
+    :param groups:          {list}  Meta-agent of every agent given as sorted tuple of the agents planned jointly with
+                                    it, shared with the parent unless agents were merged
+    :param key:             {int}   Hash of the multiset of all constraints of the node, independent of the order in
+                                    which the constraints were added
+    :param record:          {NodeRecord}    Compact record of the node in the memory-bounded mode, None otherwise
+    :param split:           {tuple}         Collision, constraints and children with their submitted low-level searches
+                                            of a node whose expansion was started speculatively, None otherwise
     """
 
     def __init__(self,
@@ -29,27 +62,75 @@ class CBSNode:
                  constraint_list: list[constraints.Constraint],
                  paths: list[list[tuple[int, int]]],
                  collision_dict: dict[tuple[int, int], collisions.Collision],
-                 idx: int) -> None:
+                 idx: int,
+                 parent: typing.Optional["CBSNode"] = None,
+                 tables: typing.Optional[list[constraints.ConstraintTable]] = None,
+                 lower_bounds: typing.Optional[list[int]] = None,
+                 mdds: typing.Optional[list[typing.Optional[mdd.MDD]]] = None,
+                 groups: typing.Optional[list[tuple[int, ...]]] = None) -> None:
         """
             Initialization function of the CBSNode
 
         :param cost:            {int}   Cost of the paths planned in this Node base on the chosen cost function
-        :param constraint_list: {list}  Constraints used for planning the paths
+        :param constraint_list: {list}  Constraints added by this node on top of the constraints of its parent
         :param paths:           {list}  Currently planned paths
         :param collision_dict:  {dict}  All occurring collisions in the paths indexed by a tuple of indices of the colliding
                                         agents
         :param idx:             {int}   Unique index of the node
+        :param parent:          {CBSNode}   Node this node was created from, None for the root node. Only its
+                                            constraint chain is kept to not keep expanded nodes alive
+        :param tables:          {list}  Constraint table of every agent containing all constraints of this node
+        :param lower_bounds:    {list}  Lower bound on the optimal path cost of every agent
+        :param mdds:            {list}  MDD of every agent or None if not built yet
+        :param groups:          {list}  Meta-agent of every agent, every agent is planned on its own if None
         """
         self.cost = cost
-        self.constraints = constraint_list
+        self.chain = (constraint_list, parent.chain if parent is not None else None)
+        self.key = ((parent.key if parent is not None else 0) + sum(hash(c.key) for c in constraint_list)) & KEY_MASK
         self.paths = paths
         self.collisions = collision_dict
         self.idx = idx
+        self.tables = tables if tables is not None else []
+        self.lower_bounds = lower_bounds if lower_bounds is not None else []
+        self.lower_bound = cost
+        self.mdds = mdds if mdds is not None else [None] * len(self.tables)
+        self.h_value = 0
+        self.groups = groups if groups is not None else [(agent,) for agent in range(len(self.tables))]
+        self.record: typing.Optional[node_store.NodeRecord] = None
+        self.split: typing.Optional[tuple[collisions.Collision, tuple[constraints.Constraint, ...], list]] = None
+
+    @property
+    def constraints(self) -> list[constraints.Constraint]:
+        """
+            property collecting the constraints of this node and all its ancestors
+
+        :return:    {list}  all constraints used for planning the paths, starting with those of the root node
+        """
+        return chain_constraints(self.chain)
+
+    def memory_size(self, parent: typing.Optional["CBSNode"] = None) -> int:
+        """
+            Approximates the memory allocated for this node. Constraint tables that are shared with the given parent
+            node are not counted.
+
+        :param parent:  {CBSNode}   Node this node was created from
+
+        :return:        {int}       size in bytes
+        """
+        size = (sys.getsizeof(self) + sys.getsizeof(self.chain) + sys.getsizeof(self.chain[0]) +
+                sys.getsizeof(self.paths) + sys.getsizeof(self.collisions) + sys.getsizeof(self.tables) +
+                sys.getsizeof(self.lower_bounds) + sys.getsizeof(self.mdds))
+        for agent, table in enumerate(self.tables):
+            if parent is None or table is not parent.tables[agent]:
+                size += sys.getsizeof(table)
+        if parent is None or self.groups is not parent.groups:
+            size += sys.getsizeof(self.groups)
+        return size
 
     def __lt__(self, other: "CBSNode") -> bool:
         """
-            Less than comparison between two CBSNodes where first the cost is considered then the number of remaining
-            collisions and lastly the indices
+            Less than comparison between two CBSNodes where first the cost plus the high-level heuristic is considered
+            then the number of remaining collisions and lastly the indices
 
         :param other:   {CBSNode}   Node to compare self with
 
@@ -59,13 +140,29 @@ class CBSNode:
 
         :raise:                     ValueError
         """
-        if self.cost == other.cost:
+        if self.cost + self.h_value == other.cost + other.h_value:
             if len(self.collisions) == len(other.collisions):
                 if self.idx == other.idx:
                     raise ValueError("something does not work properly")
                 return self.idx < other.idx
             return len(self.collisions) < len(other.collisions)
-        return self.cost < other.cost
+        return self.cost + self.h_value < other.cost + other.h_value
+
+
+def chain_constraints(chain: typing.Optional[tuple[list[constraints.Constraint], typing.Any]]
+                      ) -> list[constraints.Constraint]:
+    """
+        Collects the constraints of a chain of constraint lists as stored by CBSNode
+
+    :param chain:   {tuple} Constraints added by a node followed by the chain of its parent, None for an empty chain
+
+    :return:        {list}  all constraints of the chain, starting with those of the root node
+    """
+    constraint_lists = []
+    while chain is not None:
+        constraint_lists.append(chain[0])
+        chain = chain[1]
+    return [c for constraint_list in reversed(constraint_lists) for c in constraint_list]
 
 
 class CBSSolver(base_solver.BaseSolver):
@@ -92,6 +189,49 @@ class CBSSolver(base_solver.BaseSolver):
     :param num_of_expanded:     {bool}      Counter for nodes that where explored by the search
     :param num_of_generated:    {bool}      Counter for nodes that where created by the search
     :param open_list:           {bool}      Heap used to contain and sort nodes during path planning
+    :param node_memory:         {int}       Approximate memory in bytes allocated for all generated nodes
+    :param node_time:           {float}     Time in seconds spent on generating all nodes
+    :param suboptimality:       {float}     Factor w >= 1 by which the solution cost may exceed the optimal cost, values
+                                            above 1 run the solver as Enhanced CBS (ECBS)
+    :param focal_list:          {list}      Heap of the ECBS nodes with a cost of at most w times the lowest lower bound
+                                            of all open nodes, ordered by their number of collisions
+    :param focal_candidates:    {list}      Heap of the ECBS nodes not yet in the focal list ordered by cost
+    :param lower_bound:         {int}       Lower bound on the optimal cost proven when the solution was found
+    :param certified_bound:     {float}     Proven ratio between the cost of the found solution and the optimal cost,
+                                            1 for optimal solutions
+    :param prioritize_conflicts:    {bool}  Flag controlling if cardinal collisions are split first (ICBS)
+    :param num_of_mdds:         {int}       Counter for MDDs that where built to classify collisions
+    :param heuristic:           {str}       High-level heuristic added to the cost of the nodes, one of HEURISTICS
+    :param num_of_pair_solves:  {int}       Counter for the two agent problems solved for the WDG heuristic
+    :param bypass:              {bool}      Flag controlling if splits are bypassed when possible
+    :param num_of_bypasses:     {int}       Counter for splits that were bypassed
+    :param merge_threshold:     {int}       Number of collisions between two meta-agents after which they are merged,
+                                            None to never merge
+    :param conflict_counts:     {dict}      Number of collisions split on during the whole search indexed by the
+                                            sorted pair of agents
+    :param num_of_merges:       {int}       Counter for merges of meta-agents
+    :param detect_duplicates:   {bool}      Flag controlling if generated nodes with the constraints of a node already
+                                            on the open list are pruned
+    :param num_of_pruned:       {int}       Counter for nodes that where pruned as duplicates
+    :param node_keys:           {dict}      Constraint chain and meta-agents of every node pushed onto the open list
+                                            indexed by the constraint hash of the node, grows with every generated node
+                                            and is not spilled in the memory-bounded mode
+    :param memory_budget:       {int}       Resident memory in bytes above which open nodes are spilled to the disk,
+                                            None to keep complete nodes on the open list
+    :param workers:             {int}       Number of worker processes planning the children of a split in parallel
+    :param speculation:         {int}       Number of open nodes after the expanded one whose children are planned
+                                            speculatively by the workers
+    :param num_of_speculations: {int}       Counter for expanded nodes whose children were planned speculatively
+    :param rng:                 {Generator} Random number generator of disjoint splitting
+    :param pool:                {PlannerPool}   Worker processes while find_solution runs with workers, None otherwise
+    :param pair_weights:        {dict}      Cached WDG edge weights indexed by the ids of the constraint tables of both
+                                            agents, the values keep the tables alive so the ids stay unique
+    :param conflict_avoidance:  {bool}      Flag controlling if the low-level search breaks ties between equal cost
+                                            paths in favour of fewer conflicts with the paths of the other agents
+    :param debug:               {bool}      Flag to assert that the incrementally maintained collisions of every node
+                                            equal a full recomputation
+    :param occupancy:           {OccupancyIndex}    Space-time index of the paths of the node that is being expanded,
+                                                    shared by all nodes and synchronised to the expanded node
     """
 
     def __init__(self,
@@ -104,6 +244,19 @@ class CBSSolver(base_solver.BaseSolver):
                      dict[tuple[int, int], int]] = compute_heuristics,
                  printing: bool = True,
                  disjoint: bool = True,
+                 suboptimality: float = 1.0,
+                 conflict_avoidance: typing.Optional[bool] = None,
+                 prioritize_conflicts: bool = True,
+                 heuristic: str = "none",
+                 bypass: bool = False,
+                 merge_threshold: typing.Optional[int] = None,
+                 detect_duplicates: bool = True,
+                 memory_budget: typing.Optional[int] = None,
+                 spill_dir: typing.Optional[str] = None,
+                 workers: int = 1,
+                 speculation: int = 0,
+                 seed: typing.Optional[int] = None,
+                 debug: bool = False,
                  **kwargs) -> None:
         """
             Initialise an instance of the CBSSolver class.
@@ -120,22 +273,178 @@ class CBSSolver(base_solver.BaseSolver):
                                             user to specify if they would like to receive the solver outcome after every
                                             run or not. True enables printing while false disables this behaviour.
         :param disjoint:        {bool}      Flag controlling if disjoint splitting should be used
+        :param suboptimality:   {float}     Factor w >= 1 by which the solution cost may exceed the optimal cost. Values
+                                            above 1 run ECBS: the low-level search becomes a focal search with the same
+                                            factor that avoids conflicts with the paths of the other agents and the
+                                            high-level search expands nodes with few collisions among those costing at
+                                            most w times the lowest lower bound. ECBS requires
+                                            single_agent_planner.a_star as low-level search and a sum of costs or
+                                            longest path cost score function.
+        :param conflict_avoidance:  {bool}  Flag to pass a conflict avoidance table of the other agents' paths to the
+                                            low-level search, which prefers fewer conflicts among paths of equal cost.
+                                            Requires single_agent_planner.a_star as low-level search, None enables it
+                                            only for a_star.
+        :param prioritize_conflicts:    {bool}  Flag to classify the collisions of every expanded node with the MDDs
+                                            of the agents and split on a cardinal collision first, then on a
+                                            semi-cardinal one, like Improved CBS (ICBS). Only used without
+                                            suboptimality as the MDDs require optimal paths.
+        :param heuristic:       {str}       Admissible high-level heuristic, "none" for plain best-first search on the
+                                            cost, "cg" for the minimum vertex cover of the graph of cardinal collisions,
+                                            "dg" for the graph of agents with dependent MDDs and "wdg" for the
+                                            dependency graph weighted by the cost increase of solving both agents
+                                            together. The heuristics require the sum of costs, no suboptimality and
+                                            standard splitting, as with disjoint splitting the agents that are not
+                                            replanned may violate a positive constraint.
+        :param bypass:          {bool}      Flag to adopt the path of a child with the same cost and fewer collisions
+                                            in the expanded node instead of generating its children
+        :param merge_threshold: {int}       Threshold of Meta-Agent CBS (MA-CBS). Once the agents of two meta-agents
+                                            collided more often than this during the search, the collision is resolved
+                                            by merging both into one meta-agent planned with joint_planner.joint_a_star
+                                            instead of splitting. Constraints keep applying to the individual agents of
+                                            a meta-agent. None never merges, merging is not combined with high-level
+                                            heuristics.
+        :param detect_duplicates:   {bool}  Flag to prune a child before its low-level search if a node with the same
+                                            multiset of constraints and the same meta-agents was generated before,
+                                            which happens when splits add the same constraints in a different order
+        :param memory_budget:   {int}       Resident memory in bytes of the process for the memory-bounded mode. Open
+                                            nodes are then stored as node_store.NodeRecord holding only the constraints
+                                            and paths that changed compared to their parent, the paths, constraint
+                                            tables and collisions are rebuilt when a node is expanded. Once the budget
+                                            is exceeded the open nodes that would be expanded last are spilled to a
+                                            temporary file. None keeps complete nodes in memory, the mode requires no
+                                            suboptimality. Duplicate detection still keeps the constraint chain of
+                                            every generated node in memory, one list of new constraints per node as
+                                            the chains share their ancestors, detect_duplicates=False bounds the memory
+                                            by the open list alone. The cached WDG weights are dropped at every
+                                            expansion, as the restored nodes have new constraint tables.
+        :param spill_dir:       {str}       Directory of the temporary file of the memory-bounded mode, the default
+                                            temporary directory if None
+        :param workers:         {int}       Number of worker processes of the parallel mode. The heuristics are computed
+                                            in parallel and the low-level searches of both children of a split run
+                                            concurrently in a worker_pool.PlannerPool that receives the map and
+                                            heuristics once when find_solution starts. The children are still generated
+                                            in the order of their constraints, so the search expands the same nodes as
+                                            with a single process. The agents of the root node are planned in parallel
+                                            as well unless their searches depend on each other, as with conflict
+                                            avoidance or suboptimality.
+        :param speculation:     {int}       Number of open nodes following the expanded one whose collisions are chosen
+                                            and whose children are submitted to the workers before they are expanded.
+                                            The results are used once a node is popped, nodes that are never expanded
+                                            only cost idle worker time. Requires workers, no suboptimality and no
+                                            memory budget.
+        :param seed:            {int}       Seed of the random number generator of disjoint splitting, None uses the
+                                            shared utils.RNG. With a seed the solution and the counters of the search
+                                            are the same for every run.
+        :param debug:           {bool}      Flag to assert that the collisions of every child node, which are derived
+                                            from the collisions of its parent, equal collisions.detect_collisions
+
+        :raise:                     ValueError
         """
-        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing)
+        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing, workers=workers, **kwargs)
         self.disjoint = disjoint
+        if suboptimality < 1:
+            raise ValueError(f"suboptimality has to be at least 1, got {suboptimality}")
+        if suboptimality > 1 and score_func not in self.BOUND_AGGREGATES:
+            raise ValueError("ECBS requires the sum of costs or longest path cost as score function")
+        if suboptimality > 1 and self.low_level is not a_star:
+            raise ValueError("ECBS requires single_agent_planner.a_star as low-level search")
+        if heuristic not in self.HEURISTICS:
+            raise ValueError(f"unknown heuristic {heuristic}, expected one of {', '.join(self.HEURISTICS)}")
+        if heuristic != "none" and (suboptimality > 1 or score_func is not get_sum_of_cost):
+            raise ValueError("high-level heuristics require the sum of costs and no suboptimality")
+        if heuristic != "none" and disjoint:
+            # positive constraints only replan the constrained agent, the MDDs of the other agents can be empty then
+            raise ValueError("high-level heuristics require standard splitting, pass disjoint=False")
+        if merge_threshold is not None and merge_threshold < 0:
+            raise ValueError(f"merge_threshold has to be at least 0, got {merge_threshold}")
+        if merge_threshold is not None and heuristic != "none":
+            raise ValueError("merging meta-agents is not supported together with high-level heuristics")
+        if memory_budget is not None and suboptimality > 1:
+            raise ValueError("the memory-bounded mode requires no suboptimality")
+        if speculation < 0:
+            raise ValueError(f"speculation has to be at least 0, got {speculation}")
+        if speculation > 0 and (workers == 1 or suboptimality > 1 or memory_budget is not None):
+            raise ValueError("speculation requires workers, no suboptimality and no memory budget")
+        self.suboptimality = suboptimality
+        self.lower_bound = 0
+        self.certified_bound = 1.0
+        self.debug = debug
+        if conflict_avoidance is None:
+            conflict_avoidance = self.low_level is a_star
+        if conflict_avoidance and self.low_level is not a_star:
+            raise ValueError("conflict avoidance requires single_agent_planner.a_star as low-level search")
+        self.conflict_avoidance = conflict_avoidance
+        self.prioritize_conflicts = prioritize_conflicts
+        self.num_of_mdds = 0
+        self.heuristic = heuristic
+        self.num_of_pair_solves = 0
+        self.bypass = bypass
+        self.num_of_bypasses = 0
+        self.merge_threshold = merge_threshold
+        self.conflict_counts: dict[tuple[int, int], int] = dict()
+        self.num_of_merges = 0
+        self.detect_duplicates = detect_duplicates
+        self.num_of_pruned = 0
+        self.node_keys: dict[int, list[tuple[typing.Any, list[tuple[int, ...]]]]] = dict()
+        self.pair_weights: dict[tuple[int, int], tuple[constraints.ConstraintTable, constraints.ConstraintTable, int]] \
+            = dict()
+        self.occupancy = collisions.OccupancyIndex()
+        self.speculation = speculation
+        self.num_of_speculations = 0
+        self.rng = np.random.default_rng(seed) if seed is not None else utils.RNG
+        self.pool: typing.Optional[worker_pool.PlannerPool] = None
 
         self.num_of_generated = 0
         self.num_of_expanded = 0
+        self.node_memory = 0
+        self.node_time = 0.0
 
-        self.open_list: list[typing.Any] = []
+        self.memory_budget = memory_budget
+        self.open_list: typing.Any = []
+        if memory_budget is not None:
+            self.open_list = node_store.BoundedOpenList(memory_budget, spill_dir, num_of_agents=self.num_of_agents)
+        self.focal_list: list[tuple[int, int, int, CBSNode]] = []
+        self.focal_candidates: list[tuple[int, int, CBSNode]] = []
+        self.focal_bound = 0.0
+        self.closed: set[int] = set()
 
-    def push_node(self, node: CBSNode) -> None:
+    HEURISTICS = ("none", "cg", "dg", "wdg")
+    # low-level nodes a two agent problem of the WDG heuristic may expand before its dependency is used as weight
+    PAIR_NODE_BUDGET = 20000
+
+    # combines the lower bounds of the individual agents into a lower bound of the score function
+    BOUND_AGGREGATES: dict[abc.Callable[[list[list[tuple[int, int]]]], int], abc.Callable[[list[int]], int]] = {
+        get_sum_of_cost: sum,
+        get_longest_path_cost: max
+    }
+
+    def push_node(self, node: CBSNode, parent: typing.Optional[CBSNode] = None) -> None:
         """
-            Push given node onto the open_list heap and increment the counter for generated nodes
+            Push given node onto the open_list heap and increment the counter for generated nodes, which is used as
+            unique index of the node. In the memory-bounded mode only a compact record of the node is pushed, which
+            refers to the record of the parent for all paths the node did not replan.
 
         :param node:    {CBSNode}   Node to push onto the heap
+        :param parent:  {CBSNode}   Node the given node was created from, None for the root node
         """
-        heapq.heappush(self.open_list, node)
+        node.idx = self.num_of_generated
+        if self.detect_duplicates:
+            self.node_keys.setdefault(node.key, []).append((node.chain, node.groups))
+        if self.memory_budget is not None:
+            paths = {agent: path for agent, path in enumerate(node.paths)
+                     if parent is None or path is not parent.paths[agent]}
+            node.record = node_store.NodeRecord(parent.record if parent is not None else None, node.chain, paths,
+                                                node.cost, node.h_value, node.lower_bound, node.groups, node.key,
+                                                node.idx)
+            self.open_list.push((node.cost + node.h_value, len(node.collisions), node.idx), node.record)
+        elif self.suboptimality > 1:
+            heapq.heappush(self.open_list, (node.lower_bound, node.idx, node))
+            if node.cost <= self.focal_bound:
+                heapq.heappush(self.focal_list, (len(node.collisions), node.cost, node.idx, node))
+            else:
+                heapq.heappush(self.focal_candidates, (node.cost, node.idx, node))
+        else:
+            heapq.heappush(self.open_list, node)
         self.num_of_generated += 1
 
     def pop_node(self) -> CBSNode:
@@ -144,68 +453,678 @@ class CBSSolver(base_solver.BaseSolver):
 
         :return:    {CBSNode}   Next node to use in path planning
         """
-        node: CBSNode = heapq.heappop(self.open_list)
+        if self.suboptimality > 1:
+            return self.pop_focal_node()
+        if self.memory_budget is not None:
+            node = self.restore_node(self.open_list.pop())
+            self.pair_weights.clear()  # only the children of the restored node can share its constraint tables
+        else:
+            node = heapq.heappop(self.open_list)
         self.num_of_expanded += 1
         return node
 
-    def find_solution(self, base_constraints: list[constraints.Constraint]) -> list[list[tuple[int, int]]]:
+    def restore_node(self, record: node_store.NodeRecord) -> CBSNode:
+        """
+            Rebuilds a complete node from its record in the memory-bounded mode. The paths are collected from the
+            records of the ancestors, the constraint tables are compiled from all constraints of the node and the
+            collisions are detected again. MDDs are built on demand as for every other node.
+
+        :param record:  {NodeRecord}    record popped from the open list
+
+        :return:        {CBSNode}       node with the paths, constraints, collisions and costs of the record
+        """
+        paths = record.full_paths(self.num_of_agents)
+        constraint_list = chain_constraints(record.chain)
+        node = CBSNode(record.cost, [], paths, collisions.detect_collisions(paths), record.idx,
+                       tables=[constraints.ConstraintTable(constraint_list, i) for i in range(self.num_of_agents)],
+                       lower_bounds=[len(path) - 1 for path in paths], groups=record.groups)
+        node.chain = record.chain
+        node.key = record.key
+        node.h_value = record.h_value
+        node.lower_bound = record.lower_bound
+        node.record = record
+        return node
+
+    def pop_focal_node(self) -> CBSNode:
+        """
+            Pops the ECBS node with the least collisions from the focal list. Expanded nodes are removed lazily from the
+            open list. Before popping the focal bound is raised to w times the lowest lower bound of the open nodes and
+            all candidates that now fall within the bound are moved into the focal list. The lowest lower bound at this
+            point is a lower bound on the optimal cost and stored in self.lower_bound.
+
+        :return:    {CBSNode}   Next node to use in path planning
+        """
+        while self.open_list[0][1] in self.closed:
+            heapq.heappop(self.open_list)
+        self.lower_bound = self.open_list[0][0]
+        self.focal_bound = max(self.focal_bound, self.suboptimality * self.lower_bound)
+        while len(self.focal_candidates) > 0 and self.focal_candidates[0][0] <= self.focal_bound:
+            _, _, candidate = heapq.heappop(self.focal_candidates)
+            heapq.heappush(self.focal_list, (len(candidate.collisions), candidate.cost, candidate.idx, candidate))
+        _, _, _, node = heapq.heappop(self.focal_list)
+        self.closed.add(node.idx)
+        self.num_of_expanded += 1
+        return node
+
+    def plan_path(self,
+                  node: CBSNode,
+                  agent: int,
+                  stats: SearchStats,
+                  limits: typing.Optional[SearchLimits] = None) -> typing.Optional[list[tuple[int, int]]]:
+        """
+            Plans the path of a single agent with the constraints of the given node. For ECBS the low-level search is
+            run as focal search that avoids the paths the other agents have in the node. Otherwise the paths of the
+            other agents only break ties between optimal paths if conflict avoidance is enabled.
+
+        :param node:    {CBSNode}       Node whose constraint table is used
+        :param agent:   {int}           Agent to plan
+        :param stats:   {SearchStats}   Counters of the low-level search, receive the lower bound on the path cost
+        :param limits:  {SearchLimits}  Optional limits passed on to the low-level search
+
+        :return:        {list}          path of the agent
+        :return:        {None}          no path exists
+        """
+        return worker_pool.plan_agent(self.my_map, self.starts[agent], self.goals[agent], self.heuristics[agent],
+                                      agent, node.tables[agent], self.low_level, stats, limits, self.suboptimality,
+                                      self.avoided_paths(node))
+
+    def avoided_paths(self, node: CBSNode) -> typing.Optional[list[list[tuple[int, int]]]]:
+        """
+            Paths the low-level search avoids conflicts with, those of the node for ECBS or with conflict avoidance
+
+        :param node:    {CBSNode}   Node whose agents are replanned
+
+        :return:        {list}      paths of all agents of the node
+        :return:        {None}      conflicts are not avoided
+        """
+        return node.paths if self.suboptimality > 1 or self.conflict_avoidance else None
+
+    @property
+    def memory_per_node(self) -> float:
+        """
+            property returning the average memory allocated for a generated node
+
+        :return:    {float} average size in bytes
+        """
+        return self.node_memory / max(self.num_of_generated, 1)
+
+    @property
+    def time_per_node(self) -> float:
+        """
+            property returning the average time required to generate a node including its low-level search
+
+        :return:    {float} average time in seconds
+        """
+        return self.node_time / max(self.num_of_generated, 1)
+
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[SearchLimits] = None) -> list[list[tuple[int, int]]]:
+        """
+            runs the CBS algorithm, see search. When the given limits abort the search the high-level counters of
+            solver_stats are attached to the raised exception.
+
+        :param base_constraints:    {list}          List of external constraints to restrict path planning
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token shared by all
+                                                    low-level searches. The deadline and cancellation are also checked
+                                                    before every high-level expansion
+
+        :return:                    {List}          Paths traversed by all agents
+
+        :raise:                                     BaseException
+        :raise:                                     SearchAborted
+        """
+        start_time = timer.time()
+        if self.workers > 1:
+            self.pool = worker_pool.PlannerPool(self.workers, self.my_map, self.starts, self.goals, self.heuristics,
+                                                self.low_level)
+        try:
+            return self.search(base_constraints, limits, start_time)
+        except SearchAborted as error:
+            self.CPU_time = timer.time() - start_time
+            error.solver_stats = self.solver_stats()
+            raise
+        finally:
+            if self.memory_budget is not None:
+                self.open_list.close()
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+
+    def search(self,
+               base_constraints: list[constraints.Constraint],
+               limits: typing.Optional[SearchLimits],
+               start_time: float) -> list[list[tuple[int, int]]]:
         """
             runs the CBS algorithm by first initializing a root-node with the provided base_constraints and calculating
             paths base on those. For every node on the heap then first checks if there are no more collisions and
             returns the agent paths if true. Otherwise expands the first collision into new constraints and creates a
             new node for each of the two constraints to then be put onto the heap.
 
-        :param base_constraints:    {list}  List of external constraints to restrict path planning
+        :param base_constraints:    {list}          List of external constraints to restrict path planning
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
+        :param start_time:          {float}         time.time() value at which find_solution was called
 
-        :return:                    {List}  Paths traversed by all agents
+        :return:                    {List}          Paths traversed by all agents
 
-        :raise:                             BaseException
-        :raise:                             BaseException
+        :raise:                                     BaseException
+        :raise:                                     BaseException
         """
+        stats = SearchStats()
 
-        start_time = timer.time()
-
-        root = CBSNode(0, [*base_constraints], [], dict(), 0)
-        for i in range(self.num_of_agents):  # Find initial path for each agent
-            path = a_star(self.my_map, self.starts[i], self.goals[i], self.heuristics[i],
-                          i, root.constraints)
-            if path is None:
-                raise BaseException('No solutions')
-            root.paths.append(path)
+        node_start = timer.perf_counter()
+        root = CBSNode(0, [*base_constraints], [], dict(), 0,
+                       tables=[constraints.ConstraintTable(base_constraints, i) for i in range(self.num_of_agents)])
+        if self.pool is not None and self.avoided_paths(root) is None:
+            # without conflict avoidance the initial paths do not depend on each other
+            for planned in self.pool.plan_agents(root.tables, limits):
+                if planned is None:
+                    raise BaseException('No solutions')
+                root.paths.append(planned[0][0])
+                root.lower_bounds.append(planned[1][0])
+        else:
+            for i in range(self.num_of_agents):  # Find initial path for each agent
+                path = self.plan_path(root, i, stats, limits)
+                if path is None:
+                    raise BaseException('No solutions')
+                root.paths.append(path)
+                root.lower_bounds.append(stats.lower_bound)
 
         root.cost = self.score_func(root.paths)
+        root.lower_bound = self.node_lower_bound(root)
         root.collisions = collisions.detect_collisions(root.paths)
+        root.h_value = self.node_heuristic(root, limits)
+        self.occupancy = collisions.OccupancyIndex(root.paths)
+        self.node_time += timer.perf_counter() - node_start
+        self.node_memory += root.memory_size()
         self.push_node(root)
 
         while len(self.open_list) > 0:
+            if limits is not None:
+                limits.check()
             current = self.pop_node()
-            if len(current.collisions) == 0:
-                self.CPU_time = timer.time() - start_time
-                if self.printing:
-                    self.print_results(current)
-                return current.paths
-            if self.disjoint:
-                new_constraints = current.collisions[next(iter(current.collisions))].disjoint_splitting()
-            else:
-                new_constraints = current.collisions[next(iter(current.collisions))].standard_splitting()
-
-            for constraint in new_constraints:
-                new = CBSNode(0,
-                              current.constraints + [constraint],
-                              [*current.paths], dict(), self.num_of_generated)
-                path = a_star(self.my_map,
-                              self.starts[constraint.agent],
-                              self.goals[constraint.agent],
-                              self.heuristics[constraint.agent],
-                              constraint.agent, new.constraints)
-                if path:
-                    new.paths[constraint.agent] = path
-                    new.collisions = collisions.detect_collisions(new.paths)
-                    new.cost = self.score_func(new.paths)
-                    self.push_node(new)
+            while True:
+                if len(current.collisions) == 0:
+                    self.CPU_time = timer.time() - start_time
+                    if self.suboptimality == 1:
+                        self.lower_bound = current.cost
+                    self.certified_bound = current.cost / self.lower_bound if self.lower_bound > 0 else 1.0
+                    if self.printing:
+                        self.print_results(current)
+                    return current.paths
+                if current.split is not None:
+                    collision, new_constraints, pending = current.split
+                    current.split = None
+                else:
+                    collision, new_constraints, pending = self.choose_collision(current), None, None
+                self.occupancy.sync(current.paths)
+                if self.should_merge(current, collision):
+                    node_start = timer.perf_counter()
+                    new = self.generate_merged_child(current, collision, stats, limits)
+                    if new is not None:
+                        self.node_time += timer.perf_counter() - node_start
+                        self.node_memory += new.memory_size(current)
+                        self.push_node(new, current)
+                    break
+                if pending is not None:
+                    self.num_of_speculations += 1
+                else:
+                    new_constraints = self.split_collision(collision)
+                    pending = self.prepare_children(current, new_constraints, limits)
+                if self.speculation > 0:
+                    self.speculate(limits)
+                children = self.generate_children(current, pending, stats, limits)
+                if self.bypass and self.apply_bypass(current, [new for new, _ in children], limits):
+                    if limits is not None:
+                        limits.check()
+                    continue
+                for new, node_time in children:
+                    self.node_time += node_time
+                    self.node_memory += new.memory_size(current)
+                    self.push_node(new, current)
+                break
 
         raise BaseException('No solutions')
 
+    def split_collision(self, collision: collisions.Collision) -> tuple[constraints.Constraint, ...]:
+        """
+            Creates the constraints of the children resolving a collision, using the random number generator of the
+            solver for disjoint splitting
+
+        :param collision:   {Collision} Collision chosen for the split
+
+        :return:            {tuple}     one constraint per child
+        """
+        if self.disjoint:
+            return collision.disjoint_splitting(self.rng)
+        return collision.standard_splitting()
+
+    def prepare_children(self,
+                         parent: CBSNode,
+                         new_constraints: abc.Iterable[constraints.Constraint],
+                         limits: typing.Optional[SearchLimits]
+                         ) -> list[tuple[CBSNode, tuple[int, ...], typing.Any]]:
+        """
+            Creates the children of a node resolving a collision with the given constraints, before their constrained
+            meta-agents are replanned. In the parallel mode the low-level searches of all children are submitted to the
+            workers right away, except for children that are already known duplicates.
+
+        :param parent:          {CBSNode}       Node that is being expanded
+        :param new_constraints: {list}          Constraint added by every child
+        :param limits:          {SearchLimits}  Optional limits passed on to the workers
+
+        :return:                {list}          child, meta-agent to replan and future of its search or None for every
+                                                constraint
+        """
+        pending = []
+        for constraint in new_constraints:
+            new = CBSNode(0, [constraint], [*parent.paths], dict(), -1, parent, [*parent.tables],
+                          [*parent.lower_bounds], [*parent.mdds], parent.groups)
+            # Positive constraints restrict every agent, negative ones only the constrained agent
+            for agent in (range(self.num_of_agents) if constraint.positive else [constraint.agent]):
+                new.tables[agent] = parent.tables[agent].copy()
+                new.tables[agent].add(constraint)
+                new.mdds[agent] = None
+            group = new.groups[constraint.agent]
+            future = None
+            if self.pool is not None and not self.is_duplicate(new, count=False):
+                future = self.pool.submit(group, [new.tables[agent] for agent in group], limits, self.suboptimality,
+                                          self.avoided_paths(new))
+            pending.append((new, group, future))
+        return pending
+
+    def generate_children(self,
+                          parent: CBSNode,
+                          pending: list[tuple[CBSNode, tuple[int, ...], typing.Any]],
+                          stats: SearchStats,
+                          limits: typing.Optional[SearchLimits]) -> list[tuple[CBSNode, float]]:
+        """
+            Completes the children created by prepare_children in the order of their constraints. Duplicates are
+            pruned, the constrained meta-agent of every other child is replanned or its submitted search is awaited.
+            The children receive their index when they are pushed onto the open list.
+
+        :param parent:  {CBSNode}       Node that is being expanded
+        :param pending: {list}          children returned by prepare_children
+        :param stats:   {SearchStats}   Counters of the low-level search
+        :param limits:  {SearchLimits}  Optional limits passed on to the low-level search
+
+        :return:        {list}          children with planned paths, detected collisions, cost and heuristic together
+                                        with the time spent on generating them
+        """
+        children = []
+        for new, group, future in pending:
+            node_start = timer.perf_counter()
+            if self.is_duplicate(new):
+                continue
+            if future is not None:
+                planned = self.pool.result(future, limits)
+            else:
+                planned = self.plan_group(new, group, stats, limits)
+            if planned is not None:
+                self.update_child(parent, new, group, *planned, limits)
+                children.append((new, timer.perf_counter() - node_start))
+        return children
+
+    def speculate(self, limits: typing.Optional[SearchLimits]) -> None:
+        """
+            Starts the expansion of the open nodes that follow the node being expanded: their collisions are chosen
+            and split and the low-level searches of their children are submitted to the workers. The nodes are pushed
+            back unchanged, their split is completed when they are popped, so the search still expands the nodes in
+            the same order.
+
+        :param limits:  {SearchLimits}  Optional limits passed on to the workers
+        """
+        nodes = [heapq.heappop(self.open_list) for _ in range(min(self.speculation, len(self.open_list)))]
+        for node in nodes:
+            if node.split is None and len(node.collisions) > 0:
+                collision = self.choose_collision(node)
+                new_constraints = self.split_collision(collision)
+                node.split = (collision, new_constraints, self.prepare_children(node, new_constraints, limits))
+            heapq.heappush(self.open_list, node)
+
+    def generate_merged_child(self,
+                              parent: CBSNode,
+                              collision: collisions.Collision,
+                              stats: SearchStats,
+                              limits: typing.Optional[SearchLimits]) -> typing.Optional[CBSNode]:
+        """
+            Creates the single child of a node resolving a collision by merging the meta-agents of both colliding
+            agents. The child adds no constraints, the merged meta-agent is planned jointly under the constraint tables
+            of its agents.
+
+        :param parent:      {CBSNode}       Node that is being expanded
+        :param collision:   {Collision}     Collision between the meta-agents to merge
+        :param stats:       {SearchStats}   Counters of the low-level search
+        :param limits:      {SearchLimits}  Optional limits passed on to the low-level search
+
+        :return:            {CBSNode}       child with planned paths, detected collisions, cost and heuristic
+        :return:            {None}          the merged meta-agent has no collision free paths or the child is a
+                                            duplicate
+        """
+        self.num_of_merges += 1
+        group = tuple(sorted({*parent.groups[collision.agent_0], *parent.groups[collision.agent_1]}))
+        groups = [*parent.groups]
+        for agent in group:
+            groups[agent] = group
+        new = CBSNode(0, [], [*parent.paths], dict(), -1, parent, [*parent.tables], [*parent.lower_bounds],
+                      [*parent.mdds], groups)
+        if self.is_duplicate(new):
+            return None
+        planned = self.plan_group(new, group, stats, limits)
+        if planned is None:
+            return None
+        self.update_child(parent, new, group, *planned, limits)
+        return new
+
+    def is_duplicate(self, node: CBSNode, count: bool = True) -> bool:
+        """
+            Checks if a node with the same multiset of constraints and the same meta-agents was pushed onto the open
+            list before and counts the node as pruned if so. Nodes are looked up by their constraint hash, the
+            constraints are only compared when the hashes are equal.
+
+        :param node:    {CBSNode}   New node whose paths are not planned yet
+        :param count:   {bool}      Flag to count a duplicate as pruned node
+
+        :return:        {bool}      True if the node is a duplicate and can be discarded
+        """
+        if not self.detect_duplicates or node.key not in self.node_keys:
+            return False
+        counts = collections.Counter(c.key for c in node.constraints)
+        for chain, groups in self.node_keys[node.key]:
+            if groups == node.groups and collections.Counter(c.key for c in chain_constraints(chain)) == counts:
+                self.num_of_pruned += count
+                return True
+        return False
+
+    def plan_group(self,
+                   node: CBSNode,
+                   group: tuple[int, ...],
+                   stats: SearchStats,
+                   limits: typing.Optional[SearchLimits]
+                   ) -> typing.Optional[tuple[list[list[tuple[int, int]]], list[int]]]:
+        """
+            Replans a meta-agent under the constraints of a node, a single agent with the low-level search of the
+            solver and larger meta-agents with joint_planner.joint_a_star
+
+        :param node:    {CBSNode}       Node whose constraint tables are used
+        :param group:   {tuple}         Agents of the meta-agent to replan
+        :param stats:   {SearchStats}   Counters of the low-level search
+        :param limits:  {SearchLimits}  Optional limits passed on to the low-level search
+
+        :return:        {tuple}         path and lower bound on the path cost of every agent of the meta-agent
+        :return:        {None}          the meta-agent has no paths under the constraints of the node
+        """
+        return worker_pool.plan_group(self.my_map, self.starts, self.goals, self.heuristics, group,
+                                      [node.tables[agent] for agent in group], self.low_level, stats, limits,
+                                      self.suboptimality, self.avoided_paths(node))
+
+    def update_child(self,
+                     parent: CBSNode,
+                     node: CBSNode,
+                     group: tuple[int, ...],
+                     paths: list[list[tuple[int, int]]],
+                     lower_bounds: list[int],
+                     limits: typing.Optional[SearchLimits]) -> None:
+        """
+            Stores the replanned paths of a meta-agent in a new child node and updates the collisions, cost, lower
+            bound and heuristic of the child
+
+        :param parent:          {CBSNode}       Node the child was created from
+        :param node:            {CBSNode}       Child node to update
+        :param group:           {tuple}         Agents of the replanned meta-agent
+        :param paths:           {list}          New path of every agent of the meta-agent
+        :param lower_bounds:    {list}          Lower bound on the path cost of every agent of the meta-agent
+        :param limits:          {SearchLimits}  Optional limits for the heuristic of the child
+        """
+        for agent, path, lower_bound in zip(group, paths, lower_bounds):
+            node.paths[agent] = path
+            node.lower_bounds[agent] = lower_bound
+            if len(group) > 1:
+                node.mdds[agent] = None
+        node.collisions = self.child_collisions(parent, {agent: node.paths[agent] for agent in group})
+        if self.debug:
+            expected = collisions.detect_collisions(node.paths)
+            assert list(node.collisions.items()) == list(expected.items()), \
+                f"incremental collisions of the child of node {parent.idx} differ from a full recomputation"
+        node.cost = self.score_func(node.paths)
+        node.lower_bound = self.node_lower_bound(node)
+        node.h_value = self.node_heuristic(node, limits)
+
+    def should_merge(self, node: CBSNode, collision: collisions.Collision) -> bool:
+        """
+            Counts the collision chosen for a split between its two agents and checks if their meta-agents have to be
+            merged. The counts are kept over the whole search, like the conflict matrix of MA-CBS, and the count of two
+            meta-agents is the sum over all pairs of their agents.
+
+        :param node:        {CBSNode}   Node that is being expanded
+        :param collision:   {Collision} Collision chosen for the split
+
+        :return:            {bool}      True if the meta-agents collided more often than the merge threshold
+        """
+        if self.merge_threshold is None:
+            return False
+        group_0, group_1 = node.groups[collision.agent_0], node.groups[collision.agent_1]
+        if group_0 == group_1:
+            return False
+        pair = (min(collision.agent_0, collision.agent_1), max(collision.agent_0, collision.agent_1))
+        self.conflict_counts[pair] = self.conflict_counts.get(pair, 0) + 1
+        count = sum(self.conflict_counts.get((min(agent_0, agent_1), max(agent_0, agent_1)), 0)
+                    for agent_0 in group_0 for agent_1 in group_1)
+        return count > self.merge_threshold
+
+    def apply_bypass(self,
+                     node: CBSNode,
+                     children: list[CBSNode],
+                     limits: typing.Optional[SearchLimits] = None) -> bool:
+        """
+            Bypass of a split: if a child found a path of the same cost that leaves fewer collisions, the path is
+            adopted by the node itself instead of generating the children. The path satisfies the constraints of the
+            child and therefore also those of the node, the constraint tables, MDDs and lower bounds of the node stay
+            valid. Among several such children the one with the fewest collisions is adopted.
+
+        :param node:        {CBSNode}   Node that is being expanded, updated in place
+        :param children:    {list}      Children generated for the chosen collision
+        :param limits:      {SearchLimits}  Optional limits for the heuristic of the updated node
+
+        :return:            {bool}      True if the node was updated and has to be expanded again
+        """
+        candidates = [child for child in children
+                      if child.cost == node.cost and len(child.collisions) < len(node.collisions)]
+        if len(candidates) == 0:
+            return False
+        child = min(candidates, key=lambda candidate: len(candidate.collisions))
+        if node.record is not None:  # children of the node refer to its record for the paths they did not replan
+            node.record = node_store.NodeRecord(node.record, node.chain,
+                                                {agent: path for agent, path in enumerate(child.paths)
+                                                 if path is not node.paths[agent]},
+                                                node.cost, node.h_value, node.lower_bound, node.groups, node.key,
+                                                node.idx)
+        node.paths = child.paths
+        node.collisions = child.collisions
+        node.h_value = self.node_heuristic(node, limits)
+        self.num_of_bypasses += 1
+        return True
+
+    def get_mdd(self, node: CBSNode, agent: int) -> mdd.MDD:
+        """
+            Returns the MDD of the optimal paths of an agent under the constraints of the given node. MDDs are cached
+            in the nodes and shared with the children that did not change the constraint table of the agent.
+
+        :param node:    {CBSNode}   Node whose constraint table and path cost are used
+        :param agent:   {int}       Agent to build the MDD for
+
+        :return:        {MDD}       MDD of the agent
+        """
+        if node.mdds[agent] is None:
+            node.mdds[agent] = mdd.MDD(self.my_map, self.starts[agent], self.goals[agent], self.heuristics[agent],
+                                       node.tables[agent], len(node.paths[agent]) - 1)
+            self.num_of_mdds += 1
+        return node.mdds[agent]
+
+    def classify_collision(self, node: CBSNode, collision: collisions.Collision) -> int:
+        """
+            Classifies a collision with the MDDs of both agents. Resolving the collision increases the cost of an agent
+            if all its optimal paths pass the location of a vertex collision, or traverse the edge of an edge
+            collision, which is the case if the MDD has a single location at the timesteps involved. With disjoint
+            splitting the path of an agent that was not replanned may violate a constraint added for another agent,
+            its MDD is empty then and the agent does not count towards the class of the collision.
+
+        :param node:        {CBSNode}   Node containing the collision
+        :param collision:   {Collision} Collision to classify
+
+        :return:            {int}       CARDINAL if the cost of both agents increases, SEMI_CARDINAL if the cost of one
+                                        agent increases and NON_CARDINAL otherwise
+        """
+        steps = [collision.step - 1, collision.step] if collision.edge else [collision.step]
+        return sum(all(self.get_mdd(node, agent).width(step) == 1 for step in steps)
+                   for agent in (collision.agent_0, collision.agent_1))
+
+    def node_heuristic(self, node: CBSNode, limits: typing.Optional[SearchLimits] = None) -> int:
+        """
+            Computes the high-level heuristic of a node as the minimum vertex cover of a graph between the colliding
+            agents. Only agents with a collision in the node can be connected, as the current paths of all other pairs
+            are a combination of optimal paths without collision.
+
+        :param node:    {CBSNode}       Node with planned paths and detected collisions
+        :param limits:  {SearchLimits}  Optional limits whose deadline and token also stop the two agent problems
+
+        :return:        {int}           admissible estimate of the cost increase to resolve all collisions
+        """
+        if self.heuristic == "none" or len(node.collisions) == 0:
+            return 0
+        weights = dict()
+        for pair, collision in node.collisions.items():
+            if self.heuristic == "cg":
+                weights[pair] = int(self.classify_collision(node, collision) == CARDINAL)
+            elif self.classify_collision(node, collision) == CARDINAL or \
+                    conflict_graph.dependent(self.get_mdd(node, pair[0]), self.get_mdd(node, pair[1])):
+                weights[pair] = self.pair_weight(node, *pair, limits) if self.heuristic == "wdg" else 1
+        return conflict_graph.minimum_vertex_cover(weights)
+
+    def pair_weight(self, node: CBSNode, agent_0: int, agent_1: int, limits: typing.Optional[SearchLimits]) -> int:
+        """
+            Edge weight of the WDG heuristic, the increase of the summed cost of two dependent agents when solving
+            them together under the constraints of the node. The two agent problem is solved with a nested CBSSolver
+            and cached by the constraint tables of both agents. If it exceeds PAIR_NODE_BUDGET low-level nodes the
+            weight falls back to 1, which is admissible as the agents are dependent.
+
+        :param node:    {CBSNode}       Node containing a collision between the agents
+        :param agent_0: {int}           First agent
+        :param agent_1: {int}           Second agent
+        :param limits:  {SearchLimits}  Optional limits whose deadline and token also stop the two agent problem
+
+        :return:        {int}           cost increase of the pair, at least 1
+        """
+        key = (id(node.tables[agent_0]), id(node.tables[agent_1]))
+        if key in self.pair_weights:
+            return self.pair_weights[key][2]
+
+        pair_constraints = []
+        for c in node.constraints:
+            if c.agent in (agent_0, agent_1) or c.positive:
+                agent = 0 if c.agent == agent_0 else 1 if c.agent == agent_1 else 2
+                pair_constraints.append(constraints.Constraint(c.positive, agent, c.step, c.loc_1, c.loc_2, c.infinite))
+        solver = CBSSolver(self.my_map, [self.starts[agent_0], self.starts[agent_1]],
+                           [self.goals[agent_0], self.goals[agent_1]], printing=False, disjoint=False,
+                           cache_heuristics=self.cache_heuristics, low_level=self.low_level,
+                           heuristics_func=self.heuristics_func)
+        pair_limits = SearchLimits(self.PAIR_NODE_BUDGET,
+                                   deadline=limits.deadline if limits is not None else None,
+                                   token=limits.token if limits is not None else None)
+        self.num_of_pair_solves += 1
+        try:
+            paths = solver.find_solution(pair_constraints, pair_limits)
+            weight = max(1, get_sum_of_cost(paths) - len(node.paths[agent_0]) - len(node.paths[agent_1]) + 2)
+        except BudgetExceeded:
+            weight = 1
+        except SearchAborted:
+            raise
+        except BaseException as error:
+            if type(error) is not BaseException:  # only a plain BaseException signals that the pair has no solution
+                raise
+            weight = 1
+        self.pair_weights[key] = (node.tables[agent_0], node.tables[agent_1], weight)
+        return weight
+
+    def choose_collision(self, node: CBSNode) -> collisions.Collision:
+        """
+            Selects the collision of a node to split on. With conflict prioritization the first cardinal collision is
+            selected, if there is none the first semi-cardinal one and otherwise the first collision. MDDs are only
+            built for the agents of the collisions checked until a cardinal collision is found.
+
+        :param node:    {CBSNode}   Node with at least one collision
+
+        :return:        {Collision} collision to resolve
+        """
+        first = node.collisions[next(iter(node.collisions))]
+        if not self.prioritize_conflicts or self.suboptimality > 1:
+            return first
+        best, best_class = first, NON_CARDINAL
+        for collision in node.collisions.values():
+            collision_class = self.classify_collision(node, collision)
+            if collision_class == CARDINAL:
+                return collision
+            if collision_class > best_class:
+                best, best_class = collision, collision_class
+        return best
+
+    def child_collisions(self,
+                         parent: CBSNode,
+                         paths: dict[int, list[tuple[int, int]]]) -> dict[tuple[int, int], collisions.Collision]:
+        """
+            Derives the collisions of a child node in which only the paths of one meta-agent were replanned. The
+            collisions between the other agents are inherited from the parent, only the pairs involving a replanned
+            agent are checked again using the occupancy index, which has to be synchronised to the parent paths. The
+            agents of a meta-agent are planned jointly and never collide with each other. The result is ordered by
+            agent pair like collisions.detect_collisions.
+
+        :param parent:  {CBSNode}   node the child was created from
+        :param paths:   {dict}      new paths of the replanned agents indexed by agent
+
+        :return:        {dict}      All occurring collisions in the paths of the child indexed by a tuple of indices of
+                                    the colliding agents
+        """
+        found = dict()
+        for agent, path in paths.items():
+            for other, collision in self.occupancy.first_conflicts(agent, path).items():
+                if other not in paths:
+                    found[(collision.agent_0, collision.agent_1)] = collision
+        for pair, collision in parent.collisions.items():
+            if pair[0] not in paths and pair[1] not in paths:
+                found[pair] = collision
+        return dict(sorted(found.items()))
+
+    def solver_stats(self) -> dict[str, typing.Any]:
+        """
+            Counters describing the progress of the high-level search, attached to SearchAborted exceptions
+
+        :return:    {dict}  counters indexed by name
+        """
+        return {**super().solver_stats(),
+                "expanded nodes": self.num_of_expanded,
+                "generated nodes": self.num_of_generated,
+                "pruned nodes": self.num_of_pruned,
+                "spilled nodes": self.open_list.num_of_spilled if self.memory_budget is not None else 0,
+                "MDDs": self.num_of_mdds,
+                "pair solves": self.num_of_pair_solves,
+                "bypasses": self.num_of_bypasses,
+                "merges": self.num_of_merges,
+                "speculations": self.num_of_speculations,
+                "lower bound": self.lower_bound}
+
+    def node_lower_bound(self, node: CBSNode) -> int:
+        """
+            Combines the lower bounds of the individual agents into a lower bound on the cost of the node. Without
+            suboptimality the paths are optimal and the cost itself is returned.
+
+        :param node:    {CBSNode}   Node with planned paths
+
+        :return:        {int}       lower bound on the cost of the best solution below the node
+        """
+        if self.suboptimality == 1:
+            return node.cost
+        return self.BOUND_AGGREGATES[self.score_func](node.lower_bounds)
+
     def print_results(self, node: CBSNode) -> None:
         """
             print results of CBS
@@ -215,5 +1134,9 @@ class CBSSolver(base_solver.BaseSolver):
         print("\n Found a solution! \n")
         print("CPU time (s):    {:.2f}".format(self.CPU_time))
         print("Sum of costs:    {}".format(self.score_func(node.paths)))
+        print("Certified bound: {:.3f} (lower bound {})".format(self.certified_bound, self.lower_bound))
         print("Expanded nodes:  {}".format(self.num_of_expanded))
         print("Generated nodes: {}".format(self.num_of_generated))
+        print("Pruned nodes:    {}".format(self.num_of_pruned))
+        print("Time per node (ms):      {:.3f}".format(self.time_per_node * 1e3))
+        print("Memory per node (bytes): {:.0f}".format(self.memory_per_node))
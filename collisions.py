@@ -7,6 +7,10 @@ import numpy as np
 from single_agent_planner import get_location
 
 
+# below this number of agents checking every pair in python is faster than the fixed overhead of the numpy detection
+VECTORIZE_MIN_AGENTS = 8
+
+
 class Collision:
     """
         Class to represent Collisions. Utilised heavily within the collision based search (cbs) algorithm. It can
@@ -164,26 +168,296 @@ def detect_collision(agent_0: int,
     return None
 
 
+def path_matrix(paths: list[list[tuple[int, int]]]) -> npt.NDArray[np.int64]:
+    """
+        Pads all paths to the length of the longest path by repeating their last location and encodes every location as
+        flat cell id, giving an agents x time matrix. Locations are shifted by the smallest coordinates occurring, so
+        locations outside a map are supported as well.
+
+    :param paths:   {list}          paths of all agents
+
+    :return:        {np.ndarray}    int64 array of shape (number of agents, longest path length) containing the cell id
+                                    of every agent at every timestep
+    """
+    lengths = np.fromiter((len(p) for p in paths), dtype=np.int64, count=len(paths))
+    locations = np.array([loc for p in paths for loc in p], dtype=np.int64).reshape(-1, 2)
+    locations -= locations.min(axis=0)
+    cells = locations[:, 0] * (locations[:, 1].max() + 1) + locations[:, 1]
+
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    steps = np.minimum(np.arange(lengths.max()), (lengths - 1)[:, None])
+    return cells[offsets[:, None] + steps]
+
+
+def equal_key_pairs(keys: npt.NDArray[np.int64]) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+        Finds all pairs of positions in a flattened time x agents array that share the same key. A stable sort keeps
+        the agents of every group of equal keys in ascending order, so the first position of every pair always belongs
+        to the lower agent. Groups of more than two agents are handled by also comparing elements further apart in the
+        sorted order.
+
+    :param keys:    {np.ndarray}    flattened time x agents array of keys, negative keys are ignored
+
+    :return:        {np.ndarray}    flat index of the first element of every pair
+    :return:        {np.ndarray}    flat index of the second element of every pair
+    """
+    order = np.argsort(keys, kind="stable")
+    order = order[keys[order] >= 0]
+    sorted_keys = keys[order]
+    first, second = [], []
+    distance = 1
+    while distance < len(order):
+        equal = np.nonzero(sorted_keys[:-distance] == sorted_keys[distance:])[0]
+        if len(equal) == 0:
+            break
+        first.append(order[equal])
+        second.append(order[equal + distance])
+        distance += 1
+    if len(first) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
 def detect_collisions(paths: list[list[tuple[int, int]]]) -> dict[tuple[int, int], Collision]:
     """
-        Function to generate a list of first collisions between all agent pairs
-    
+        Function to generate a list of first collisions between all agent pairs. Instead of comparing every pair of
+        paths the paths are padded into an agents x time matrix of cell ids. Vertex collisions are agents sharing a cell
+        at the same timestep and edge collisions are agents traversing the same edge in opposite directions during the
+        same move, both are found by sorting the timestep and cell or edge of all agents and comparing neighbours. The
+        earliest collision of each pair is selected in the same order as detect_collision checks them, where a vertex
+        collision at timestep t precedes an edge collision during the move from t to t + 1. For less than
+        VECTORIZE_MIN_AGENTS agents the pairs are checked one by one with detect_collision instead.
+
     :param paths:   {list}  List of list of tuple of two integer. Describing the paths of the various agents, located
                             within the environment.
 
     :return:        {dict}  Dictionary containing the identified first collisions between all agent pairs (if a 
                             collision) exists. The indexing used in this dictionary are tuples of two agent ids which
-                            correspond to the agents that are causing the collision at that index.
+                            correspond to the agents that are causing the collision at that index. The pairs are
+                            ordered in the same way as when checking every agent pair with detect_collision.
     """
     res: dict[tuple[int, int], Collision] = dict()
-    
-    # Loop over all possible agent pairs
-    for a0, p0 in enumerate(paths[:-1]):
-        for a1, p1 in enumerate(paths[a0 + 1:]):
-            
-            collision = detect_collision(a0, a0 + a1 + 1, p0, p1)
-            
-            # Check if collision exists
-            if collision:
-                res[(a0, a0 + a1 + 1)] = collision
+    if len(paths) < max(VECTORIZE_MIN_AGENTS, 2):
+        # Loop over all possible agent pairs
+        for a0, p0 in enumerate(paths[:-1]):
+            for a1, p1 in enumerate(paths[a0 + 1:]):
+
+                collision = detect_collision(a0, a0 + a1 + 1, p0, p1)
+
+                # Check if collision exists
+                if collision:
+                    res[(a0, a0 + a1 + 1)] = collision
+        return res
+
+    matrix = path_matrix(paths)
+    num_agents, length = matrix.shape
+    num_cells = int(matrix.max()) + 1
+
+    # Vertex collisions, keyed by (timestep, cell)
+    vertex_keys = (np.arange(length)[:, None] * num_cells + matrix.T).ravel()
+    first, second = equal_key_pairs(vertex_keys)
+    agents_0, agents_1, times = first % num_agents, second % num_agents, first // num_agents
+    order_keys = 2 * times
+
+    # Edge collisions, keyed by (timestep, undirected edge) for every agent that moves
+    if length > 1:
+        current, following = matrix[:, :-1].T, matrix[:, 1:].T
+        edge_keys = (np.arange(length - 1)[:, None] * num_cells + np.minimum(current, following)) * num_cells + \
+            np.maximum(current, following)
+        edge_keys[current == following] = -1
+        edge_first, edge_second = equal_key_pairs(edge_keys.ravel())
+        swapped = current.ravel()[edge_first] != current.ravel()[edge_second]
+        edge_first, edge_second = edge_first[swapped], edge_second[swapped]
+        agents_0 = np.concatenate((agents_0, edge_first % num_agents))
+        agents_1 = np.concatenate((agents_1, edge_second % num_agents))
+        times = np.concatenate((times, edge_first // num_agents))
+        order_keys = np.concatenate((order_keys, 2 * (edge_first // num_agents) + 1))
+
+    # First collision of every pair, pairs in ascending order
+    pair_ids = agents_0 * num_agents + agents_1
+    order = np.lexsort((order_keys, pair_ids))
+    _, firsts = np.unique(pair_ids[order], return_index=True)
+    for idx in order[firsts].tolist():
+        a0, a1, t = int(agents_0[idx]), int(agents_1[idx]), int(times[idx])
+        if order_keys[idx] % 2 == 0:
+            res[(a0, a1)] = Collision(a0, a1, t, get_location(paths[a0], t))
+        else:
+            res[(a0, a1)] = Collision(a0, a1, t + 1, get_location(paths[a0], t), get_location(paths[a0], t + 1))
     return res
+
+
+class OccupancyIndex:
+    """
+        Space-time index of the locations occupied by a set of paths. Every timestep of a path before its last one is
+        stored in cells, the last location is stored in goals as agents remain there forever, so these goal-waiting
+        tails are never materialized. Adding or removing a path takes O(len(path)).
+
+    :param cells:   {dict}  agents at every location and timestep, indexed by location and then by timestep
+    :param goals:   {dict}  timestep from which each agent waits at its goal, indexed by location and then by agent
+    :param moves:   {dict}  agents moving between two distinct locations, indexed by (from_loc, to_loc, step) with step
+                            being the timestep of arrival
+    :param paths:   {dict}  indexed path of every agent
+    """
+
+    def __init__(self, paths: typing.Optional[list[list[tuple[int, int]]]] = None) -> None:
+        """
+            Initialization function of the OccupancyIndex
+
+        :param paths:   {list}  paths to add, the index in the list is used as agent id
+        """
+        self.cells: dict[tuple[int, int], dict[int, set[int]]] = dict()
+        self.goals: dict[tuple[int, int], dict[int, int]] = dict()
+        self.moves: dict[tuple[tuple[int, int], tuple[int, int], int], set[int]] = dict()
+        self.paths: dict[int, list[tuple[int, int]]] = dict()
+        for agent, path in enumerate(paths or []):
+            self.add(agent, path)
+
+    def add(self, agent: int, path: list[tuple[int, int]]) -> None:
+        """
+            Adds the path of an agent, replacing its previous path if present
+
+        :param agent:   {int}   agent id
+        :param path:    {list}  path of the agent
+        """
+        if agent in self.paths:
+            self.remove(agent)
+        self.paths[agent] = path
+        for t, loc in enumerate(path[:-1]):
+            self.cells.setdefault(loc, dict()).setdefault(t, set()).add(agent)
+            if loc != path[t + 1]:
+                self.moves.setdefault((loc, path[t + 1], t + 1), set()).add(agent)
+        self.goals.setdefault(path[-1], dict())[agent] = len(path) - 1
+
+    def remove(self, agent: int) -> None:
+        """
+            Removes the path of an agent
+
+        :param agent:   {int}   agent id
+        """
+        path = self.paths.pop(agent)
+        for t, loc in enumerate(path[:-1]):
+            steps = self.cells[loc]
+            steps[t].discard(agent)
+            if len(steps[t]) == 0:
+                del steps[t]
+                if len(steps) == 0:
+                    del self.cells[loc]
+            if loc != path[t + 1]:
+                key = (loc, path[t + 1], t + 1)
+                self.moves[key].discard(agent)
+                if len(self.moves[key]) == 0:
+                    del self.moves[key]
+        del self.goals[path[-1]][agent]
+        if len(self.goals[path[-1]]) == 0:
+            del self.goals[path[-1]]
+
+    def sync(self, paths: list[list[tuple[int, int]]]) -> None:
+        """
+            Updates the index to the given paths, only replacing the paths of agents whose path object changed. Used to
+            move one index between related CBS nodes that share most of their paths.
+
+        :param paths:   {list}  paths of all agents, the index in the list is used as agent id
+        """
+        for agent, path in enumerate(paths):
+            if self.paths.get(agent) is not path:
+                self.add(agent, path)
+
+    def agents_at(self, loc: tuple[int, int], step: int) -> set[int]:
+        """
+            Point query returning all agents occupying a location at a timestep, including agents waiting at their goal
+
+        :param loc:     {tuple} location to check
+        :param step:    {int}   timestep to check
+
+        :return:        {set}   ids of the agents at the location
+        """
+        agents = set(self.cells.get(loc, dict()).get(step, ()))
+        for agent, goal_step in self.goals.get(loc, dict()).items():
+            if step >= goal_step:
+                agents.add(agent)
+        return agents
+
+    def swapping_agents(self, current_loc: tuple[int, int], next_loc: tuple[int, int], step: int) -> set[int]:
+        """
+            Edge query returning all agents traversing the move from current_loc to next_loc in the opposite direction
+
+        :param current_loc: {tuple} location at step - 1
+        :param next_loc:    {tuple} location at step
+        :param step:        {int}   timestep of arrival at next_loc
+
+        :return:            {set}   ids of the agents moving from next_loc to current_loc
+        """
+        if current_loc == next_loc:
+            return set()
+        return set(self.moves.get((next_loc, current_loc, step), ()))
+
+    def first_conflicts(self,
+                        agent: int,
+                        path: list[tuple[int, int]],
+                        agent_first: bool = False) -> dict[int, Collision]:
+        """
+            First conflict query finding for every other indexed agent the earliest collision with the given path, in
+            the same order as detect_collision checks them: a vertex collision at timestep t precedes an edge collision
+            during the move from t to t + 1. The given agent itself is ignored, so it can be queried with a new path
+            while its old path is still indexed. Collisions are oriented as if detect_collision was called with the
+            lower agent id first, or with the given agent first if agent_first is set.
+
+        :param agent:       {int}   id of the agent the path belongs to
+        :param path:        {list}  path to check against all other indexed paths
+        :param agent_first: {bool}  Flag to make the given agent agent_0 of all collisions
+
+        :return:            {dict}  first collision indexed by the id of the other agent
+        """
+        found: dict[int, Collision] = dict()
+        cells, goals, moves = self.cells, self.goals, self.moves
+        for t, loc in enumerate(path):
+            others: typing.Iterable[int] = cells.get(loc, dict()).get(t, ())
+            if loc in goals:
+                others = [*others, *(other for other, goal_step in goals[loc].items() if t >= goal_step)]
+            for other in others:
+                if other != agent and other not in found:
+                    found[other] = self.collision(agent, other, agent_first, t, loc)
+            if t + 1 < len(path) and loc != path[t + 1]:
+                for other in moves.get((path[t + 1], loc, t + 1), ()):
+                    if other != agent and other not in found:
+                        found[other] = self.collision(agent, other, agent_first, t + 1, loc, path[t + 1])
+
+        # Agents reaching the goal after the path ended, where the agent remains forever
+        goal, end = path[-1], len(path) - 1
+        tail: dict[int, int] = dict()
+        for t, agents in self.cells.get(goal, dict()).items():
+            if t > end:
+                for other in agents:
+                    tail[other] = min(t, tail.get(other, t))
+        for other, goal_step in self.goals.get(goal, dict()).items():
+            if goal_step > end:
+                tail[other] = min(goal_step, tail.get(other, goal_step))
+        for other, t in sorted(tail.items(), key=lambda item: item[1]):
+            if other != agent and other not in found:
+                found[other] = self.collision(agent, other, agent_first, t, goal)
+        return found
+
+    @staticmethod
+    def collision(agent: int,
+                  other: int,
+                  agent_first: bool,
+                  step: int,
+                  loc_0: tuple[int, int],
+                  loc_1: typing.Optional[tuple[int, int]] = None) -> Collision:
+        """
+            Creates a collision found for a queried path, oriented like detect_collision would report it
+
+        :param agent:       {int}   id of the agent the queried path belongs to
+        :param other:       {int}   id of the indexed agent
+        :param agent_first: {bool}  Flag to make the queried agent agent_0 instead of the agent with the lower id
+        :param step:        {int}   timestep of the collision
+        :param loc_0:       {tuple} location of the queried agent at the collision, before the move for edge collisions
+        :param loc_1:       {tuple} location of the queried agent after the move for edge collisions
+
+        :return:            {Collision} collision between both agents
+        """
+        if agent_first or agent < other:
+            return Collision(agent, other, step, loc_0, loc_1)
+        if loc_1 is None:
+            return Collision(other, agent, step, loc_0)
+        return Collision(other, agent, step, loc_1, loc_0)
@@ -0,0 +1,137 @@
+"""
+Admissible high-level heuristics for CBS computed from graphs between agents. Every edge of such a graph carries a
+lower bound on how much the summed path cost of its two agents has to increase, the weight of a minimum vertex cover
+is then a lower bound on the increase of the sum of costs of all agents. The conflict graph (CG) connects agents with a
+cardinal collision, the dependency graph (DG) agents whose MDDs contain no pair of paths without collision and the
+weighted dependency graph (WDG) additionally uses the exact cost increase of solving both agents together.
+"""
+import collections
+
+import mdd
+
+# components with more vertices are bounded by a matching instead of solved exactly
+EXACT_COVER_LIMIT = 10
+
+
+def dependent(mdd_0: mdd.MDD, mdd_1: mdd.MDD) -> bool:
+    """
+        Checks if two agents are dependent, meaning that no combination of a path of the first and a path of the second
+        MDD is free of collisions. The joint MDD is built level by level, keeping only the pairs of locations that can
+        be reached without a vertex or edge collision. After the end of its MDD an agent remains at its goal.
+
+    :param mdd_0:   {MDD}   MDD of the first agent
+    :param mdd_1:   {MDD}   MDD of the second agent
+
+    :return:        {bool}  True if every combination of paths collides
+    """
+    if len(mdd_0) == 0 or len(mdd_1) == 0:
+        return False
+    states = {(loc_0, loc_1) for loc_0 in mdd_0.levels[0] for loc_1 in mdd_1.levels[0] if loc_0 != loc_1}
+    for step in range(max(mdd_0.cost, mdd_1.cost)):
+        children = set()
+        for loc_0, loc_1 in states:
+            for child_0 in mdd_0.children(loc_0, step):
+                for child_1 in mdd_1.children(loc_1, step):
+                    if child_0 != child_1 and not (child_0 == loc_1 and child_1 == loc_0):
+                        children.add((child_0, child_1))
+        states = children
+        if len(states) == 0:
+            return True
+    return len(states) == 0
+
+
+def minimum_vertex_cover(weights: dict[tuple[int, int], int]) -> int:
+    """
+        Computes the weight of a minimum vertex cover of an edge weighted graph, which is the minimum sum of
+        non-negative integer vertex values such that the values of the two vertices of every edge sum to at least its
+        weight. Every connected component is solved exactly by branching over the values of its vertices, components
+        larger than EXACT_COVER_LIMIT are bounded from below by a greedy matching so the result stays admissible.
+
+    :param weights: {dict}  weight of every edge indexed by the pair of vertices, edges of weight 0 are ignored
+
+    :return:        {int}   weight of the minimum vertex cover or a lower bound on it
+    """
+    adjacency: dict[int, dict[int, int]] = collections.defaultdict(dict)
+    for (vertex_0, vertex_1), weight in weights.items():
+        if weight > 0:
+            adjacency[vertex_0][vertex_1] = max(weight, adjacency[vertex_0].get(vertex_1, 0))
+            adjacency[vertex_1][vertex_0] = adjacency[vertex_0][vertex_1]
+
+    total = 0
+    visited: set[int] = set()
+    for root in adjacency:
+        if root in visited:
+            continue
+        component = [root]
+        visited.add(root)
+        for vertex in component:
+            for neighbour in adjacency[vertex]:
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    component.append(neighbour)
+        if len(component) > EXACT_COVER_LIMIT:
+            total += matching_bound(component, adjacency)
+        else:
+            total += exact_cover(component, adjacency)
+    return total
+
+
+def matching_bound(vertices: list[int], adjacency: dict[int, dict[int, int]]) -> int:
+    """
+        Lower bound on the minimum vertex cover given by the summed weight of a greedy matching, as the edges of a
+        matching share no vertex and each of them has to be covered on its own
+
+    :param vertices:    {list}  vertices to consider
+    :param adjacency:   {dict}  edge weights indexed by both vertices
+
+    :return:            {int}   summed weight of the matched edges
+    """
+    members = set(vertices)
+    edges = sorted(((weight, vertex_0, vertex_1) for vertex_0 in vertices
+                    for vertex_1, weight in adjacency[vertex_0].items() if vertex_0 < vertex_1 and vertex_1 in members),
+                   reverse=True)
+    matched: set[int] = set()
+    bound = 0
+    for weight, vertex_0, vertex_1 in edges:
+        if vertex_0 not in matched and vertex_1 not in matched:
+            matched.update((vertex_0, vertex_1))
+            bound += weight
+    return bound
+
+
+def exact_cover(vertices: list[int], adjacency: dict[int, dict[int, int]]) -> int:
+    """
+        Minimum vertex cover of a connected component by depth first branching over the values of the vertices in
+        order of decreasing degree. The value of a vertex ranges from the least value covering its edges to already
+        assigned neighbours up to its largest edge weight, branches are pruned with a matching bound on the edges
+        between the unassigned vertices.
+
+    :param vertices:    {list}  vertices of the component
+    :param adjacency:   {dict}  edge weights indexed by both vertices
+
+    :return:            {int}   weight of the minimum vertex cover
+    """
+    order = sorted(vertices, key=lambda vertex: len(adjacency[vertex]), reverse=True)
+    values: dict[int, int] = dict()
+    best = sum(max(adjacency[vertex].values()) for vertex in order)
+
+    def branch(index: int, cost: int) -> None:
+        nonlocal best
+        if index == len(order):
+            best = min(best, cost)
+            return
+        if cost + matching_bound(order[index:], adjacency) >= best:
+            return
+        vertex = order[index]
+        least = max([weight - values[neighbour] for neighbour, weight in adjacency[vertex].items()
+                     if neighbour in values] + [0])
+        for value in range(least, max(adjacency[vertex].values()) + 1):
+            if cost + value >= best:
+                break
+            values[vertex] = value
+            branch(index + 1, cost + value)
+            del values[vertex]
+
+    branch(0, 0)
+    return best
+
@@ -1,4 +1,5 @@
 import collections.abc as abc
+import sys
 import typing
 
 
@@ -53,6 +54,17 @@ class Constraint:
         self.step = step
         self.infinite = infinite
 
+    @property
+    def key(self) -> tuple[bool, int, int, tuple[int, ...], typing.Optional[tuple[int, ...]], bool]:
+        """
+            property returning a hashable tuple identifying the constraint, two constraints with the same key restrict
+            the agents in the same way
+
+        :return:    {tuple} positive flag, agent, timestep, both locations as tuples and infinite flag
+        """
+        return (self.positive, self.agent, self.step, tuple(self.loc_1),
+                tuple(self.loc_2) if self.loc_2 is not None else None, self.infinite)
+
     @property
     def edge(self) -> bool:
         """
@@ -128,48 +140,111 @@ class Constraint:
 
 class ConstraintTable:
     """
-        Class used to sort and handle Constraints applied to a given agent.
+        Class used to sort and handle Constraints applied to a given agent. The constraints are stored as a reservation
+        table indexed by timestep, so that checking a move only requires a constant number of lookups independent of the
+        number of constraints present.
 
-        :param finite_constraints:      {int}   list of all constraints applied to the given agent that have a finite
-                                                duration sorted by time step at which they occur
-        :param infinite_constraints:    {bool}  list of all constraints applied to the given agent that have a infinite
-                                                duration sorted by time step at which they start occurring
-        :param is_infinite:             {bool}  indicator property showing if any infinite constraints are present
+        :param agent:       {int}   agent to which the stored constraints apply
+        :param edge:        {dict}  forbidden moves as sets of (current location, next location) indexed by timestep
+        :param goal_holds:  {dict}  cached results of goal_hold_step indexed by goal location, cleared by add
+        :param infinite:    {dict}  first timestep of every location forbidden by an infinite constraint indexed by
+                                    location
+        :param length:      {int}   last timestep at which a finite constraint occurs plus one
+        :param positive:    {dict}  locations the agent is forced to occupy as sets indexed by timestep
+        :param vertex:      {dict}  forbidden locations as sets indexed by timestep
+        :param is_infinite: {bool}  indicator property showing if any infinite constraints are present
     """
 
     def __init__(self, constraints: list[Constraint], agent: int) -> None:
         """
             Initialization function for the ConstraintTable class. Iterates through all provided constraints and uses
-            Constraint.compile_constraint() to apply the given constraint to the given agent. Furthermore filters
-            infinite constraints from the finite constraints.
+            Constraint.compile_constraint() to apply the given constraint to the given agent before inserting them into
+            the table.
 
         :param constraints: {list}  list of all constraints currently in scope for the pathfinding potentially not all
                                     applying to the given agent
         :param agent:       {int}   agent for which to store the required constraints
         """
-        self.finite_constraints = []
-        self.infinite_constraints = []
+        self.agent = agent
+        self.positive: dict[int, frozenset[tuple[int, int]]] = dict()
+        self.vertex: dict[int, frozenset[tuple[int, int]]] = dict()
+        self.edge: dict[int, frozenset[tuple[tuple[int, int], tuple[int, int]]]] = dict()
+        self.infinite: dict[tuple[int, int], int] = dict()
+        self.length = 0
+        self.goal_holds: dict[tuple[int, int], typing.Optional[int]] = dict()
         for constraint in constraints:
-            for c in constraint.compile_constraint(agent):
-                if c.infinite:
-                    self.infinite_constraints.append(c)
-                else:
-                    self.finite_constraints.append(c)
-        self.finite_constraints.sort(key=lambda x: x.step)
-        self.infinite_constraints.sort(key=lambda x: x.step)
+            self.add(constraint)
+
+    def add(self, constraint: Constraint) -> None:
+        """
+            Compiles the given constraint for the agent of this table and inserts the result.
+
+        :param constraint:  {Constraint}    constraint to add, potentially not applying to the agent of this table
+        """
+        if len(self.goal_holds) != 0:
+            self.goal_holds = dict()
+        for c in constraint.compile_constraint(self.agent):
+            loc_1 = tuple(c.loc_1)
+            if c.infinite:
+                if self.infinite.get(loc_1, c.step + 1) > c.step:
+                    self.infinite[loc_1] = c.step
+                continue
+            if c.positive:
+                self.positive[c.step] = self.positive.get(c.step, frozenset()) | {loc_1}
+            elif c.loc_2 is None:
+                self.vertex[c.step] = self.vertex.get(c.step, frozenset()) | {loc_1}
+            else:
+                self.edge[c.step] = self.edge.get(c.step, frozenset()) | {(loc_1, tuple(c.loc_2))}
+            self.length = max(self.length, c.step + 1)
+
+    def reserve(self, path: list[tuple[int, int]]) -> None:
+        """
+            Blocks the path of another agent including its goal afterwards. The result equals adding a positive edge
+            constraint for every move of the path and a positive infinite constraint at the goal, as the prioritized
+            solver did, without creating and compiling the constraint objects.
+
+        :param path:    {list}  path of another agent that may not be collided with
+        """
+        if len(self.goal_holds) != 0:
+            self.goal_holds = dict()
+        path = [tuple(loc) for loc in path]
+        for t in range(len(path) - 1):
+            self.vertex[t] = self.vertex.get(t, frozenset()) | {path[t]}
+            self.vertex[t + 1] = self.vertex.get(t + 1, frozenset()) | {path[t + 1]}
+            self.edge[t + 1] = self.edge.get(t + 1, frozenset()) | {(path[t + 1], path[t])}
+        if len(path) > 1:
+            self.length = max(self.length, len(path))
+        if self.infinite.get(path[-1], len(path) + 1) > len(path):
+            self.infinite[path[-1]] = len(path)
+
+    def copy(self, agent: typing.Optional[int] = None) -> "ConstraintTable":
+        """
+            Creates a copy of this table that can be extended without affecting this table. As the stored sets are
+            replaced instead of modified when adding constraints, only the indices need to be copied while the sets are
+            shared between both tables.
+
+        :param agent:   {int}               agent of the copy that constraints added later are compiled for, the agent
+                                            of this table if None. Only valid if the table contains no constraints
+                                            specific to its own agent, like a table of reserved paths.
+
+        :return:        {ConstraintTable}   copy of this table
+        """
+        table = ConstraintTable([], self.agent if agent is None else agent)
+        table.positive = self.positive.copy()
+        table.vertex = self.vertex.copy()
+        table.edge = self.edge.copy()
+        table.infinite = self.infinite.copy()
+        table.length = self.length
+        return table
 
     def is_constrained(self, current_loc: tuple[int, int], next_loc: tuple[int, int], step: int) -> bool:
         """
-            function used to check if a given planed next location is valid or if it violates a constraint. First
-            iterates through all finite constraints until it has reached once that have the same timestep then compares
-            for each positive constraint if the next location is not equal to the required location or incase of a
-            negative vertex constrain if the next location is equal to the first constraint location. For negative edge
-            constraints it is necessary to check if the current location is equal to location one and if the next
-            location is equal to the second location. Positive edge constraints do not occur due the the way
-            constraint.compile_constraint() works.
-            If there are any infinite constraints present and the timestep is less than the smallest start timestep then
-            it also iterates through the infinite negative constraints and compares the next location to the constraints
-            first location.
+            function used to check if a given planed next location is valid or if it violates a constraint. Looks up
+            the constraints at the given timestep and checks if a positive constraint requires a different location, if
+            the next location is forbidden by a negative vertex constraint or if the move is forbidden by a negative
+            edge constraint. Positive edge constraints do not occur due the the way constraint.compile_constraint()
+            works. Lastly checks if an infinite constraint that started at or before the timestep forbids the next
+            location.
 
         :param current_loc: {tuple} current location of the agent
         :param next_loc:    {tuple} next planned location
@@ -178,30 +253,54 @@ class ConstraintTable:
         :return:            {bool}  next move violates a finite positive vertex constraint
         :return:            {bool}  next move violates a finite negative vertex constraint
         :return:            {bool}  next move violates a finite negative edge constraint
-        :return:            {bool}  next move violates an infinite constraint
-        :return:            {bool}  no constraints have been violated
-        """
-        if step < len(self):
-            for c in self.finite_constraints:
-                if c.step < step:
-                    continue
-                elif c.step > step:
-                    break
-                if c.positive:  # positive constraint
-                    if c.loc_1 != next_loc:
-                        return True
-                elif c.loc_2 is None:  # negative vertex constrain
-                    if c.loc_1 == next_loc:
-                        return True
-                elif c.loc_1 == current_loc and c.loc_2 == next_loc:  # negative edge constraint
-                    return True
-        if self.is_infinite and step >= self.infinite_constraints[0].step:
-            for c in self.infinite_constraints:
-                if c.step > step:
-                    break
-                if c.loc_1 == next_loc:
-                    return True
-        return False
+        :return:            {bool}  next move violates an infinite constraint or no constraints have been violated
+        """
+        positive = self.positive.get(step)
+        if positive is not None and (len(positive) > 1 or next_loc not in positive):
+            return True
+        vertex = self.vertex.get(step)
+        if vertex is not None and next_loc in vertex:
+            return True
+        edge = self.edge.get(step)
+        if edge is not None and (current_loc, next_loc) in edge:
+            return True
+        start = self.infinite.get(next_loc)
+        return start is not None and step >= start
+
+    def blocked_steps(self, loc: tuple[int, int]) -> list[int]:
+        """
+            Collects all timesteps at which the given location may not be occupied due to finite constraints. These are
+            the timesteps of negative vertex constraints at the location and of positive constraints requiring another
+            location. Edge constraints are not included as they only forbid specific moves.
+
+        :param loc: {tuple} location to check
+
+        :return:    {list}  sorted timesteps at which the location is blocked
+        """
+        steps = {t for t, locs in self.vertex.items() if loc in locs}
+        steps.update(t for t, locs in self.positive.items() if len(locs) > 1 or loc not in locs)
+        return sorted(steps)
+
+    def goal_hold_step(self, goal: tuple[int, int]) -> typing.Optional[int]:
+        """
+            Determines from which timestep onwards the agent may stay at its goal forever. This is the last timestep at
+            which waiting at the goal is forbidden, so a search reaching the goal at step t is finished if and only if
+            t is at least this value. The result is computed once per goal and cached until constraints are added.
+
+        :param goal:    {tuple} goal location of the agent
+
+        :return:        {int}   last timestep at which staying at the goal is constrained, 0 if there is none
+        :return:        {None}  the goal is blocked permanently by an infinite constraint, no path can end there
+        """
+        goal = tuple(goal)
+        if goal not in self.goal_holds:
+            if goal in self.infinite:
+                self.goal_holds[goal] = None
+            else:
+                steps = {*self.positive.keys(), *self.vertex.keys(), *self.edge.keys()}
+                self.goal_holds[goal] = max((t for t in steps if t > 0 and self.is_constrained(goal, goal, t)),
+                                            default=0)
+        return self.goal_holds[goal]
 
     @property
     def is_infinite(self):
@@ -210,17 +309,23 @@ class ConstraintTable:
 
         :return:    {bool}  true if any infinite constraints exist
         """
-        return len(self.infinite_constraints) != 0
+        return len(self.infinite) != 0
+
+    def __sizeof__(self) -> int:
+        """
+            implementation of sizeof for ConstraintTable returning the size of the table and its indices. The stored
+            sets are not included as they are shared between copies.
+
+        :return:    {int}   size in bytes
+        """
+        return (object.__sizeof__(self) + sys.getsizeof(self.positive) + sys.getsizeof(self.vertex) +
+                sys.getsizeof(self.edge) + sys.getsizeof(self.infinite) + sys.getsizeof(self.goal_holds))
 
     def __len__(self) -> int:
         """
             implementation of len for ConstraintTable to return the maximum timestep at which a finite constraint
             occurs plus one
 
-        :return:    {int}   last finite timestep plus one
-        :return:    {int}   if no constraints are present return 0
+        :return:    {int}   last finite timestep plus one or 0 if no constraints are present
         """
-        try:
-            return self.finite_constraints[-1].step + 1
-        except IndexError:
-            return 0
+        return self.length
@@ -5,6 +5,7 @@ Code in this file is just provided as guidance, you are free to deviate from it.
 """
 from collections import abc
 import time as timer
+import typing
 import numpy as np
 import numpy.typing as npt
 import multiprocessing
@@ -14,7 +15,9 @@ from single_agent_planner import compute_heuristics, get_sum_of_cost
 from prioritized import PrioritizedPlanningSolver
 import distributed_agent
 import base_solver
+import collisions
 import constraints
+import search_limits
 
 
 class DistributedPlanningSolver(base_solver.BaseSolver):
@@ -90,7 +93,7 @@ class DistributedPlanningSolver(base_solver.BaseSolver):
         :param path_limit:      {int}       maximum number of steps that are being communicated by agents values smaller
                                         than one result in communication of the full path
         """
-        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing)
+        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing, **kwargs)
         self.solver = solver
         self.view_size = view_size
         self.path_limit = path_limit
@@ -104,7 +107,9 @@ class DistributedPlanningSolver(base_solver.BaseSolver):
         self.processes: list[multiprocessing.Process] = []
         self.pipes: list[multiprocessing.connection.Connection] = []
         
-    def find_solution(self, base_constraints: list[constraints.Constraint]) -> list[list[tuple[int, int]]]:
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[search_limits.SearchLimits] = None) -> list[list[tuple[int, int]]]:
         """
             Main function for solving the multi agent path finding problem. It starts by initializing all agents as
             subprocesses each with a pipe to communicate. To ensure no accidental dangling pipes are present the agent
@@ -118,8 +123,14 @@ class DistributedPlanningSolver(base_solver.BaseSolver):
 
         :param base_constraints:    {list}  List of list of boolean, describing the map environment. True indicates a
                                             wall.
+        :param limits:              {SearchLimits}  Optional deadline and cancellation token checked before every
+                                                    timestep. The planning of the agents happens in their own processes
+                                                    and does not count towards the node budget. All agents are
+                                                    terminated before the exception is raised
 
         :return:                    {list}  Paths traversed by all agents
+
+        :raise:                             SearchAborted
         """
         # Initialize constants       
         start_time = timer.time()
@@ -151,6 +162,15 @@ class DistributedPlanningSolver(base_solver.BaseSolver):
         s = 0
 
         while not all([self.get_finished(idx) for idx in range(self.num_of_agents)]):
+            if limits is not None:
+                try:
+                    limits.check()
+                except search_limits.SearchAborted as error:
+                    for agent_id in range(self.num_of_agents):
+                        self.terminate_agent(agent_id)
+                    self.CPU_time = timer.time() - start_time
+                    error.solver_stats = {**self.solver_stats(), "timesteps": s}
+                    raise
             self.poll_view()
             self.poll_collisions()
 
@@ -207,8 +227,8 @@ class DistributedPlanningSolver(base_solver.BaseSolver):
         """
             sends the view command to each agent and stores a reference to each pipe in missing_view then awaits a
             response on any of the pipes containing the agents index and a list of tuples which are the vertices the
-            agent can see. These vertices are then compared to the positions of all agents and if an agents position is
-            in the list of visible vertices then its id is added to the visibility map at the current agents index
+            agent can see. The agents at each of these vertices are looked up in an occupancy index of the current
+            positions of all agents and their ids are added to the visibility map at the current agents index
         """
         self.visibility_map = dict()
         missing_view = []
@@ -216,10 +236,11 @@ class DistributedPlanningSolver(base_solver.BaseSolver):
             p.send("view")
             missing_view.append(p)
 
+        positions = collisions.OccupancyIndex([[pos] for pos in self.agent_pos])
         while missing_view:
             for r in multiprocessing.connection.wait(missing_view):
                 idx, fov = r.recv()
-                visible = [a for a, pos in enumerate(self.agent_pos) if pos in fov and not a == idx]
+                visible = sorted({a for pos in fov for a in positions.agents_at(pos, 0) if not a == idx})
                 if len(visible) != 0:
                     self.visibility_map[idx] = visible
                 missing_view.remove(r)
@@ -12,6 +12,7 @@ import numpy.typing as npt
 import math
 
 import collisions
+import heuristics
 import single_agent_planner
 import base_solver
 import view
@@ -63,10 +64,14 @@ class DistributedAgent(object):
 
     def init_path(self):
         ## Initial Path finding procedure
+        if self.kwargs.get("cache_heuristics", True):
+            h_values = heuristics.CACHE.get(self.my_map, self.goal, self.heuristics_func)
+        else:
+            h_values = self.heuristics_func(self.my_map, self.goal)
         planned_path = single_agent_planner.a_star(self.my_map,
                                                    self.path[-1],
                                                    self.goal,
-                                                   self.heuristics_func(self.my_map, self.goal),
+                                                   h_values,
                                                    self.id,
                                                    self.global_constraints)
         if planned_path is None:
@@ -98,11 +103,12 @@ class DistributedAgent(object):
 
     def check_collisions(self, paths: list[tuple[int, list[tuple[int, int]]]]):
         collision_list = []
-        for path in paths:
-            collision = collisions.detect_collision(self.id,
-                                                    path[0],
-                                                    self.get_path()[1],
-                                                    path[1])
+        index = collisions.OccupancyIndex()
+        for other_id, other_path in paths:
+            index.add(other_id, other_path)
+        first_conflicts = index.first_conflicts(self.id, self.get_path()[1], agent_first=True)
+        for other_id, _ in paths:
+            collision = first_conflicts.get(other_id)
 
             if collision:
                 #collision.step += 1
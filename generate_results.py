@@ -38,6 +38,8 @@ from collections import abc
 
 import run_experiments
 import collisions
+import heuristics
+import search_limits
 import map_gen
 import visualize
 import base_solver
@@ -45,7 +47,7 @@ import base_solver
 from cbs import CBSSolver
 from prioritized import PrioritizedPlanningSolver
 from distributed import DistributedPlanningSolver
-from single_agent_planner import get_sum_of_cost, get_longest_path_cost
+from single_agent_planner import compute_heuristics, get_sum_of_cost, get_longest_path_cost
 
 import numpy as np
 import pandas as pd
@@ -139,7 +141,8 @@ def run_solver(my_map: np.ndarray,
                **kwargs) -> None:
     try:
         solver_instance = local_solver(my_map, starts, goals, printing=False, **kwargs)
-        paths = solver_instance.find_solution([])
+        # stop the search from within the solver, the timeout of process.join only remains as fallback
+        paths = solver_instance.find_solution([], search_limits.SearchLimits(time_limit=timeout))
 
         cost.value = score_func(paths)
         time.value = solver_instance.CPU_time
@@ -174,6 +177,10 @@ if __name__ == "__main__":
             uid = map_name + f"{starts}" + f"{goals}"
             uid = hashlib.sha256(uid.encode()).hexdigest()
 
+            # Fill the heuristics cache once per scenario, the forked solver processes and their agents inherit it
+            for goal in goals:
+                heuristics.CACHE.get(my_map, goal, compute_heuristics)
+
             ## Run for each solver
 
             # Prioritized
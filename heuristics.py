@@ -0,0 +1,220 @@
+"""
+Dense goal distance tables used as heuristics by the low-level search
+"""
+from collections import abc
+import collections
+import hashlib
+import typing
+import numpy as np
+import numpy.typing as npt
+
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+class HeuristicTable(abc.Mapping):
+    """
+        Read only, dict compatible view on a dense goal distance grid. Lookups behave like the dictionary previously
+        returned by compute_heuristics, meaning that only cells which can reach the goal are contained.
+
+    :param grid:    {np.ndarray}    int32 distance grid, unreachable cells contain UNREACHABLE
+    :param rows:    {list}          the grid converted to nested python lists for fast scalar lookups
+    :param flat:    {list}          the grid flattened row by row for lookups by flat cell index row * width + col
+    """
+
+    def __init__(self, grid: npt.NDArray[np.int32]) -> None:
+        """
+            Initialization function of the HeuristicTable. Marks the grid as read only as tables can be shared between
+            solvers.
+
+        :param grid:    {np.ndarray}    int32 distance grid, unreachable cells contain UNREACHABLE
+        """
+        self.grid = grid
+        self.grid.flags.writeable = False
+        self.rows: list[list[int]] = grid.tolist()
+        self.flat: list[int] = grid.ravel().tolist()
+
+    def __getitem__(self, loc: tuple[int, int]) -> int:
+        """
+            Returns the distance of the given location to the goal
+
+        :param loc: {tuple} location given as (y, x)
+
+        :return:    {int}   distance to the goal
+
+        :raise:             KeyError
+        """
+        if loc[0] < 0 or loc[1] < 0:
+            raise KeyError(loc)
+        try:
+            value = self.rows[loc[0]][loc[1]]
+        except IndexError:
+            raise KeyError(loc) from None
+        if value == UNREACHABLE:
+            raise KeyError(loc)
+        return value
+
+    def __iter__(self) -> abc.Iterator[tuple[int, int]]:
+        """
+            Iterates over all locations that can reach the goal
+
+        :yield: {tuple} location given as (y, x)
+        """
+        for x, y in zip(*np.nonzero(self.grid != UNREACHABLE)):
+            yield int(x), int(y)
+
+    def __len__(self) -> int:
+        """
+            implementation of len returning the number of locations that can reach the goal
+
+        :return:    {int}   number of reachable locations
+        """
+        return int(np.count_nonzero(self.grid != UNREACHABLE))
+
+
+def as_table(h_values: abc.Mapping[tuple[int, int], int], my_map: npt.NDArray[bool]) -> HeuristicTable:
+    """
+        Converts heuristics returned by a custom heuristics function into a HeuristicTable. Tables are returned as is.
+
+    :param h_values:    {dict}          heuristic values indexed by location
+    :param my_map:      {np.ndarray}    map the heuristic values belong to
+
+    :return:            {HeuristicTable}    dense version of h_values
+    """
+    if isinstance(h_values, HeuristicTable):
+        return h_values
+    grid = np.full(np.shape(my_map), UNREACHABLE, dtype=np.int32)
+    for loc, value in h_values.items():
+        grid[loc] = value
+    return HeuristicTable(grid)
+
+
+def map_fingerprint(my_map: npt.NDArray[bool]) -> str:
+    """
+        sha 256 hash identifying a map by its shape and walls
+
+    :param my_map:  {np.ndarray}    Map provided as boolean numpy array where True indicates a wall
+
+    :return:        {str}           hexadecimal digest of the map
+    """
+    walls = np.ascontiguousarray(my_map, dtype=bool)
+    return hashlib.sha256(str(walls.shape).encode() + walls.tobytes()).hexdigest()
+
+
+class HeuristicCache:
+    """
+        Process wide least recently used cache of heuristic tables indexed by map fingerprint, goal and the heuristics
+        function that created them. Tables are read only and can therefore be shared between all solvers and agents.
+
+    :param enabled: {bool}          Flag to enable and disable caching. When disabled every lookup calls the heuristics
+                                    function directly
+    :param hits:    {int}           Counter for lookups that were answered from the cache
+    :param maxsize: {int}           Maximum number of tables to keep before the least recently used one is evicted
+    :param misses:  {int}           Counter for lookups that required the heuristics function to be called
+    :param tables:  {OrderedDict}   Cached tables ordered from least to most recently used
+    """
+
+    def __init__(self, maxsize: int = 2048, enabled: bool = True) -> None:
+        """
+            Initialization function of the HeuristicCache
+
+        :param maxsize: {int}   Maximum number of tables to keep before the least recently used one is evicted
+        :param enabled: {bool}  Flag to enable and disable caching
+        """
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.tables: collections.OrderedDict[tuple[str, tuple[int, int], typing.Any],
+                                             abc.Mapping[tuple[int, int], int]] = collections.OrderedDict()
+
+    def get(self,
+            my_map: npt.NDArray[bool],
+            goal: tuple[int, int],
+            heuristics_func: abc.Callable[[npt.NDArray[bool], tuple[int, int]], abc.Mapping[tuple[int, int], int]]
+            ) -> abc.Mapping[tuple[int, int], int]:
+        """
+            Returns the heuristics for the given map and goal, only calling heuristics_func if they are not cached yet
+
+        :param my_map:          {np.ndarray}    Map provided as boolean numpy array where True indicates a wall
+        :param goal:            {tuple}         Goal location given as (y, x)
+        :param heuristics_func: {function}      Heuristics function used to fill the cache
+
+        :return:                {dict}          heuristic values indexed by location
+        """
+        if not self.enabled:
+            return heuristics_func(my_map, goal)
+
+        key = (map_fingerprint(my_map), (int(goal[0]), int(goal[1])), heuristics_func)
+        try:
+            table = self.tables[key]
+        except KeyError:
+            self.misses += 1
+            table = heuristics_func(my_map, goal)
+            self.tables[key] = table
+            if len(self.tables) > self.maxsize:
+                self.tables.popitem(last=False)
+        else:
+            self.hits += 1
+            self.tables.move_to_end(key)
+        return table
+
+    def get_all(self,
+                my_map: npt.NDArray[bool],
+                goals: list[tuple[int, int]],
+                heuristics_func: abc.Callable[[npt.NDArray[bool], tuple[int, int]], abc.Mapping[tuple[int, int], int]],
+                compute: typing.Optional[abc.Callable[[list[tuple[int, int]]],
+                                                      list[abc.Mapping[tuple[int, int], int]]]] = None
+                ) -> list[abc.Mapping[tuple[int, int], int]]:
+        """
+            Returns the heuristics of several goals like repeated calls of get, but computes all tables that are not
+            cached yet with a single call of compute, which allows to compute them in parallel
+
+        :param my_map:          {np.ndarray}    Map provided as boolean numpy array where True indicates a wall
+        :param goals:           {list}          Goal locations given as (y, x)
+        :param heuristics_func: {function}      Heuristics function used to fill the cache
+        :param compute:         {function}      Function computing the tables of a list of goals with heuristics_func,
+                                                every goal is computed on its own if None
+
+        :return:                {list}          heuristic values of every goal in the order of the goals
+        """
+        if compute is None:
+            return [self.get(my_map, goal, heuristics_func) for goal in goals]
+        if not self.enabled:
+            return compute(goals)
+
+        fingerprint = map_fingerprint(my_map)
+        keys = [(fingerprint, (int(goal[0]), int(goal[1])), heuristics_func) for goal in goals]
+        missing = dict()
+        for key, goal in zip(keys, goals):
+            if key not in self.tables and key not in missing:
+                missing[key] = goal
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        tables = {key: self.tables[key] for key in keys if key in self.tables}
+        tables.update(zip(missing.keys(), compute(list(missing.values()))))
+        for key in keys:
+            self.tables[key] = tables[key]
+            self.tables.move_to_end(key)
+        while len(self.tables) > self.maxsize:
+            self.tables.popitem(last=False)
+        return [tables[key] for key in keys]
+
+    def clear(self) -> None:
+        """
+            Removes all cached tables and resets the counters
+        """
+        self.tables.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """
+            implementation of len returning the number of cached tables
+
+        :return:    {int}   number of cached tables
+        """
+        return len(self.tables)
+
+
+CACHE = HeuristicCache()
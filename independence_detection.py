@@ -0,0 +1,279 @@
+"""
+Independence detection (ID) splits a problem into groups of agents that can be solved separately. Every agent starts
+in a group of its own and is planned independently. As long as the paths of different groups collide, all groups
+involved in a collision are merged and every merged group is solved again as one problem by an inner solver. Groups
+that never interact are therefore never coupled and the inner solver only sees the agents that actually depend on each
+other.
+"""
+from collections import abc
+import time as timer
+import typing
+import numpy.typing as npt
+
+import base_solver
+import collisions
+import constraints
+import search_limits
+import worker_pool
+from cbs import CBSSolver
+from single_agent_planner import compute_heuristics, get_sum_of_cost
+
+
+def group_constraints(base_constraints: list[constraints.Constraint],
+                      group: tuple[int, ...]) -> list[constraints.Constraint]:
+    """
+        Translates the constraints of the whole problem into constraints of the sub-problem of a group, in which the
+        agents of the group are numbered in the order of the group. Constraints of agents outside the group only
+        restrict the group if they are positive and are converted into negative constraints of every agent of the group.
+
+    :param base_constraints:    {list}  constraints of the whole problem
+    :param group:               {tuple} agents of the group
+
+    :return:                    {list}  constraints of the sub-problem
+    """
+    local = {agent: i for i, agent in enumerate(group)}
+    result = []
+    for constraint in base_constraints:
+        if constraint.agent in local:
+            compiled: abc.Iterable[constraints.Constraint] = [constraint]
+        elif constraint.positive:
+            compiled = [c for agent in group for c in constraint.compile_constraint(agent)]
+        else:
+            continue
+        result.extend(constraints.Constraint(c.positive, local[c.agent], c.step, c.loc_1, c.loc_2, c.infinite)
+                      for c in compiled)
+    return result
+
+
+class IndependenceDetectionSolver(base_solver.BaseSolver):
+    """
+        Solver planning the agents independently and only coupling the groups of agents whose paths collide. Colliding
+        groups are merged and solved by an inner solver, with workers the merged groups of a round are solved in
+        parallel. The solution is optimal if the inner solver is optimal.
+
+    :param CPU_time:        {float}     Value to keep track of the cpu time required for the solver to complete the
+                                        planning
+    :param my_map:          {list}      List of list of boolean, describing the map environment. True indicates a wall.
+    :param starts:          {list}      List of starting positions for the agents. Given as list of tuple of integer,
+                                        where each each tuple is of the following form (y, x)
+    :param goals:           {list}      List of goal/ end positions for the agents. Given as list of tuple of integer,
+                                        where each each tuple is of the following form (y, x)
+    :param printing:        {bool}      Flag to enable and disable printing within the model
+    :param num_of_agents:   {int}       The number of agents within the environment
+    :param heuristics:      {list}      List containing the heuristics.
+    :param inner_solver:    {type}      Solver class used for merged groups
+    :param inner_kwargs:    {dict}      Keyword arguments of every inner solver
+    :param groups:          {list}      Group of every agent given as sorted tuple of agents after find_solution
+    :param num_of_merges:   {int}       Counter for merges of colliding groups
+    :param num_of_solves:   {int}       Counter for groups solved by the inner solver
+    """
+
+    def __init__(self,
+                 my_map: npt.NDArray[bool],
+                 starts: list[tuple[int, int]],
+                 goals: list[tuple[int, int]],
+                 score_func: abc.Callable[[list[list[tuple[int, int]]]], int] = get_sum_of_cost,
+                 heuristics_func: abc.Callable[
+                     [npt.NDArray[bool], tuple[int, int]],
+                     dict[tuple[int, int], int]] = compute_heuristics,
+                 printing: bool = True,
+                 inner_solver: type[base_solver.BaseSolver] = CBSSolver,
+                 inner_kwargs: typing.Optional[dict[str, typing.Any]] = None,
+                 **kwargs) -> None:
+        """
+            Initialise an instance of the IndependenceDetectionSolver class.
+
+        :param my_map:          {list}      List of list of boolean, describing the map environment. True indicates a
+                                            wall.
+        :param starts:          {list}      List of starting positions for the agents. Given as list of tuple of
+                                            integer, where each each tuple is of the following form (y, x).
+        :param goals:           {list}      List of goal/end positions for the agents. Given as list of tuple of
+                                            integer, where each each tuple is of the following form (y, x).
+        :param score_func:      {function}  Score function, also passed to the inner solvers
+        :param heuristics_func: {function}  Heuristics function, also passed to the inner solvers
+        :param printing:        {bool}      Flag to enable and disable printing within the model.
+        :param inner_solver:    {type}      Solver class derived from base_solver.BaseSolver that solves merged groups,
+                                            CBSSolver by default
+        :param inner_kwargs:    {dict}      Keyword arguments of every inner solver, for example the disjoint flag of
+                                            CBS. The inner solvers run without printing and, when this solver has
+                                            workers, in the worker processes.
+        """
+        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing, **kwargs)
+        self.inner_solver = inner_solver
+        self.inner_kwargs = {"score_func": score_func, "heuristics_func": heuristics_func,
+                             "cache_heuristics": self.cache_heuristics, "low_level": self.low_level,
+                             **(inner_kwargs or dict()), "printing": False}
+        self.groups: list[tuple[int, ...]] = [(agent,) for agent in range(self.num_of_agents)]
+        self.num_of_merges = 0
+        self.num_of_solves = 0
+
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[search_limits.SearchLimits] = None) -> list[list[tuple[int, int]]]:
+        """
+            Plans every agent on its own and then repeats until the paths are collision free: the groups of all
+            colliding agents found by collisions.detect_collisions are merged and every merged group is solved by the
+            inner solver under the constraints of its agents. With workers the initial paths are planned by a
+            worker_pool.PlannerPool and the merged groups of a round by a worker_pool.SolverPool, the results are used
+            in the order of the agents either way.
+
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token shared by all
+                                                    searches including those of the inner solvers
+
+        :return:                    {list}          Paths traversed by all agents
+
+        :raise:                                     BaseException
+        :raise:                                     SearchAborted
+        """
+        start_time = timer.time()
+        pool = None
+        if self.workers > 1:
+            pool = worker_pool.SolverPool(self.workers, self.my_map, self.inner_solver, self.inner_kwargs)
+        try:
+            paths = self.solve(base_constraints, limits, pool)
+        except search_limits.SearchAborted as error:
+            self.CPU_time = timer.time() - start_time
+            error.solver_stats = self.solver_stats()
+            raise
+        finally:
+            if pool is not None:
+                pool.close()
+
+        self.CPU_time = timer.time() - start_time
+        if self.printing:
+            print("\n Found a solution! \n")
+            print("CPU time (s):    {:.2f}".format(self.CPU_time))
+            print("Sum of costs:    {}".format(get_sum_of_cost(paths)))
+            print("Groups:          {}".format(len(set(self.groups))))
+            print("Largest group:   {}".format(max((len(group) for group in self.groups), default=0)))
+        return paths
+
+    def solve(self,
+              base_constraints: list[constraints.Constraint],
+              limits: typing.Optional[search_limits.SearchLimits],
+              pool: typing.Optional[worker_pool.SolverPool]) -> list[list[tuple[int, int]]]:
+        """
+            Runs independence detection, see find_solution
+
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
+        :param pool:                {SolverPool}    Worker processes of the inner solvers or None
+
+        :return:                    {list}          Paths traversed by all agents
+
+        :raise:                                     BaseException
+        """
+        self.groups = [(agent,) for agent in range(self.num_of_agents)]
+        paths = self.plan_agents(base_constraints, limits)
+        while True:
+            collision_dict = collisions.detect_collisions(paths)
+            if len(collision_dict) == 0:
+                return paths
+            if limits is not None:
+                limits.check()
+            merged = self.merge_groups(collision_dict.keys())
+            for group, group_paths in zip(merged, self.solve_groups(merged, base_constraints, limits, pool)):
+                for agent, path in zip(group, group_paths):
+                    paths[agent] = path
+
+    def plan_agents(self,
+                    base_constraints: list[constraints.Constraint],
+                    limits: typing.Optional[search_limits.SearchLimits]) -> list[list[tuple[int, int]]]:
+        """
+            Plans every agent on its own, in parallel if the solver has workers
+
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
+
+        :return:                    {list}          Path of every agent
+
+        :raise:                                     BaseException
+        """
+        if self.workers > 1:
+            pool = worker_pool.PlannerPool(self.workers, self.my_map, self.starts, self.goals, self.heuristics,
+                                           self.low_level)
+            try:
+                planned = pool.plan_agents([constraints.ConstraintTable(base_constraints, i)
+                                            for i in range(self.num_of_agents)], limits)
+            finally:
+                pool.close()
+            paths = [result[0][0] if result is not None else None for result in planned]
+        else:
+            paths = [self.low_level(self.my_map, self.starts[i], self.goals[i], self.heuristics[i], i,
+                                    base_constraints, limits=limits) for i in range(self.num_of_agents)]
+        if any(path is None for path in paths):
+            raise BaseException('No solutions')
+        return paths
+
+    def merge_groups(self, colliding: abc.Iterable[tuple[int, int]]) -> list[tuple[int, ...]]:
+        """
+            Merges the groups of every pair of colliding agents, groups connected by a chain of collisions end up in the
+            same group
+
+        :param colliding:   {list}  pairs of colliding agents
+
+        :return:            {list}  new groups ordered by their first agent
+        """
+        parents = {group: group for group in set(self.groups)}
+
+        def find(group: tuple[int, ...]) -> tuple[int, ...]:
+            while parents[group] != group:
+                parents[group] = parents[parents[group]]
+                group = parents[group]
+            return group
+
+        for agent_0, agent_1 in colliding:
+            root_0, root_1 = find(self.groups[agent_0]), find(self.groups[agent_1])
+            if root_0 != root_1:
+                parents[root_1] = root_0
+                self.num_of_merges += 1
+        members: dict[tuple[int, ...], list[int]] = dict()
+        for agent, group in enumerate(self.groups):
+            members.setdefault(find(group), []).append(agent)
+        merged = []
+        for root, agents in members.items():
+            if len(agents) > len(root):
+                group = tuple(agents)
+                for agent in group:
+                    self.groups[agent] = group
+                merged.append(group)
+        return sorted(merged)
+
+    def solve_groups(self,
+                     groups: list[tuple[int, ...]],
+                     base_constraints: list[constraints.Constraint],
+                     limits: typing.Optional[search_limits.SearchLimits],
+                     pool: typing.Optional[worker_pool.SolverPool]) -> list[list[list[tuple[int, int]]]]:
+        """
+            Solves every group with the inner solver, all groups are submitted to the pool at once if one is given
+
+        :param groups:              {list}          groups to solve
+        :param base_constraints:    {list}          Constraints of the whole problem
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
+        :param pool:                {SolverPool}    Worker processes of the inner solvers or None
+
+        :return:                    {list}          paths of the agents of every group in the order of the group
+
+        :raise:                                     BaseException
+        """
+        self.num_of_solves += len(groups)
+        problems = [([self.starts[agent] for agent in group], [self.goals[agent] for agent in group],
+                     group_constraints(base_constraints, group)) for group in groups]
+        if pool is not None:
+            futures = [pool.submit(starts, goals, group_base, limits) for starts, goals, group_base in problems]
+            return [pool.result(future, limits)[0] for future in futures]
+        return [self.inner_solver(self.my_map, starts, goals, **self.inner_kwargs).find_solution(group_base, limits)
+                for starts, goals, group_base in problems]
+
+    def solver_stats(self) -> dict[str, typing.Any]:
+        """
+            Counters describing the progress of independence detection, attached to SearchAborted exceptions
+
+        :return:    {dict}  counters indexed by name
+        """
+        return {**super().solver_stats(),
+                "groups": len(set(self.groups)),
+                "largest group": max((len(group) for group in self.groups), default=0),
+                "merges": self.num_of_merges,
+                "group solves": self.num_of_solves}
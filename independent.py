@@ -1,10 +1,13 @@
 from collections import abc
 import time as timer
+import typing
 import numpy.typing as npt
 
-from single_agent_planner import compute_heuristics, a_star, get_sum_of_cost
+from single_agent_planner import compute_heuristics, get_sum_of_cost
 import base_solver
 import constraints
+import search_limits
+import worker_pool
 
 
 class IndependentSolver(base_solver.BaseSolver):
@@ -53,29 +56,56 @@ class IndependentSolver(base_solver.BaseSolver):
                                             user to specify if they would like to receive the solver outcome after every 
                                             run or not. True enables printing while false disables this behaviour. 
         """
-        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing)
+        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing, **kwargs)
 
-    def find_solution(self, base_constraints: list[constraints.Constraint]) -> list[list[tuple[int, int]]]:
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[search_limits.SearchLimits] = None) -> list[list[tuple[int, int]]]:
         """
             Finds paths for all agents from their start locations to their goal locations independently. Overwrites the
-            baseclass find_solution function.
+            baseclass find_solution function. With workers the agents are planned in parallel by a
+            worker_pool.PlannerPool, the paths are returned in the order of the agents either way.
 
-        :param base_constraints:    {list}  Constraints to be considered during the solve procedure
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
 
-        :return:                    {list}  Returns the paths traversed by all agents
+        :return:                    {list}          Returns the paths traversed by all agents
 
-        :raise:                             BaseException
+        :raise:                                     BaseException
+        :raise:                                     SearchAborted
         """
 
         start_time = timer.time()
         result = []
 
-        for i in range(self.num_of_agents):  # Find path for each agent
-            path = a_star(self.my_map, self.starts[i], self.goals[i], self.heuristics[i],
-                          i, base_constraints)
-            if path is None:
-                raise BaseException('No solutions')
-            result.append(path)
+        if self.workers > 1:
+            pool = worker_pool.PlannerPool(self.workers, self.my_map, self.starts, self.goals, self.heuristics,
+                                           self.low_level)
+            try:
+                planned = pool.plan_agents([constraints.ConstraintTable(base_constraints, i)
+                                            for i in range(self.num_of_agents)], limits)
+            except search_limits.SearchAborted as error:
+                self.CPU_time = timer.time() - start_time
+                error.solver_stats = self.solver_stats()
+                raise
+            finally:
+                pool.close()
+            for paths in planned:
+                if paths is None:
+                    raise BaseException('No solutions')
+                result.append(paths[0][0])
+        else:
+            for i in range(self.num_of_agents):  # Find path for each agent
+                try:
+                    path = self.low_level(self.my_map, self.starts[i], self.goals[i], self.heuristics[i],
+                                          i, base_constraints, limits=limits)
+                except search_limits.SearchAborted as error:
+                    self.CPU_time = timer.time() - start_time
+                    error.solver_stats = self.solver_stats()
+                    raise
+                if path is None:
+                    raise BaseException('No solutions')
+                result.append(path)
 
         self.CPU_time = timer.time() - start_time
         if self.printing:
@@ -0,0 +1,152 @@
+"""
+Coupled low-level search for the meta-agents of MA-CBS. A group of agents is planned jointly by an A* search over the
+combined locations of all its agents, so the returned paths never collide with each other while every agent still obeys
+the constraints of its own constraint table. The search minimises the sum of the path costs of the group and is only
+meant for small groups, as the number of joint moves grows exponentially with the number of agents.
+"""
+import heapq
+import math
+import typing
+from collections import abc
+import numpy.typing as npt
+
+import constraints
+import heuristics
+import map_graph
+from search_limits import SearchStats, SearchLimits
+from single_agent_planner import record_search
+
+
+def joint_a_star(my_map: npt.NDArray[bool],
+                 starts: list[tuple[int, int]],
+                 goals: list[tuple[int, int]],
+                 h_values: list[abc.Mapping[tuple[int, int], int]],
+                 tables: list[constraints.ConstraintTable],
+                 stats: typing.Optional[SearchStats] = None,
+                 limits: typing.Optional[SearchLimits] = None
+                 ) -> typing.Optional[list[list[tuple[int, int]]]]:
+    """
+        A* search with operator decomposition (A*+OD) over the joint state of a group of agents. A full search node
+        holds the cells of all agents at a timestep, between two full nodes the agents move one after another in
+        intermediate nodes, so every node only has the moves of a single agent as successors instead of all their
+        combinations. A move may not end on the cell another agent already moved to in this timestep and may not swap
+        cells with it. The cost of a node is the sum of the path costs the agents would have if they stopped there: the
+        timestep for agents away from their goal and the timestep of their last arrival for agents at their goal, so
+        waiting at the goal is only charged once the agent leaves it again. The heuristic is the sum of the heuristics
+        of the agents. Nodes are identified by their cells, the cells at their timestep and their next agent together
+        with the timestep up to the last finite constraint of all tables, afterwards without the timestep. A full node
+        is a solution once every agent is at its goal and the goal hold steps of all tables have passed.
+
+    :param my_map:      {np.ndarray}    binary obstacle map
+    :param starts:      {list}          start position of every agent of the group
+    :param goals:       {list}          goal position of every agent of the group
+    :param h_values:    {list}          heuristic values of every agent indexed by location
+    :param tables:      {list}          constraint table of every agent of the group
+    :param stats:       {SearchStats}   optional counters, receive the summed cost of the paths as lower bound
+    :param limits:      {SearchLimits}  optional node budget, deadline and cancellation token, raises a
+                                        search_limits.SearchAborted exception when exceeded
+
+    :return:            {list}          path of every agent with one location per timestep
+    :return:            {None}          no collision free combination of paths exists
+    """
+    holds = [table.goal_hold_step(goal) for table, goal in zip(tables, goals)]
+    if any(hold is None for hold in holds):
+        return None  # an infinite constraint blocks a goal, no path can end there
+    goal_hold = max(holds)
+    graph = map_graph.get(my_map)
+    h_flats = [heuristics.as_table(h, my_map).flat for h in h_values]
+    adjacency = graph.adjacency
+    coords = graph.coords
+    horizon = max(len(table) for table in tables)
+    goal_cells = tuple(graph.cell(goal) for goal in goals)
+    num_agents = len(goals)
+
+    # cells of every node, where the agents before its next agent already moved to the following timestep
+    start_cells = tuple(graph.cell(start) for start in starts)
+    nodes = [start_cells]
+    parents = [-1]
+    bases = [start_cells]
+    next_agents = [0]
+    arrivals = [tuple(0 if start_cells[i] == goal_cells[i] else -1 for i in range(num_agents))]
+    g_vals = [0]
+    h_start = sum(h_flats[i][start_cells[i]] for i in range(num_agents))
+    open_list = [(h_start, h_start, 0, 0)]
+    closed: dict[tuple[tuple[int, ...], tuple[int, ...], int, int], int] = dict()
+    expanded = 0
+    check_at = limits.check() if limits is not None else math.inf
+
+    while len(open_list) > 0:
+        f_val, h_val, step, node = heapq.heappop(open_list)
+        cells, base, agent, g_val = nodes[node], bases[node], next_agents[node], g_vals[node]
+        key = (cells, base, agent, min(step, horizon))
+        if closed.get(key, g_val + 1) <= g_val:
+            continue
+        closed[key] = g_val
+        if expanded >= check_at:
+            check_at = limits.check(expanded, len(nodes))
+        expanded += 1
+
+        if agent == 0 and cells == goal_cells and step >= goal_hold:
+            record_search(stats, limits, expanded, len(nodes), g_val)
+            return get_paths(nodes, parents, next_agents, node, arrivals[node], coords)
+
+        child_step = step + 1
+        cell = base[agent]
+        loc = coords[cell]
+        arrival = arrivals[node][agent]
+        cost = step if arrival < 0 else arrival
+        moved = cells[:agent]
+        for child_cell in adjacency[cell]:
+            if child_cell in moved or tables[agent].is_constrained(loc, coords[child_cell], child_step):
+                continue
+            if any(child_cell == base[other] and moved[other] == cell for other in range(agent)):
+                continue  # edge collision with an agent that already moved
+            child_cells = (*moved, child_cell, *cells[agent + 1:])
+            child_arrival = (arrival if cell == child_cell else child_step) if child_cell == goal_cells[agent] else -1
+            child_g = g_val - cost + (child_step if child_arrival < 0 else child_arrival)
+            child_h = h_val - h_flats[agent][cell] + h_flats[agent][child_cell]
+            child_agent = (agent + 1) % num_agents
+            child_base = child_cells if child_agent == 0 else base
+            child_key = (child_cells, child_base, child_agent, min(child_step if child_agent == 0 else step, horizon))
+            if closed.get(child_key, child_g + 1) <= child_g:
+                continue
+            bases.append(child_base)
+            nodes.append(child_cells)
+            parents.append(node)
+            next_agents.append(child_agent)
+            arrivals.append((*arrivals[node][:agent], child_arrival, *arrivals[node][agent + 1:]))
+            g_vals.append(child_g)
+            heapq.heappush(open_list, (child_g + child_h, child_h, child_step if child_agent == 0 else step,
+                                       len(nodes) - 1))
+
+    record_search(stats, limits, expanded, len(nodes))
+    return None  # Failed to find solutions
+
+
+def get_paths(nodes: list[tuple[int, ...]],
+              parents: list[int],
+              next_agents: list[int],
+              node: int,
+              arrivals: tuple[int, ...],
+              coords: list[tuple[int, int]]) -> list[list[tuple[int, int]]]:
+    """
+        Builds the paths of all agents by walking up the parents of the final joint search node, skipping the
+        intermediate nodes. Every path ends with the last arrival of its agent at the goal, where the agent remains
+        afterwards.
+
+    :param nodes:       {list}  cells of all agents of every search node
+    :param parents:     {list}  index of the parent of every search node, -1 for the root
+    :param next_agents: {list}  agent to move next of every search node, 0 for full nodes
+    :param node:        {int}   index of the final search node
+    :param arrivals:    {tuple} timestep of the last arrival of every agent at its goal in the final node
+    :param coords:      {list}  location of every cell
+
+    :return:            {list}  path of every agent
+    """
+    joint = []
+    while node != -1:
+        if next_agents[node] == 0:
+            joint.append(nodes[node])
+        node = parents[node]
+    joint.reverse()
+    return [[coords[cells[i]] for cells in joint[:arrival + 1]] for i, arrival in enumerate(arrivals)]
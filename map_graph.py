@@ -0,0 +1,199 @@
+"""
+Preprocessed representation of a map shared by the low-level search, the heuristics and the field of view. It is built
+once per map and cached by the map fingerprint, so all solvers and agents working on the same map share one instance.
+"""
+import collections
+import functools
+import weakref
+import numpy as np
+import numpy.typing as npt
+
+import heuristics
+import utils
+
+
+class MapGraph:
+    """
+        Padded grid and neighbour table of a map. The grid is surrounded by a border of sentinel walls, so neighbouring
+        cells can be found by adding a fixed offset to a flat index without any bounds checks. The neighbour table is
+        stored in compressed sparse row format: the neighbours of cell c are targets[offsets[c]:offsets[c + 1]]. Cells
+        are indexed unpadded as row * width + col, matching the flat heuristic tables, and the list of neighbours of
+        every free cell includes the cell itself for the wait action.
+
+    :param adjacency:   {list}          neighbours of every cell as tuple, the CSR table unpacked into python objects
+                                        for the scalar search loops. Wall cells have no neighbours
+    :param coords:      {list}          location (y, x) of every flat cell index
+    :param height:      {int}           number of rows of the map
+    :param offsets:     {np.ndarray}    CSR row pointer of the neighbour table with height * width + 1 entries
+    :param padded:      {np.ndarray}    boolean map with a border of walls, padded[y + 1, x + 1] == my_map[y, x]
+    :param targets:     {np.ndarray}    CSR column indices of the neighbour table
+    :param walls:       {list}          wall flag of every flat cell index
+    :param width:       {int}           number of columns of the map
+    """
+
+    def __init__(self, my_map: npt.NDArray[bool]) -> None:
+        """
+            Initialization function of the MapGraph, builds the padded grid and the neighbour table
+
+        :param my_map:  {np.ndarray}    Map provided as boolean numpy array where True indicates a wall
+        """
+        walls = np.asarray(my_map, dtype=bool)
+        self.height, self.width = walls.shape
+        self.padded = np.pad(walls, 1, constant_values=True)
+        self.padded.flags.writeable = False
+
+        # neighbour of every cell in the order of utils.DIRECTIONS, found by shifting the padded grid
+        free = ~self.padded[1:-1, 1:-1]
+        cells = np.arange(self.height * self.width, dtype=np.int32).reshape(walls.shape)
+        candidates = []
+        for dy, dx in utils.DIRECTIONS:
+            shifted_free = ~self.padded[1 + dy:1 + dy + self.height, 1 + dx:1 + dx + self.width] & free
+            candidates.append(np.where(shifted_free, cells + dy * self.width + dx, -1).ravel())
+        candidates = np.stack(candidates, axis=1)
+
+        valid = candidates >= 0
+        self.offsets = np.zeros(self.height * self.width + 1, dtype=np.int32)
+        np.cumsum(valid.sum(axis=1), out=self.offsets[1:])
+        self.targets = candidates[valid].astype(np.int32)
+
+        targets = self.targets.tolist()
+        offsets = self.offsets.tolist()
+        self.adjacency: list[tuple[int, ...]] = [tuple(targets[offsets[c]:offsets[c + 1]])
+                                                 for c in range(self.height * self.width)]
+        self.walls: list[bool] = walls.ravel().tolist()
+        self.coords: list[tuple[int, int]] = [(row, col) for row in range(self.height) for col in range(self.width)]
+
+    def cell(self, loc: tuple[int, int]) -> int:
+        """
+            Converts a location into its flat cell index
+
+        :param loc: {tuple} location given as (y, x)
+
+        :return:    {int}   flat cell index
+        """
+        return int(loc[0]) * self.width + int(loc[1])
+
+    def is_wall(self, loc: tuple[int, int]) -> bool:
+        """
+            Checks if a location is a wall, locations outside the map are not considered to be walls
+
+        :param loc: {tuple} location given as (y, x)
+
+        :return:    {bool}  True if the location is a wall of the map
+        """
+        return 0 <= loc[0] < self.height and 0 <= loc[1] < self.width and self.walls[loc[0] * self.width + loc[1]]
+
+    def distances(self, goal: tuple[int, int]) -> npt.NDArray[np.int32]:
+        """
+            Computes the distance of every cell to the given goal with a breadth first wavefront over the flattened
+            padded grid. Thanks to the sentinel border a move is a shift of the flat frontier by a fixed offset and can
+            never wrap around into the next row, so no slicing per direction is required.
+
+        :param goal:    {tuple}         Goal location given as (y, x)
+
+        :return:        {np.ndarray}    int32 array of the shape of the map containing the distance of each cell to
+                                        the goal, cells that can not reach the goal contain heuristics.UNREACHABLE
+        """
+        padded_width = self.width + 2
+        unvisited = ~self.padded.ravel()
+        distances = np.full(unvisited.shape, heuristics.UNREACHABLE, dtype=np.int32)
+        frontier = np.zeros(unvisited.shape, dtype=bool)
+        start = (int(goal[0]) + 1) * padded_width + int(goal[1]) + 1
+        distances[start] = 0
+        frontier[start] = True
+        unvisited[start] = False
+
+        step = 0
+        while True:
+            step += 1
+            grown = np.zeros(unvisited.shape, dtype=bool)
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            grown[padded_width:] |= frontier[:-padded_width]
+            grown[:-padded_width] |= frontier[padded_width:]
+            grown &= unvisited
+            if not grown.any():
+                break
+            distances[grown] = step
+            unvisited &= ~grown
+            frontier = grown
+
+        return distances.reshape(self.padded.shape)[1:-1, 1:-1].copy()
+
+
+class MapGraphCache:
+    """
+        Least recently used cache of MapGraph objects indexed by map fingerprint. Hashing the map on every lookup would
+        cost as much as a short low-level search, so every map array that was looked up is remembered by its identity
+        and found again without hashing as long as it is alive. Maps must therefore not be modified in place after
+        their graph was requested.
+
+    :param graphs:      {OrderedDict}   cached graphs ordered from least to most recently used
+    :param identities:  {dict}          weak reference to the map, fingerprint and graph indexed by the id of the map
+    :param maxsize:     {int}           Maximum number of graphs to keep before the least recently used one is evicted
+    """
+
+    def __init__(self, maxsize: int = 16) -> None:
+        """
+            Initialization function of the MapGraphCache
+
+        :param maxsize: {int}   Maximum number of graphs to keep before the least recently used one is evicted
+        """
+        self.maxsize = maxsize
+        self.graphs: collections.OrderedDict[str, MapGraph] = collections.OrderedDict()
+        self.identities: dict[int, tuple[weakref.ref, str, MapGraph]] = dict()
+
+    def get(self, my_map: npt.NDArray[bool]) -> MapGraph:
+        """
+            Returns the MapGraph of the given map, building it if it is not cached yet
+
+        :param my_map:  {np.ndarray}    Map provided as boolean numpy array where True indicates a wall
+
+        :return:        {MapGraph}      preprocessed map
+        """
+        identity = self.identities.get(id(my_map))
+        if identity is not None and identity[0]() is my_map:
+            if identity[1] in self.graphs:
+                self.graphs.move_to_end(identity[1])
+            return identity[2]
+
+        key = heuristics.map_fingerprint(my_map)
+        try:
+            graph = self.graphs[key]
+        except KeyError:
+            graph = MapGraph(my_map)
+            self.graphs[key] = graph
+            if len(self.graphs) > self.maxsize:
+                self.graphs.popitem(last=False)
+        else:
+            self.graphs.move_to_end(key)
+        try:
+            reference = weakref.ref(my_map, functools.partial(self.forget, id(my_map)))
+        except TypeError:  # maps given as nested lists can not be referenced weakly and are always hashed
+            return graph
+        self.identities[id(my_map)] = (reference, key, graph)
+        return graph
+
+    def forget(self, identity: int, reference: weakref.ref) -> None:
+        """
+            Callback of the weak references removing the identity of a map once the map is garbage collected
+
+        :param identity:    {int}       id of the collected map
+        :param reference:   {weakref}   dead reference to the map
+        """
+        if identity in self.identities and self.identities[identity][0] is reference:
+            del self.identities[identity]
+
+
+CACHE = MapGraphCache()
+
+
+def get(my_map: npt.NDArray[bool]) -> MapGraph:
+    """
+        Returns the shared MapGraph of the given map
+
+    :param my_map:  {np.ndarray}    Map provided as boolean numpy array where True indicates a wall
+
+    :return:        {MapGraph}      preprocessed map
+    """
+    return CACHE.get(my_map)
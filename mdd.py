@@ -0,0 +1,125 @@
+"""
+Multi-valued decision diagrams (MDD) of the optimal paths of a single agent. The MDD of an agent with path cost c
+contains at level t every location the agent can occupy at timestep t on any path of cost c that satisfies its
+constraints. Levels consisting of a single location are timesteps at which every optimal path has to pass that
+location, which is what CBS uses to classify collisions as cardinal, semi-cardinal or non-cardinal.
+"""
+from collections import abc
+import numpy.typing as npt
+
+import constraints
+import heuristics
+import map_graph
+
+
+class MDD:
+    """
+        Multi-valued decision diagram of all paths of a given cost of one agent under its constraints. Only the
+        locations of every level are stored, the edges between levels are derived by children from the map graph and
+        the constraint table when the dependency check of the high-level heuristics traverses the MDD.
+
+    :param cost:    {int}   cost of the paths contained in the MDD
+    :param goal:    {tuple} goal location of the agent, occupied at all levels after cost
+    :param levels:  {list}  set of locations at every timestep from 0 to cost, empty if no path of the cost exists
+    :param graph:   {MapGraph}          preprocessed map the MDD was built on
+    :param constraint_table:    {ConstraintTable}   constraints of the agent, used to derive the edges between levels
+    """
+
+    def __init__(self,
+                 my_map: npt.NDArray[bool],
+                 start_loc: tuple[int, int],
+                 goal_loc: tuple[int, int],
+                 h_values: abc.Mapping[tuple[int, int], int],
+                 constraint_table: constraints.ConstraintTable,
+                 cost: int) -> None:
+        """
+            Initialization function of the MDD. A forward pass collects all states (location, timestep) that are
+            reachable under the constraints and from which the goal can still be reached at timestep cost according to
+            the heuristic. A backward pass from the goal at timestep cost then removes all states that do not lie on a
+            path ending there.
+
+        :param my_map:              {np.ndarray}        binary obstacle map
+        :param start_loc:           {tuple}             start position
+        :param goal_loc:            {tuple}             goal position
+        :param h_values:            {dict}              heuristic values indexed by location
+        :param constraint_table:    {ConstraintTable}   compiled constraints of the agent
+        :param cost:                {int}               cost of the paths, at least the optimal cost of the agent
+        """
+        self.cost = cost
+        self.goal = goal_loc
+        self.graph = graph = map_graph.get(my_map)
+        self.constraint_table = constraint_table
+        h_flat = heuristics.as_table(h_values, my_map).flat
+        coords = graph.coords
+        goal_cell = graph.cell(goal_loc)
+
+        forward: list[set[int]] = [{graph.cell(start_loc)}]
+        for step in range(1, cost + 1):
+            level = set()
+            for cell in forward[-1]:
+                loc = coords[cell]
+                for child_cell in graph.adjacency[cell]:
+                    if step + h_flat[child_cell] > cost or child_cell in level:
+                        continue
+                    if not constraint_table.is_constrained(loc, coords[child_cell], step):
+                        level.add(child_cell)
+            forward.append(level)
+
+        if goal_cell not in forward[-1]:
+            self.levels: list[set[tuple[int, int]]] = []
+            return
+        backward = {goal_cell}
+        levels = [{goal_loc}]
+        for step in range(cost, 0, -1):
+            targets = backward
+            backward = set()
+            for cell in forward[step - 1]:
+                loc = coords[cell]
+                for child_cell in graph.adjacency[cell]:
+                    if child_cell in targets and not constraint_table.is_constrained(loc, coords[child_cell], step):
+                        backward.add(cell)
+                        break
+            levels.append({coords[cell] for cell in backward})
+        levels.reverse()
+        self.levels = levels
+
+    def children(self, loc: tuple[int, int], step: int) -> list[tuple[int, int]]:
+        """
+            Locations at the next level that can be reached from a location of the given level. As every location of
+            the MDD lies on a path of its cost, every allowed move between two levels is part of such a path. After the
+            cost of the MDD the agent waits at its goal.
+
+        :param loc:     {tuple} location at the level of step
+        :param step:    {int}   timestep of the level
+
+        :return:        {list}  locations at the level of step + 1
+        """
+        if step >= self.cost:
+            return [self.goal]
+        level = self.levels[step + 1]
+        coords = self.graph.coords
+        return [coords[cell] for cell in self.graph.adjacency[self.graph.cell(loc)]
+                if coords[cell] in level and not self.constraint_table.is_constrained(loc, coords[cell], step + 1)]
+
+    def width(self, step: int) -> int:
+        """
+            Number of locations the agent may occupy at the given timestep. After the cost of the MDD the agent waits
+            at its goal, so the width is 1. An empty MDD has a width of 0 at all timesteps.
+
+        :param step:    {int}   timestep to check
+
+        :return:        {int}   number of locations at the level of the timestep
+        """
+        if len(self.levels) == 0:
+            return 0
+        if step > self.cost:
+            return 1
+        return len(self.levels[step])
+
+    def __len__(self) -> int:
+        """
+            implementation of len for MDD returning the number of levels
+
+        :return:    {int}   cost plus one, 0 if no path of the cost exists
+        """
+        return len(self.levels)
@@ -0,0 +1,247 @@
+"""
+Memory-bounded storage of the open CBS nodes. Open nodes are kept as compact NodeRecords holding only the constraints
+and paths they changed compared to their parent, the full paths are reconstructed by walking up the parent records when
+a node is expanded. Once the resident memory of the process exceeds a budget, the half of the open list that would be
+expanded last is written to a temporary file and only loaded again when it reaches the top of the heap. The resident
+memory rarely drops after Python frees objects, so the next spill only happens once it grew beyond the resident memory
+measured after the last spill.
+"""
+import heapq
+import os
+import pickle
+import tempfile
+import typing
+
+
+def current_rss() -> int:
+    """
+        Resident set size of the current process. Read from /proc on Linux, other platforms fall back to the peak
+        resident size reported by the resource module or 0 if it is not available either.
+
+    :return:    {int}   resident memory in bytes
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+class NodeRecord:
+    """
+        Compact representation of an open CBS node. Constraints are stored as the constraint chain of the node, which
+        is shared with its ancestors, and paths only for the agents that were replanned compared to the parent record.
+        Records loaded from the disk store have no parent and contain the paths of all agents.
+
+    :param parent:      {NodeRecord}    Record of the node this node was created from, None if paths holds all paths
+    :param chain:       {tuple}         Constraint chain of the node as stored by CBSNode
+    :param paths:       {dict}          Paths of the agents replanned in this node indexed by agent
+    :param cost:        {int}           Cost of the paths of the node
+    :param h_value:     {int}           High-level heuristic of the node
+    :param lower_bound: {int}           Lower bound on the cost of the solutions below the node
+    :param groups:      {list}          Meta-agent of every agent
+    :param key:         {int}           Hash of the constraint multiset of the node
+    :param idx:         {int}           Unique index of the node
+    """
+
+    __slots__ = ("parent", "chain", "paths", "cost", "h_value", "lower_bound", "groups", "key", "idx")
+
+    def __init__(self,
+                 parent: typing.Optional["NodeRecord"],
+                 chain: typing.Any,
+                 paths: dict[int, list[tuple[int, int]]],
+                 cost: int,
+                 h_value: int,
+                 lower_bound: int,
+                 groups: list[tuple[int, ...]],
+                 key: int,
+                 idx: int) -> None:
+        """
+            Initialization function of the NodeRecord
+
+        :param parent:      {NodeRecord}    Record of the parent node or None if paths holds all paths
+        :param chain:       {tuple}         Constraint chain of the node
+        :param paths:       {dict}          Paths that differ from the parent indexed by agent
+        :param cost:        {int}           Cost of the paths of the node
+        :param h_value:     {int}           High-level heuristic of the node
+        :param lower_bound: {int}           Lower bound on the cost of the solutions below the node
+        :param groups:      {list}          Meta-agent of every agent
+        :param key:         {int}           Hash of the constraint multiset of the node
+        :param idx:         {int}           Unique index of the node
+        """
+        self.parent = parent
+        self.chain = chain
+        self.paths = paths
+        self.cost = cost
+        self.h_value = h_value
+        self.lower_bound = lower_bound
+        self.groups = groups
+        self.key = key
+        self.idx = idx
+
+    def full_paths(self, num_of_agents: int) -> list[list[tuple[int, int]]]:
+        """
+            Reconstructs the paths of all agents by walking up the parent records, the path of an agent is taken from
+            the closest record that replanned it
+
+        :param num_of_agents:   {int}   number of agents of the problem
+
+        :return:                {list}  path of every agent
+        """
+        paths: list[typing.Optional[list[tuple[int, int]]]] = [None] * num_of_agents
+        missing = num_of_agents
+        record: typing.Optional[NodeRecord] = self
+        while missing > 0 and record is not None:
+            for agent, path in record.paths.items():
+                if paths[agent] is None:
+                    paths[agent] = path
+                    missing -= 1
+            record = record.parent
+        return typing.cast(list[list[tuple[int, int]]], paths)
+
+    def detach(self, num_of_agents: int) -> tuple:
+        """
+            Converts the record into a self-contained tuple that can be pickled without its ancestors. The constraint
+            chain is flattened into a single list, so its depth does not limit pickling.
+
+        :param num_of_agents:   {int}   number of agents of the problem
+
+        :return:                {tuple} all constraints, all paths, cost, heuristic, lower bound, meta-agents, key and
+                                        index
+        """
+        constraint_lists = []
+        chain = self.chain
+        while chain is not None:
+            constraint_lists.append(chain[0])
+            chain = chain[1]
+        constraint_list = [c for constraints in reversed(constraint_lists) for c in constraints]
+        return (constraint_list, self.full_paths(num_of_agents), self.cost, self.h_value, self.lower_bound,
+                self.groups, self.key, self.idx)
+
+    @classmethod
+    def attach(cls, data: tuple) -> "NodeRecord":
+        """
+            Creates a record without parent from a tuple created by detach
+
+        :param data:    {tuple}         self-contained data of a record
+
+        :return:        {NodeRecord}    record holding the paths of all agents
+        """
+        constraint_list, paths, cost, h_value, lower_bound, groups, key, idx = data
+        return cls(None, (constraint_list, None), dict(enumerate(paths)), cost, h_value, lower_bound, groups, key, idx)
+
+
+class BoundedOpenList:
+    """
+        Open list of NodeRecords ordered by a sort key that keeps its resident memory within a budget. Every
+        CHECK_INTERVAL pushes the resident memory of the process is compared against a threshold, if it is exceeded
+        the half of the in-memory heap with the largest sort keys is pickled into a temporary file. Only the sort keys
+        and file offsets of these records stay in memory and a record is loaded again once its key is the smallest of
+        the open list. The threshold starts at the budget and is raised to the resident memory measured after every
+        spill, as the memory freed by a spill is reused by the process but rarely returned to the operating system.
+
+    :param budget:      {int}       resident memory in bytes above which records are spilled to the disk
+    :param directory:   {str}       directory of the temporary file, the default temporary directory if None
+    :param rss:         {function}  function returning the current resident memory in bytes
+    :param threshold:   {int}       resident memory in bytes above which the next spill happens, at least the budget
+    :param heap:        {list}      heap of (sort key, record) pairs kept in memory
+    :param spilled:     {list}      heap of (sort key, offset, size) triples of the records in the file
+    :param file:        {file}      temporary file holding the spilled records, created on the first spill
+    :param num_of_agents:   {int}   number of agents, required to detach the records
+    :param num_of_spilled:  {int}   Counter for records written to the file
+    :param pushes:      {int}       Counter for pushed records, used to check the memory every CHECK_INTERVAL pushes
+    """
+
+    CHECK_INTERVAL = 64
+    # the in-memory heap is not spilled below this size to avoid writing every record on its own
+    MIN_RECORDS = 16
+
+    def __init__(self,
+                 budget: int,
+                 directory: typing.Optional[str] = None,
+                 rss: typing.Callable[[], int] = current_rss,
+                 num_of_agents: int = 0) -> None:
+        """
+            Initialization function of the BoundedOpenList
+
+        :param budget:          {int}       resident memory in bytes above which records are spilled
+        :param directory:       {str}       directory of the temporary file or None
+        :param rss:             {function}  function returning the current resident memory in bytes
+        :param num_of_agents:   {int}       number of agents, required to detach the records
+        """
+        self.budget = budget
+        self.directory = directory
+        self.rss = rss
+        self.threshold = budget
+        self.num_of_agents = num_of_agents
+        self.heap: list[tuple[tuple, NodeRecord]] = []
+        self.spilled: list[tuple[tuple, int, int]] = []
+        self.file: typing.Optional[typing.BinaryIO] = None
+        self.num_of_spilled = 0
+        self.pushes = 0
+
+    def push(self, sort_key: tuple, record: NodeRecord) -> None:
+        """
+            Pushes a record onto the in-memory heap and spills the worse half of the heap if the resident memory
+            exceeds the threshold
+
+        :param sort_key:    {tuple}         unique key ordering the records, smallest first
+        :param record:      {NodeRecord}    record to push
+        """
+        heapq.heappush(self.heap, (sort_key, record))
+        self.pushes += 1
+        if self.pushes % self.CHECK_INTERVAL == 0 and len(self.heap) >= self.MIN_RECORDS and \
+                self.rss() > self.threshold:
+            self.spill()
+
+    def pop(self) -> NodeRecord:
+        """
+            Pops the record with the smallest sort key from either the in-memory heap or the file
+
+        :return:    {NodeRecord}    record with the smallest sort key
+        """
+        if len(self.spilled) > 0 and (len(self.heap) == 0 or self.spilled[0][0] < self.heap[0][0]):
+            _, offset, size = heapq.heappop(self.spilled)
+            self.file.seek(offset)
+            return NodeRecord.attach(pickle.loads(self.file.read(size)))
+        return heapq.heappop(self.heap)[1]
+
+    def spill(self) -> None:
+        """
+            Writes the half of the in-memory heap with the largest sort keys into the temporary file and raises the
+            threshold of the next spill to the resident memory afterwards
+        """
+        if self.file is None:
+            self.file = tempfile.TemporaryFile(dir=self.directory)
+        self.heap.sort(key=lambda entry: entry[0])
+        keep = len(self.heap) // 2
+        self.file.seek(0, os.SEEK_END)
+        for sort_key, record in self.heap[keep:]:
+            data = pickle.dumps(record.detach(self.num_of_agents), protocol=pickle.HIGHEST_PROTOCOL)
+            offset = self.file.tell()
+            self.file.write(data)
+            heapq.heappush(self.spilled, (sort_key, offset, len(data)))
+        self.num_of_spilled += len(self.heap) - keep
+        del self.heap[keep:]  # a sorted list is a valid heap
+        self.threshold = max(self.budget, self.rss())
+
+    def close(self) -> None:
+        """
+            Closes and removes the temporary file
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __len__(self) -> int:
+        """
+            implementation of len for BoundedOpenList returning the number of open records
+
+        :return:    {int}   number of records in memory and in the file
+        """
+        return len(self.heap) + len(self.spilled)
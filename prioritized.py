@@ -1,11 +1,16 @@
 from collections import abc
+import concurrent.futures
 import math
 import numpy as np  # type: ignore
 import numpy.typing as npt
 import time as timer
+import typing
 
 import constraints
-from single_agent_planner import compute_heuristics, a_star, get_sum_of_cost
+import search_limits
+import utils
+import worker_pool
+from single_agent_planner import compute_heuristics, get_sum_of_cost
 import base_solver
 
 
@@ -32,7 +37,16 @@ class PrioritizedPlanningSolver(base_solver.BaseSolver):
     :param num_of_agents:   {int}       The number of agents within the environment. Extracted from the supplied goal or 
                                         start positions.
     :param heuristics:      {list}      List containing the heuristics.
-    :param recursive:       {bool}      Boolean value enabling and disabling recursive mode (...)
+    :param recursive:       {bool}      Boolean value enabling and disabling the reordering of priorities when an
+                                        agent can not be planned
+    :param max_swaps:       {int}       Maximum number of priority swaps of one attempt before it is restarted
+    :param restarts:        {int}       Maximum number of restarts with a random priority order
+    :param rng:             {Generator} Random number generator of the restarts
+    :param order:           {list}      Priority order of the agents, highest priority first. Used by the first attempt
+                                        of find_solution and replaced by the order of the returned solution
+    :param num_of_swaps:    {int}       Counter for swaps of the priorities of two agents
+    :param num_of_restarts: {int}       Counter for restarts with a random priority order
+    :param num_of_searches: {int}       Counter for low-level searches
     """
 
     def __init__(self,
@@ -45,8 +59,12 @@ class PrioritizedPlanningSolver(base_solver.BaseSolver):
                      dict[tuple[int, int], int]] = compute_heuristics,
                  printing: bool = True,
                  recursive: bool = True,
+                 max_swaps: typing.Optional[int] = None,
+                 restarts: int = 10,
+                 seed: typing.Optional[int] = None,
+                 order: typing.Optional[list[int]] = None,
                  **kwargs) -> None:
-        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing)
+        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing, **kwargs)
         """
             Initialise an instance of the BaseSolver class.
 
@@ -62,90 +80,444 @@ class PrioritizedPlanningSolver(base_solver.BaseSolver):
         :param printing:        {bool}      Variable to enable and disable printing within the model. This allows for the 
                                             user to specify if they would like to receive the solver outcome after every 
                                             run or not. True enables printing while false disables this behavior. 
-        :param recursive:       {bool}      Boolean value enabling and disabling recursive mode (...) 
+        :param recursive:       {bool}      Boolean value enabling and disabling the reordering of priorities. When an
+                                            agent can not be planned it swaps its priority with the agent planned
+                                            before it, see solve_prioritized. Without it the solver fails instead.
+        :param max_swaps:       {int}       Maximum number of swaps of one attempt before it is given up and restarted,
+                                            the squared number of agents if None
+        :param restarts:        {int}       Maximum number of restarts with a random priority order once an attempt is
+                                            given up, the solver fails after the last one
+        :param seed:            {int}       Seed of the random number generator of the restarts, None uses the shared
+                                            utils.RNG
+        :param order:           {list}      Priority order of the first attempt, highest priority first, the order of
+                                            the agents if None
         """
         
         self.recursive = recursive
+        self.max_swaps = max_swaps if max_swaps is not None else self.num_of_agents ** 2
+        self.restarts = restarts
+        self.rng = np.random.default_rng(seed) if seed is not None else utils.RNG
+        self.order = list(order) if order is not None else list(range(self.num_of_agents))
+        self.num_of_swaps = 0
+        self.num_of_restarts = 0
+        self.num_of_searches = 0
 
-    def find_solution(self, base_constraints: list[constraints.Constraint]) -> list[list[tuple[int, int]]]:
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[search_limits.SearchLimits] = None) -> list[list[tuple[int, int]]]:
         """
             Finds paths for all agents from their start locations to their goal locations. Overwrites the baseclass
             find_solution function.
 
         :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token shared by all
+                                                    low-level searches including those of the recursive reorderings
 
         :return:                    {list}          Returns the paths traversed by all agents
+
+        :raise:                                     SearchAborted
         """
 
         start_time = timer.time()
 
-        result = self.solve_prioritized(base_constraints)
+        try:
+            result = self.solve_prioritized(base_constraints, limits=limits, order=self.order)
+        except search_limits.SearchAborted as error:
+            self.CPU_time = timer.time() - start_time
+            error.solver_stats = self.solver_stats()
+            raise
 
         self.CPU_time = timer.time() - start_time
         return result
 
     def solve_prioritized(self,
                           base_constraints: list[constraints.Constraint],
-                          depth: int = 0) -> list[list[tuple[int, int]]]:
+                          limits: typing.Optional[search_limits.SearchLimits] = None,
+                          order: typing.Optional[list[int]] = None) -> list[list[tuple[int, int]]]:
         """
-            Finds paths for all agents from their start locations to their goal locations. Overwrites the baseclass
-            find_solution function.
+            Finds paths for all agents from their start locations to their goal locations.
             The solve_prioritized main idea it to allocate path to the various agents from start to finish, where the
             paths are assigned based on pre-assigned priorities. First a full path is assigned to the agent with the
             highest priority. Once this agent has its full path assigned trough the use of a space time A* implementation
             the next agent may be planned. This is the agent with the second highest priority. The second agent is now
             planned keeping in mind the path of the first agent. This procedure is performed until all agents have been
-            allocated a path. It may happen under the current priority distribution that problem is not solvable. Within
-            this case the priorities will be shuffled/ reassigned and recursively solved, until either the maximum recursive
-            depth is reach, the problem is solved or no solution can be found based.
+            allocated a path.
+            It may happen under the current priority distribution that an agent can not be planned. Within this case
+            its priority is swapped with the agent planned before it. The paths of all agents before the swap point do
+            not depend on the swapped agents, so they are kept together with the reserved paths and only the suffix is
+            replanned. An attempt is given up when it reaches a swap state, the planned prefix of the order including
+            the failing agent, that it has seen before, as it would repeat itself from there on, or after max_swaps
+            swaps. The agents are then restarted in a random order, up to restarts times.
 
         :param base_constraints:    {list}              Constraints to be considered during the solve procedure
-        :param depth:               {int}               How many recursion steps have been taken so far. Used to
-                                                        ensure failure incase of infinite recursion.
+        :param limits:              {SearchLimits}      Optional node budget, deadline and cancellation token
+        :param order:               {list}              Priority order of the first attempt, highest priority first,
+                                                        the order of the agents if None
 
-        :return:                    {list}              Returns the paths traversed by all agents, recursive
-        :return:                    {list}              Returns the paths traversed by all agents
+        :return:                    {list}              Returns the paths traversed by all agents, in the order of the
+                                                        agents
 
-        :raise:                                         RecursionError
         :raise:                                         BaseException
         """
+        order = list(order) if order is not None else list(range(self.num_of_agents))
+        paths: list[typing.Optional[list[tuple[int, int]]]] = [None] * self.num_of_agents
+        # Paths of the agents before every position of the order, shared by the tables of all following agents
+        reservations = [constraints.ConstraintTable([], -1)]
+        seen: set[tuple[int, ...]] = set()
+        swaps = 0
+        restarts = 0
+        position = 0
 
-        result = []
-        constraint_list: list[constraints.Constraint] = [*base_constraints]
-        # Escape infinite recursion
-        if depth == math.factorial(len(self.starts)):
-            raise RecursionError('No solutions')
+        while position < len(order):
+            agent = order[position]
+            table = reservations[position].copy(agent)
+            for constraint in base_constraints:
+                table.add(constraint)
+
+            # Plan the path for the agent with the next priority
+            path = self.low_level(self.my_map, self.starts[agent], self.goals[agent], self.heuristics[agent],
+                                  agent, [], table, limits=limits)
+            self.num_of_searches += 1
+            if path is not None:
+                paths[agent] = path
+                del reservations[position + 1:]
+                reservations.append(reservations[position].copy())
+                reservations[-1].reserve(path)
+                position += 1
+                continue
 
-        for a, start in enumerate(self.starts):  # Find path for each agent
-            
-            # Plan the path for agent a starting at start
-            path = a_star(self.my_map, start, self.goals[a], self.heuristics[a],
-                          a, constraint_list)
-            
             # No solution found
-            if path is None and (a == 0 or self.recursive == False):
+            if position == 0 or not self.recursive:
                 raise BaseException('No solutions')
-            
-            if path is None:
-                self.starts[a], self.starts[a - 1] = self.starts[a - 1], self.starts[a]
-                self.goals[a], self.goals[a - 1] = self.goals[a - 1], self.goals[a]
-                self.heuristics[a], self.heuristics[a - 1] = self.heuristics[a - 1], self.heuristics[a]
-                for c in base_constraints:
-                    if c.agent == a:
-                        c.agent -= 1
-                    elif c.agent == a - 1:
-                        c.agent += 1
-                result = self.solve_prioritized(base_constraints, depth + 1)
-                for c in base_constraints:
-                    if c.agent == a:
-                        c.agent -= 1
-                    elif c.agent == a - 1:
-                        c.agent += 1
-                result[a - 1], result[a] = result[a], result[a - 1]
-                return result
-            result.append(path)
-
-            for t, path_vertex in enumerate(path[:-1]):
-                constraint_list.append(constraints.Constraint(True, a, t + 1, path_vertex, path[t + 1]))
-            constraint_list.append(constraints.Constraint(True, a, len(path), path[-1], infinite=True))
-        return result
+
+            state = tuple(order[:position + 1])
+            if state not in seen and swaps < self.max_swaps:
+                seen.add(state)
+                order[position - 1], order[position] = order[position], order[position - 1]
+                position -= 1
+                swaps += 1
+                self.num_of_swaps += 1
+                continue
+
+            if restarts >= self.restarts:
+                raise BaseException('No solutions')
+            order = [int(a) for a in self.rng.permutation(self.num_of_agents)]
+            reservations = reservations[:1]
+            seen.clear()
+            swaps = 0
+            restarts += 1
+            self.num_of_restarts += 1
+            position = 0
+
+        self.order = order
+        return typing.cast(list[list[tuple[int, int]]], paths)
+
+    def solver_stats(self) -> dict[str, typing.Any]:
+        """
+            Counters describing the progress of the prioritized solver, attached to SearchAborted exceptions
+
+        :return:    {dict}  counters indexed by name
+        """
+        return {**super().solver_stats(),
+                "searches": self.num_of_searches,
+                "swaps": self.num_of_swaps,
+                "restarts": self.num_of_restarts}
+
+
+class PrioritizedPortfolioSolver(base_solver.BaseSolver):
+    """
+        Portfolio of prioritized planners that only differ in the priority order of their first attempt: the given
+        order, the agents with the shortest distance to their goal first, the longest distance first and random orders.
+        With workers the orderings are solved concurrently in a worker_pool.SolverPool, otherwise one after another.
+        The first solution found is returned, or the cheapest one found within the time limit, and the planners still
+        running are cancelled.
+
+    :param CPU_time:        {float}     Value to keep track of the cpu time required for the solver to complete the
+                                        planning
+    :param my_map:          {list}      List of list of boolean, describing the map environment. True indicates a wall.
+    :param starts:          {list}      List of starting positions for the agents. Given as list of tuple of integer,
+                                        where each each tuple is of the following form (y, x)
+    :param goals:           {list}      List of goal/ end positions for the agents. Given as list of tuple of integer,
+                                        where each each tuple is of the following form (y, x)
+    :param printing:        {bool}      Flag to enable and disable printing within the model
+    :param num_of_agents:   {int}       The number of agents within the environment
+    :param heuristics:      {list}      List containing the heuristics.
+    :param orderings:       {int}       Number of priority orders in the portfolio
+    :param time_limit:      {float}     Seconds after which the planners still running are cancelled, None for no limit
+    :param first_success:   {bool}      Flag to return the first solution instead of the cheapest one
+    :param inner_kwargs:    {dict}      Keyword arguments of every PrioritizedPlanningSolver of the portfolio
+    :param rng:             {Generator} Random number generator of the random orders and the seeds of the planners
+    :param portfolio_stats: {list}      Statistics of every ordering of the last call of find_solution, see
+                                        record_ordering
+    :param best:            {int}       Index of the ordering whose solution was returned, None if there is none
+    """
+
+    def __init__(self,
+                 my_map: npt.NDArray[bool],
+                 starts: list[tuple[int, int]],
+                 goals: list[tuple[int, int]],
+                 score_func: abc.Callable[[list[list[tuple[int, int]]]], int] = get_sum_of_cost,
+                 heuristics_func: abc.Callable[
+                     [npt.NDArray[bool], tuple[int, int]],
+                     dict[tuple[int, int], int]] = compute_heuristics,
+                 printing: bool = True,
+                 orderings: int = 4,
+                 time_limit: typing.Optional[float] = None,
+                 first_success: bool = True,
+                 seed: typing.Optional[int] = None,
+                 inner_kwargs: typing.Optional[dict[str, typing.Any]] = None,
+                 **kwargs) -> None:
+        """
+            Initialise an instance of the PrioritizedPortfolioSolver class.
+
+        :param my_map:          {list}      List of list of boolean, describing the map environment. True indicates a
+                                            wall.
+        :param starts:          {list}      List of starting positions for the agents. Given as list of tuple of
+                                            integer, where each each tuple is of the following form (y, x).
+        :param goals:           {list}      List of goal/end positions for the agents. Given as list of tuple of
+                                            integer, where each each tuple is of the following form (y, x).
+        :param score_func:      {function}  Score function, also used to compare the solutions of the orderings
+        :param heuristics_func: {function}  Heuristics function, also passed to the planners
+        :param printing:        {bool}      Flag to enable and disable printing within the model.
+        :param orderings:       {int}       Number of priority orders, the given, shortest first and longest first
+                                            orders followed by random ones. Only the first orders are used if less than
+                                            three.
+        :param time_limit:      {float}     Seconds after which the planners still running are cancelled and the best
+                                            solution found so far is returned, None to wait for all planners
+        :param first_success:   {bool}      Flag to return the first solution found and cancel the other planners, the
+                                            cheapest solution found within the time limit is returned otherwise
+        :param seed:            {int}       Seed of the random orders and of the random restarts of the planners, None
+                                            uses the shared utils.RNG
+        :param inner_kwargs:    {dict}      Keyword arguments of every PrioritizedPlanningSolver, for example restarts.
+                                            The planners run without printing and, when this solver has workers, in the
+                                            worker processes.
+
+        :raise:                             ValueError
+        """
+        super().__init__(my_map, starts, goals, score_func, heuristics_func, printing, **kwargs)
+        if orderings < 1:
+            raise ValueError(f"orderings has to be at least 1, got {orderings}")
+        self.orderings = orderings
+        self.time_limit = time_limit
+        self.first_success = first_success
+        self.inner_kwargs = {"score_func": score_func, "heuristics_func": heuristics_func,
+                             "cache_heuristics": self.cache_heuristics, "low_level": self.low_level,
+                             **(inner_kwargs or dict()), "printing": False}
+        self.rng = np.random.default_rng(seed) if seed is not None else utils.RNG
+        self.portfolio_stats: list[dict[str, typing.Any]] = []
+        self.best: typing.Optional[int] = None
+
+    def find_solution(self,
+                      base_constraints: list[constraints.Constraint],
+                      limits: typing.Optional[search_limits.SearchLimits] = None) -> list[list[tuple[int, int]]]:
+        """
+            Solves the problem once for every ordering of the portfolio, see solve_parallel and solve_sequential, and
+            returns the cheapest of the solutions collected. Ties are broken by the position of the ordering.
+
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token of the caller,
+                                                    the remaining node budget applies to every ordering on its own
+
+        :return:                    {list}          Paths traversed by all agents
+
+        :raise:                                     BaseException
+        :raise:                                     SearchAborted
+        """
+        start_time = timer.time()
+        deadline = timer.perf_counter() + self.time_limit if self.time_limit is not None else None
+        self.portfolio_stats = [{"ordering": name, "order": order, "status": "cancelled", "cost": None}
+                                for name, order in self.priority_orders()]
+        self.best = None
+        seeds = [int(seed) for seed in self.rng.integers(2 ** 31, size=len(self.portfolio_stats))]
+        try:
+            if self.workers > 1:
+                solutions = self.solve_parallel(base_constraints, limits, deadline, seeds)
+            else:
+                solutions = self.solve_sequential(base_constraints, limits, deadline, seeds)
+            if len(solutions) == 0:
+                self.raise_failure(limits, deadline)
+        except search_limits.SearchAborted as error:
+            self.CPU_time = timer.time() - start_time
+            error.solver_stats = self.solver_stats()
+            raise
+
+        self.best = min(solutions, key=lambda index: (self.portfolio_stats[index]["cost"], index))
+        self.CPU_time = timer.time() - start_time
+        if self.printing:
+            print("\n Found a solution! \n")
+            print("CPU time (s):    {:.2f}".format(self.CPU_time))
+            print("Sum of costs:    {}".format(get_sum_of_cost(solutions[self.best])))
+            print("Ordering:        {}".format(self.portfolio_stats[self.best]["ordering"]))
+        return solutions[self.best]
+
+    def priority_orders(self) -> list[tuple[str, list[int]]]:
+        """
+            Priority orders of the portfolio, the distance of an agent is the heuristic value of its start location
+
+        :return:    {list}  name and priority order, highest priority first, of every ordering
+        """
+        agents = list(range(self.num_of_agents))
+        distances = [self.heuristics[agent].get(self.starts[agent], math.inf) for agent in agents]
+        result = [("given", agents),
+                  ("shortest first", sorted(agents, key=lambda agent: distances[agent])),
+                  ("longest first", sorted(agents, key=lambda agent: -distances[agent]))]
+        while len(result) < self.orderings:
+            result.append((f"random {len(result) - 2}", [int(agent) for agent in self.rng.permutation(agents)]))
+        return result[:self.orderings]
+
+    def solve_parallel(self,
+                       base_constraints: list[constraints.Constraint],
+                       limits: typing.Optional[search_limits.SearchLimits],
+                       deadline: typing.Optional[float],
+                       seeds: list[int]) -> dict[int, list[list[tuple[int, int]]]]:
+        """
+            Submits all orderings to a cancellable worker_pool.SolverPool at once and collects the planners as they
+            finish. Once a solution is found with first_success, the deadline passed or the token of the caller was
+            cancelled the pool is cancelled, which aborts the running planners, and their counters are collected as
+            well. The token of the caller is only checked whenever a planner finishes.
+
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
+        :param deadline:            {float}         time.perf_counter() value of the time limit or None
+        :param seeds:               {list}          seed of the planner of every ordering
+
+        :return:                    {dict}          paths of every ordering that found a solution
+        """
+        solutions: dict[int, list[list[tuple[int, int]]]] = dict()
+        pool = worker_pool.SolverPool(min(self.workers, len(self.portfolio_stats)), self.my_map,
+                                      PrioritizedPlanningSolver, self.inner_kwargs, cancellable=True)
+        try:
+            futures = {pool.submit(self.starts, self.goals, base_constraints, limits, order=entry["order"],
+                                   seed=seed): index
+                       for index, (entry, seed) in enumerate(zip(self.portfolio_stats, seeds))}
+            pending = set(futures)
+            while len(pending) > 0 and not (self.first_success and len(solutions) > 0):
+                timeout = deadline - timer.perf_counter() if deadline is not None else None
+                if (timeout is not None and timeout <= 0) or (limits is not None and limits.token is not None and
+                                                               limits.token.cancelled):
+                    break
+                done, pending = concurrent.futures.wait(pending, timeout, concurrent.futures.FIRST_COMPLETED)
+                for future in sorted(done, key=futures.__getitem__):
+                    self.record_ordering(futures[future], lambda: pool.result(future, limits), solutions)
+
+            pool.cancel()
+            for future in sorted(pending, key=futures.__getitem__):
+                if not future.cancel():
+                    self.record_ordering(futures[future], lambda: pool.result(future, limits), solutions)
+        finally:
+            pool.close()
+        return solutions
+
+    def solve_sequential(self,
+                         base_constraints: list[constraints.Constraint],
+                         limits: typing.Optional[search_limits.SearchLimits],
+                         deadline: typing.Optional[float],
+                         seeds: list[int]) -> dict[int, list[list[tuple[int, int]]]]:
+        """
+            Solves the orderings one after another in this process. A planner is aborted at the deadline and the
+            orderings after a solution found with first_success, after the deadline or after the token of the caller
+            was cancelled are not started.
+
+        :param base_constraints:    {list}          Constraints to be considered during the solve procedure
+        :param limits:              {SearchLimits}  Optional node budget, deadline and cancellation token
+        :param deadline:            {float}         time.perf_counter() value of the time limit or None
+        :param seeds:               {list}          seed of the planner of every ordering
+
+        :return:                    {dict}          paths of every ordering that found a solution
+        """
+        solutions: dict[int, list[list[tuple[int, int]]]] = dict()
+        for index, (entry, seed) in enumerate(zip(self.portfolio_stats, seeds)):
+            if (self.first_success and len(solutions) > 0) or (deadline is not None and
+                                                                timer.perf_counter() >= deadline) or \
+                    (limits is not None and limits.token is not None and limits.token.cancelled):
+                break
+
+            def run() -> tuple[list[list[tuple[int, int]]], dict[str, typing.Any]]:
+                node_budget, time_limit = worker_pool.limit_arguments(limits)
+                if deadline is not None:
+                    remaining = deadline - timer.perf_counter()
+                    time_limit = remaining if time_limit is None else min(time_limit, remaining)
+                run_limits = None
+                if limits is not None or time_limit is not None:
+                    run_limits = search_limits.SearchLimits(node_budget, time_limit,
+                                                            token=limits.token if limits is not None else None)
+                solver = PrioritizedPlanningSolver(self.my_map, self.starts, self.goals, order=entry["order"],
+                                                   seed=seed, **self.inner_kwargs)
+                try:
+                    paths = solver.find_solution(base_constraints, run_limits)
+                except search_limits.SearchAborted as error:
+                    if limits is not None:
+                        limits.record(error.stats.expanded, error.stats.generated)
+                    raise
+                if limits is not None and run_limits is not None:
+                    limits.record(run_limits.stats.expanded, run_limits.stats.generated)
+                return paths, solver.solver_stats()
+
+            self.record_ordering(index, run, solutions)
+        return solutions
+
+    def record_ordering(self,
+                        index: int,
+                        run: abc.Callable[[], tuple[list[list[tuple[int, int]]], dict[str, typing.Any]]],
+                        solutions: dict[int, list[list[tuple[int, int]]]]) -> None:
+        """
+            Runs or waits for the planner of an ordering and records its outcome in portfolio_stats. Next to the name,
+            the priority order and the cost of the solution, every entry holds the solver_stats of the planner and its
+            status: solved, failed if the planner found no solution, aborted if it was stopped by the limits of the
+            caller, or by the time limit when solving without workers, and cancelled if it was cancelled by the pool or
+            never started. Any other exception, like a KeyboardInterrupt or a broken worker pool, is raised.
+
+        :param index:       {int}       index of the ordering
+        :param run:         {function}  returns the paths and solver_stats of the planner
+        :param solutions:   {dict}      paths of every ordering that found a solution, updated
+
+        :raise:                         BaseException
+        """
+        entry = self.portfolio_stats[index]
+        try:
+            paths, solver_stats = run()
+        except search_limits.SearchCancelled as error:
+            entry.update(error.solver_stats, status="cancelled")
+            return
+        except search_limits.SearchAborted as error:
+            entry.update(error.solver_stats, status="aborted")
+            return
+        except BaseException as error:
+            if type(error) is not BaseException:  # only a plain BaseException signals that there is no solution
+                raise
+            entry.update(status="failed")
+            return
+        entry.update(solver_stats, status="solved", cost=self.score_func(paths))
+        solutions[index] = paths
+
+    def raise_failure(self,
+                      limits: typing.Optional[search_limits.SearchLimits],
+                      deadline: typing.Optional[float]) -> None:
+        """
+            Raises the reason that no ordering found a solution: the exceeded limits of the caller, the exceeded time
+            limit or otherwise that there is no solution
+
+        :param limits:      {SearchLimits}  limits of the caller or None
+        :param deadline:    {float}         time.perf_counter() value of the time limit or None
+
+        :raise:                             SearchAborted
+        :raise:                             BaseException
+        """
+        if limits is not None:
+            limits.check()
+        if deadline is not None and timer.perf_counter() >= deadline:
+            raise search_limits.DeadlineExceeded(
+                "time limit of the portfolio exceeded",
+                limits.snapshot() if limits is not None else search_limits.SearchStats())
+        raise BaseException('No solutions')
+
+    def solver_stats(self) -> dict[str, typing.Any]:
+        """
+            Counters describing the progress of the portfolio, attached to SearchAborted exceptions
+
+        :return:    {dict}  counters indexed by name, portfolio holds the entries of portfolio_stats
+        """
+        return {**super().solver_stats(),
+                "solved orderings": sum(entry["status"] == "solved" for entry in self.portfolio_stats),
+                "best ordering": self.portfolio_stats[self.best]["ordering"] if self.best is not None else None,
+                "portfolio": self.portfolio_stats}
@@ -13,8 +13,9 @@ import numpy.typing as npt
 from pathlib import Path
 from cbs import CBSSolver
 from independent import IndependentSolver
-from prioritized import PrioritizedPlanningSolver
+from prioritized import PrioritizedPlanningSolver, PrioritizedPortfolioSolver
 from distributed import DistributedPlanningSolver  # Placeholder for Distributed Planning
+from independence_detection import IndependenceDetectionSolver
 from visualize import Animation
 from collisions import detect_collisions
 from single_agent_planner import get_sum_of_cost
@@ -122,7 +123,7 @@ if __name__ == '__main__':
     parser.add_argument('--batch', action='store_true', default=False,
                         help='Use batch output instead of animation')
     parser.add_argument('--solver', type=str, default=SOLVER,
-                        help='The solver to use (one of: {CBS, CBSDisjoint,Independent,Prioritized}), defaults to ' + str(SOLVER))
+                        help='The solver to use (one of: {CBS, CBSDisjoint,Independent,Prioritized,PrioritizedPortfolio,IndependenceDetection}), defaults to ' + str(SOLVER))
 
     args = parser.parse_args()
     # Hint: Command line options can be added in Spyder by pressing CTRL + F6 > Command line options. 
@@ -163,6 +164,14 @@ if __name__ == '__main__':
             print("***Run Prioritized***")
             prio = PrioritizedPlanningSolver(my_map, starts, goals)
             paths = prio.find_solution([])
+        elif args.solver == "PrioritizedPortfolio":
+            print("***Run Prioritized Portfolio***")
+            portfolio = PrioritizedPortfolioSolver(my_map, starts, goals, first_success=False)
+            paths = portfolio.find_solution([])
+        elif args.solver == "IndependenceDetection":
+            print("***Run Independence Detection***")
+            detection = IndependenceDetectionSolver(my_map, starts, goals, inner_kwargs={"disjoint": False})
+            paths = detection.find_solution([])
         elif args.solver == "DistributedPrioritized":  # Wrapper of distributed planning solver class
             print("***Run Distributed Planning***")
             distri = DistributedPlanningSolver(my_map, starts, goals, solver=PrioritizedPlanningSolver, view_size=3, path_limit=3)
@@ -0,0 +1,190 @@
+"""
+Statistics and limits shared by the low-level searches and the solvers. A SearchLimits object bounds the number of
+expanded nodes, the wall clock time or can be cancelled from the outside, in which case the running search raises a
+SearchAborted exception carrying the statistics collected so far.
+"""
+import copy
+import math
+import threading
+import time as timer
+import typing
+
+
+class SearchStats:
+    """
+        Counters filled by a low-level search when passed as stats argument
+
+    :param expanded:    {int}   number of nodes popped from the open list and expanded
+    :param generated:   {int}   number of nodes pushed onto the open list
+    :param lower_bound: {int}   lower bound on the optimal path cost proven by the last successful search, equal to
+                                the cost of the returned path unless a suboptimal search was performed
+    """
+
+    def __init__(self) -> None:
+        """
+            Initialization function of the SearchStats
+        """
+        self.expanded = 0
+        self.generated = 0
+        self.lower_bound = 0
+
+
+class SearchAborted(Exception):
+    """
+        Raised when a search is stopped by its SearchLimits before it found a solution
+
+    :param stats:           {SearchStats}   low-level nodes expanded and generated by all searches using the limits, up
+                                            to the moment the search was aborted
+    :param solver_stats:    {dict}          counters of the solver that was running the search, filled by find_solution
+    """
+
+    def __init__(self, message: str, stats: SearchStats) -> None:
+        """
+            Initialization function of the SearchAborted exception
+
+        :param message: {str}           reason the search was aborted
+        :param stats:   {SearchStats}   statistics collected so far
+        """
+        super().__init__(message)
+        self.stats = stats
+        self.solver_stats: dict[str, typing.Any] = dict()
+
+
+class BudgetExceeded(SearchAborted):
+    """
+        Raised when the searches expanded more nodes than the node budget allows
+    """
+
+
+class DeadlineExceeded(SearchAborted):
+    """
+        Raised when the searches ran past the deadline
+    """
+
+
+class SearchCancelled(SearchAborted):
+    """
+        Raised when the cancellation token was cancelled while searching
+    """
+
+
+class CancellationToken:
+    """
+        Flag that can be set from another thread or process to stop all searches checking it
+
+    :param event:   {Event} underlying event, either a threading.Event or a multiprocessing.Event to cancel searches
+                            running in other processes
+    """
+
+    def __init__(self, event: typing.Optional[typing.Any] = None) -> None:
+        """
+            Initialization function of the CancellationToken
+
+        :param event:   {Event} event to wrap, a new threading.Event is created if None
+        """
+        self.event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """
+            Cancels all searches checking this token
+        """
+        self.event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+            property returning if the token was cancelled
+
+        :return:    {bool}  True once cancel was called
+        """
+        return self.event.is_set()
+
+
+class SearchLimits:
+    """
+        Limits for one or more searches. The node budget is shared by all searches using the same limits, which allows
+        to bound a complete call of find_solution. The searches do not check the limits on every expansion but only
+        every CHECK_INTERVAL expansions, the node budget is nevertheless enforced exactly.
+
+    :param node_budget: {int}           maximum number of low-level nodes that may be expanded in total, None for no
+                                        limit
+    :param deadline:    {float}         time.perf_counter() value after which the searches are aborted, None for no
+                                        limit
+    :param token:       {CancellationToken} token that aborts the searches once cancelled, None if not cancellable
+    :param stats:       {SearchStats}   low-level nodes expanded and generated by all completed searches
+    """
+
+    CHECK_INTERVAL = 256
+
+    def __init__(self,
+                 node_budget: typing.Optional[int] = None,
+                 time_limit: typing.Optional[float] = None,
+                 deadline: typing.Optional[float] = None,
+                 token: typing.Optional[CancellationToken] = None) -> None:
+        """
+            Initialization function of the SearchLimits
+
+        :param node_budget: {int}               maximum number of low-level nodes that may be expanded in total
+        :param time_limit:  {float}             seconds from now after which the searches are aborted, converted into a
+                                                deadline
+        :param deadline:    {float}             time.perf_counter() value after which the searches are aborted, the
+                                                earlier one is used if time_limit is given as well
+        :param token:       {CancellationToken} token that aborts the searches once cancelled
+        """
+        self.node_budget = node_budget
+        self.deadline = deadline
+        if time_limit is not None:
+            limit_deadline = timer.perf_counter() + time_limit
+            self.deadline = limit_deadline if deadline is None else min(deadline, limit_deadline)
+        self.token = token
+        self.stats = SearchStats()
+
+    def check(self, expanded: int = 0, generated: int = 0) -> float:
+        """
+            Checks all limits for a running search before it expands its next node, raising the matching SearchAborted
+            exception if one is exceeded
+
+        :param expanded:    {int}   nodes expanded by the running search so far
+        :param generated:   {int}   nodes generated by the running search so far
+
+        :return:            {float} number of expanded nodes of the running search at which the limits have to be
+                                    checked next
+
+        :raise:                     BudgetExceeded
+        :raise:                     DeadlineExceeded
+        :raise:                     SearchCancelled
+        """
+        if self.node_budget is not None and self.stats.expanded + expanded >= self.node_budget:
+            raise BudgetExceeded(f"node budget of {self.node_budget} exceeded", self.snapshot(expanded, generated))
+        if self.deadline is not None and timer.perf_counter() > self.deadline:
+            raise DeadlineExceeded("deadline exceeded", self.snapshot(expanded, generated))
+        if self.token is not None and self.token.cancelled:
+            raise SearchCancelled("search cancelled", self.snapshot(expanded, generated))
+
+        if self.node_budget is None:
+            return expanded + self.CHECK_INTERVAL if self.deadline is not None or self.token is not None else math.inf
+        return min(expanded + self.CHECK_INTERVAL, self.node_budget - self.stats.expanded)
+
+    def record(self, expanded: int, generated: int) -> None:
+        """
+            Adds the nodes of a finished search to the totals
+
+        :param expanded:    {int}   nodes expanded by the search
+        :param generated:   {int}   nodes generated by the search
+        """
+        self.stats.expanded += expanded
+        self.stats.generated += generated
+
+    def snapshot(self, expanded: int = 0, generated: int = 0) -> SearchStats:
+        """
+            Copy of the totals including the nodes of the running search
+
+        :param expanded:    {int}           nodes expanded by the running search so far
+        :param generated:   {int}           nodes generated by the running search so far
+
+        :return:            {SearchStats}   statistics collected so far
+        """
+        stats = copy.copy(self.stats)
+        stats.expanded += expanded
+        stats.generated += generated
+        return stats
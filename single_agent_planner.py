@@ -1,9 +1,14 @@
+import collections
+import math
 import typing
 from collections import abc
 import numpy.typing as npt
 import heapq
 
 import constraints
+import heuristics
+import map_graph
+from search_limits import SearchStats, SearchLimits
 import utils
 
 
@@ -19,32 +24,9 @@ def get_longest_path_cost(paths: list[list[tuple[int, int]]]) -> int:
     return max([len(p) - 1 for p in paths])
 
 
-def compute_heuristics(my_map: npt.NDArray[bool], goal: tuple[int, int]) -> dict[tuple[int, int], int]:
-    # Use Dijkstra to build a shortest-path tree rooted at the goal location
-    open_list: list[tuple[int, tuple[int, int]]] = []
-    closed_list = dict()
-    heapq.heappush(open_list, (0, goal))
-    closed_list[goal] = 0
-    while len(open_list) > 0:
-        (cost, loc) = heapq.heappop(open_list)
-        child_cost = cost + 1
-        for dir_idx in range(4):
-            child_loc = move(loc, dir_idx)
-            if child_loc[0] < 0 or child_loc[0] >= len(my_map) or child_loc[1] < 0 or child_loc[1] >= len(my_map[0]):
-                continue
-            if my_map[child_loc[0]][child_loc[1]]:
-                continue
-            if child_loc in closed_list:
-                existing_node_cost = closed_list[child_loc]
-                if existing_node_cost > child_cost:
-                    closed_list[child_loc] = child_cost
-                    heapq.heappush(open_list, (child_cost, child_loc))
-            else:
-                closed_list[child_loc] = child_cost
-                heapq.heappush(open_list, (child_cost, child_loc))
-
-    # build the heuristics table
-    return closed_list
+def compute_heuristics(my_map: npt.NDArray[bool], goal: tuple[int, int]) -> heuristics.HeuristicTable:
+    # Every move has unit cost, so a breadth first wavefront over the whole map yields the shortest-path distances
+    return heuristics.HeuristicTable(map_graph.get(my_map).distances(goal))
 
 
 def get_location(path: list[tuple[int, int]], time: int) -> tuple[int, int]:
@@ -61,98 +43,315 @@ def pad_path(path: list[tuple[int, int]], length: int) -> list[tuple[int, int]]:
         return path + [path[-1]] * (length - len(path))
 
 
+class ConflictAvoidanceTable:
+    """
+        Occupancy of the current paths of other agents, used to count the conflicts a move of the planned agent would
+        cause. Agents remain at their goal after their path ends.
+
+    :param vertex:  {Counter}   number of agents at a location at a timestep, indexed by (loc, step)
+    :param edge:    {Counter}   number of agents moving between two locations, indexed by (from_loc, to_loc, step) with
+                                step being the timestep of arrival
+    :param goals:   {dict}      timesteps from which onwards agents rest at a location, indexed by location
+    """
+
+    def __init__(self, paths: abc.Iterable[list[tuple[int, int]]]) -> None:
+        """
+            Initialization function of the ConflictAvoidanceTable
+
+        :param paths:   {list}  paths of the other agents
+        """
+        self.vertex: collections.Counter[tuple[tuple[int, int], int]] = collections.Counter()
+        self.edge: collections.Counter[tuple[tuple[int, int], tuple[int, int], int]] = collections.Counter()
+        self.goals: dict[tuple[int, int], list[int]] = dict()
+        for path in paths:
+            for step, loc in enumerate(path[:-1]):
+                self.vertex[(loc, step)] += 1
+            for step in range(1, len(path)):
+                self.edge[(path[step - 1], path[step], step)] += 1
+            self.goals.setdefault(path[-1], []).append(len(path) - 1)
+
+    def conflicts(self, current_loc: tuple[int, int], next_loc: tuple[int, int], step: int) -> int:
+        """
+            Counts the vertex and edge conflicts caused by moving from current_loc to next_loc at the given timestep
+
+        :param current_loc: {tuple} location of the planned agent at step - 1
+        :param next_loc:    {tuple} location of the planned agent at step
+        :param step:        {int}   timestep of arrival at next_loc
+
+        :return:            {int}   number of conflicts with the other agents
+        """
+        count = self.vertex.get((next_loc, step), 0)
+        if current_loc != next_loc:
+            count += self.edge.get((next_loc, current_loc, step), 0)
+        for goal_step in self.goals.get(next_loc, ()):
+            if step >= goal_step:
+                count += 1
+        return count
+
+
 def a_star(my_map: npt.NDArray[bool],
            start_loc: tuple[int, int],
            goal_loc: tuple[int, int],
-           h_values: dict[tuple[int, int], int],
+           h_values: abc.Mapping[tuple[int, int], int],
            agent: int,
-           constraint_list: list[constraints.Constraint]) -> typing.Optional[list[tuple[int, int]]]:
-    """ my_map      - binary obstacle map
-        start_loc   - start position
-        goal_loc    - goal position
-        agent       - the agent that is being re-planned
-        constraints - constraints defining where robot should or cannot go at each timestep
+           constraint_list: list[constraints.Constraint],
+           constraint_table: typing.Optional[constraints.ConstraintTable] = None,
+           stats: typing.Optional[SearchStats] = None,
+           suboptimality: float = 1.0,
+           conflict_table: typing.Optional[ConflictAvoidanceTable] = None,
+           limits: typing.Optional[SearchLimits] = None
+           ) -> typing.Optional[list[tuple[int, int]]]:
+    """ my_map              - binary obstacle map
+        start_loc           - start position
+        goal_loc            - goal position
+        agent               - the agent that is being re-planned
+        constraints         - constraints defining where robot should or cannot go at each timestep
+        constraint_table    - optional table of the agent that already contains the compiled constraints, replaces
+                              constraint_list when given
+        stats               - optional SearchStats that receive the number of expanded and generated nodes
+        suboptimality       - factor w >= 1, values above 1 turn the search into a focal search returning a path of at
+                              most w times the optimal cost, see focal_search
+        conflict_table      - optional ConflictAvoidanceTable of the other agents. Ties between nodes of equal f are
+                              broken in favour of fewer conflicts with their paths, for which the search is run as
+                              focal search with a suboptimality of 1, so the returned path stays optimal
+        limits              - optional SearchLimits, raises a search_limits.SearchAborted exception carrying the
+                              statistics collected so far once the node budget or deadline is exceeded or the search
+                              is cancelled
+
+        Cells are encoded as flat integers row * width + col. The open list holds plain (f, h, cell, step, node) tuples,
+        whose order matches the former AStarNode comparison, and the nodes themselves only exist as entries of the
+        cells, parents and g_vals arrays. Locations are only materialized for constraint lookups and the final path.
+        A node at the goal is a solution once its timestep reaches the precomputed goal hold step of the constraint
+        table, if an infinite constraint blocks the goal the search fails without expanding any node.
+        The successors of a cell, including itself for the wait action, are read from the neighbour table of the
+        shared MapGraph, so walls and the map bounds never have to be checked during the search.
     """
 
-    constraint_table = constraints.ConstraintTable(constraint_list, agent)
-    open_list: list["AStarNode"] = []
-    closed_list = dict()
-    infinite_g_val = dict()
-    earliest_goal_timestep = 0
+    if constraint_table is None:
+        constraint_table = constraints.ConstraintTable(constraint_list, agent)
+    if suboptimality < 1:
+        raise ValueError(f"suboptimality has to be at least 1, got {suboptimality}")
+    if constraint_table.goal_hold_step(goal_loc) is None:
+        return None  # an infinite constraint blocks the goal, no path can end there
+    if suboptimality > 1 or conflict_table is not None:
+        return focal_search(my_map, start_loc, goal_loc, h_values, constraint_table, suboptimality,
+                            conflict_table or ConflictAvoidanceTable([]), stats, limits)
+    graph = map_graph.get(my_map)
+    h_flat = heuristics.as_table(h_values, my_map).flat
+    adjacency = graph.adjacency
+    coords = graph.coords
+    num_cells = graph.height * graph.width
+    goal_cell = graph.cell(goal_loc)
+    table_length = len(constraint_table)
+    is_constrained = constraint_table.is_constrained
+    check_infinite = constraint_table.is_infinite
+
+    start_cell = graph.cell(start_loc)
+    cells = [start_cell]
+    parents = [-1]
+    g_vals = [0]
+    open_list = [(h_flat[start_cell], h_flat[start_cell], start_cell, 0, 0)]
+    closed_list = {start_cell}
+    infinite_g_val: dict[int, int] = dict()
+    goal_hold = constraint_table.goal_hold_step(goal_loc)
+    expanded = 0
+    check_at = limits.check() if limits is not None else math.inf
 
-    root = AStarNode(start_loc, 0, h_values[start_loc], 0)
-    heapq.heappush(open_list, root)
-    closed_list[(root.loc, root.step)] = root
     while len(open_list) > 0:
-        curr = heapq.heappop(open_list)
-
-        if curr.loc == goal_loc and curr.step >= earliest_goal_timestep:
-            found = True
-            if curr.step + 1 < len(constraint_table):
-                for t in range(curr.step + 1, len(constraint_table)):
-                    if constraint_table.is_constrained(goal_loc, goal_loc, t):
-                        found = False
-                        earliest_goal_timestep = t + 1
-                        break
-            if found:
-                return curr.get_path()
-
-        if constraint_table.is_infinite and curr.step + 1 >= len(constraint_table):
-            if curr.loc in infinite_g_val and infinite_g_val[curr.loc] <= curr.g_val:
+        _, _, cell, step, node = heapq.heappop(open_list)
+        if expanded >= check_at:
+            check_at = limits.check(expanded, len(cells))
+        expanded += 1
+
+        if cell == goal_cell and step >= goal_hold:
+            record_search(stats, limits, expanded, len(cells), step)
+            return get_path(cells, parents, coords, node)
+
+        g_val = g_vals[node]
+        if check_infinite and step + 1 >= table_length:
+            if infinite_g_val.get(cell, g_val + 1) <= g_val:
                 continue
-            infinite_g_val[curr.loc] = curr.g_val
-
-        for dir_idx in range(5):
-            child_loc = move(curr.loc, dir_idx)
-            if child_loc[0] < 0 or child_loc[0] >= len(my_map) \
-               or child_loc[1] < 0 or child_loc[1] >= len(my_map[0]):
-               continue
-            if my_map[child_loc[0]][child_loc[1]]:
+            infinite_g_val[cell] = g_val
+
+        loc = coords[cell]
+        child_step = step + 1
+        step_key = child_step * num_cells
+        for child_cell in adjacency[cell]:
+            if step_key + child_cell in closed_list:
                 continue
-            if constraint_table.is_constrained(curr.loc, child_loc, curr.step + 1):
+            if is_constrained(loc, coords[child_cell], child_step):
                 continue
-            child = AStarNode(child_loc, curr.g_val + 1, h_values[child_loc], curr.step + 1, curr)
-            if (child.loc, child.step) in closed_list:
-                existing_node = closed_list[(child.loc, child.step)]
-                if child < existing_node:
-                    closed_list[(child.loc, child.step)] = child
-                    heapq.heappush(open_list, child)
+            closed_list.add(step_key + child_cell)
+            cells.append(child_cell)
+            parents.append(node)
+            g_vals.append(g_val + 1)
+            h_val = h_flat[child_cell]
+            heapq.heappush(open_list, (child_step + h_val, h_val, child_cell, child_step, len(cells) - 1))
+
+    record_search(stats, limits, expanded, len(cells))
+    return None  # Failed to find solutions
+
+
+def focal_search(my_map: npt.NDArray[bool],
+                 start_loc: tuple[int, int],
+                 goal_loc: tuple[int, int],
+                 h_values: abc.Mapping[tuple[int, int], int],
+                 constraint_table: constraints.ConstraintTable,
+                 suboptimality: float,
+                 conflict_table: ConflictAvoidanceTable,
+                 stats: typing.Optional[SearchStats] = None,
+                 limits: typing.Optional[SearchLimits] = None
+                 ) -> typing.Optional[list[tuple[int, int]]]:
+    """
+        Bounded suboptimal variant of a_star. Next to the open list ordered by f the search keeps a focal list holding
+        all open nodes with f <= suboptimality * f_min, ordered by the number of conflicts with the paths of the other
+        agents. With a suboptimality of 1 the search is optimal and only breaks ties between nodes of equal f. Nodes are
+        always expanded from the focal list, so the returned path costs at most suboptimality times the optimal cost
+        while avoiding conflicts wherever the bound allows. Open nodes that are not yet in the focal list are kept in
+        buckets per f value, which are moved into the focal list once the bound has grown past them. Nodes are removed
+        lazily from the open list, the done array marks expanded and superseded nodes.
+
+    :param my_map:              {np.ndarray}        binary obstacle map
+    :param start_loc:           {tuple}             start position
+    :param goal_loc:            {tuple}             goal position
+    :param h_values:            {dict}              heuristic values indexed by location
+    :param constraint_table:    {ConstraintTable}   compiled constraints of the agent
+    :param suboptimality:       {float}             factor w by which the path cost may exceed the optimal cost
+    :param conflict_table:      {ConflictAvoidanceTable}    paths of the other agents
+    :param stats:               {SearchStats}       optional counters, receives the proven lower bound f_min
+    :param limits:              {SearchLimits}      optional limits checked while searching
+
+    :return:                    {list}              path of the agent with one location per timestep
+    :return:                    {None}              no path exists
+    """
+    graph = map_graph.get(my_map)
+    h_flat = heuristics.as_table(h_values, my_map).flat
+    adjacency = graph.adjacency
+    coords = graph.coords
+    num_cells = graph.height * graph.width
+    goal_cell = graph.cell(goal_loc)
+    table_length = len(constraint_table)
+    is_constrained = constraint_table.is_constrained
+    count_conflicts = conflict_table.conflicts
+
+    start_cell = graph.cell(start_loc)
+    cells = [start_cell]
+    parents = [-1]
+    conflict_counts = [0]
+    done = [False]
+    open_list = [(h_flat[start_cell], start_cell, 0, 0)]
+    focal_list = [(0, h_flat[start_cell], h_flat[start_cell], start_cell, 0, 0)]
+    buckets: dict[int, list[tuple[int, int, int, int, int, int]]] = dict()
+    bound = suboptimality * h_flat[start_cell]
+    best_node = {start_cell: 0}
+    infinite_g_val: dict[int, int] = dict()
+    goal_hold = constraint_table.goal_hold_step(goal_loc)
+    expanded = 0
+    check_at = limits.check() if limits is not None else math.inf
+
+    while True:
+        while len(open_list) > 0 and done[open_list[0][-1]]:
+            heapq.heappop(open_list)
+        if len(open_list) == 0:
+            break
+        f_min = open_list[0][0]
+        if suboptimality * f_min > bound:
+            for f_val in range(int(bound) + 1, int(suboptimality * f_min) + 1):
+                for entry in buckets.pop(f_val, ()):
+                    if not done[entry[-1]]:
+                        heapq.heappush(focal_list, entry)
+            bound = suboptimality * f_min
+
+        conflicts, _, _, cell, step, node = heapq.heappop(focal_list)
+        if done[node]:
+            continue
+        if expanded >= check_at:
+            check_at = limits.check(expanded, len(cells))
+        done[node] = True
+        expanded += 1
+
+        if cell == goal_cell and step >= goal_hold:
+            record_search(stats, limits, expanded, len(cells), f_min)
+            return get_path(cells, parents, coords, node)
+
+        if constraint_table.is_infinite and step + 1 >= table_length:
+            if infinite_g_val.get(cell, step + 1) <= step:
+                continue
+            infinite_g_val[cell] = step
+
+        loc = coords[cell]
+        child_step = step + 1
+        step_key = child_step * num_cells
+        for child_cell in adjacency[cell]:
+            child_loc = coords[child_cell]
+            if is_constrained(loc, child_loc, child_step):
+                continue
+            child_conflicts = conflicts + count_conflicts(loc, child_loc, child_step)
+            existing = best_node.get(step_key + child_cell)
+            if existing is not None:
+                # g equals the timestep, so a duplicate can only improve on the number of conflicts
+                if done[existing] or conflict_counts[existing] <= child_conflicts:
+                    continue
+                done[existing] = True
+            child = len(cells)
+            best_node[step_key + child_cell] = child
+            cells.append(child_cell)
+            parents.append(node)
+            conflict_counts.append(child_conflicts)
+            done.append(False)
+            h_val = h_flat[child_cell]
+            f_val = child_step + h_val
+            heapq.heappush(open_list, (f_val, child_cell, child_step, child))
+            entry = (child_conflicts, f_val, h_val, child_cell, child_step, child)
+            if f_val <= bound:
+                heapq.heappush(focal_list, entry)
             else:
-                closed_list[(child.loc, child.step)] = child
-                heapq.heappush(open_list, child)
+                buckets.setdefault(f_val, []).append(entry)
 
+    record_search(stats, limits, expanded, len(cells))
     return None  # Failed to find solutions
 
 
-class AStarNode:
-
-    def __init__(self,
-                 loc: tuple[int, int],
-                 g_val: float,
-                 h_val: float,
-                 step: int,
-                 parent: typing.Optional["AStarNode"] = None) -> None:
-        self.loc = loc
-        self.g_val = g_val
-        self.h_val = h_val
-        self.score = g_val + h_val
-        self.step = step
-        self.parent = parent
-
-    def get_path(self) -> list[tuple[int, int]]:
-        if self.parent:
-            return self.parent.get_path() + [self.loc]
-        else:
-            return [self.loc]
-
-    def __lt__(self, other: "AStarNode") -> bool:
-        """Return true is "self" is better than "other"."""
-        if self.score == other.score:
-            if self.h_val == other.h_val:
-                if self.loc[0] == other.loc[0]:
-                    if self.loc[1] == other.loc[1]:
-                        return False
-                    return self.loc[1] < other.loc[1]
-                return self.loc[0] < other.loc[0]
-            return self.h_val < other.h_val
-        return self.score < other.score
+def record_search(stats: typing.Optional[SearchStats],
+                  limits: typing.Optional[SearchLimits],
+                  expanded: int,
+                  generated: int,
+                  lower_bound: typing.Optional[int] = None) -> None:
+    """
+        Adds the nodes of a finished search to the optional statistics and limits
+
+    :param stats:       {SearchStats}   counters of the caller or None
+    :param limits:      {SearchLimits}  limits of the caller or None
+    :param expanded:    {int}           nodes expanded by the search
+    :param generated:   {int}           nodes generated by the search
+    :param lower_bound: {int}           proven lower bound on the path cost, None if the search failed
+    """
+    if stats is not None:
+        stats.expanded += expanded
+        stats.generated += generated
+        if lower_bound is not None:
+            stats.lower_bound = lower_bound
+    if limits is not None:
+        limits.record(expanded, generated)
+
+
+def get_path(cells: list[int],
+             parents: list[int],
+             coords: list[tuple[int, int]],
+             node: int) -> list[tuple[int, int]]:
+    """
+        Materializes the path ending in the given search node by walking up the parent array
+
+    :param cells:   {list}  flat cell index of every search node
+    :param parents: {list}  index of the parent of every search node, -1 for the root
+    :param coords:  {list}  location of every flat cell index
+    :param node:    {int}   index of the final search node
+
+    :return:        {list}  path with one location per timestep
+    """
+    path = []
+    while node != -1:
+        path.append(coords[cells[node]])
+        node = parents[node]
+    path.reverse()
+    return path
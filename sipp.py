@@ -0,0 +1,189 @@
+"""
+Safe Interval Path Planning (SIPP), an alternative low-level search to single_agent_planner.a_star. Instead of searching
+every (location, timestep) pair it groups the timesteps at which a location may be occupied into safe intervals and only
+searches (location, safe interval) pairs using the earliest possible arrival time. Waiting is therefore implicit, which
+keeps the search small for long horizons with many constraints.
+"""
+import heapq
+import math
+import typing
+from collections import abc
+import numpy.typing as npt
+
+import constraints
+import heuristics
+import map_graph
+from search_limits import SearchStats, SearchLimits
+from single_agent_planner import record_search
+
+
+def safe_intervals(blocked: list[int],
+                   infinite: typing.Optional[int],
+                   waits: abc.Sequence[int] = ()) -> list[tuple[int, float]]:
+    """
+        Converts the blocked timesteps of a location into the intervals during which it may be occupied. Timestep 0 is
+        never blocked as the agents are placed at their start location regardless of any constraints. An interval is
+        split at every timestep at which waiting at the location is forbidden, so the agent may wait from any timestep
+        of an interval to any later one and the earliest arrival within an interval is always the best one.
+
+    :param blocked:     {list}  sorted timesteps at which the location is blocked by finite constraints
+    :param infinite:    {int}   timestep from which onwards the location is blocked forever or None
+    :param waits:       {list}  sorted timesteps at which staying at the location since the previous timestep is
+                                forbidden by an edge constraint
+
+    :return:            {list}  safe intervals given as tuple of first and last timestep, the last timestep of the
+                                final interval is infinite if the location is not blocked forever
+    """
+    if infinite is not None:
+        infinite = max(infinite, 1)
+    intervals: list[tuple[int, float]] = []
+    start = 0
+    for step in blocked:
+        if step < 1:
+            continue
+        if infinite is not None and step >= infinite:
+            break
+        if step > start:
+            intervals.append((start, step - 1))
+        start = step + 1
+    end = math.inf if infinite is None else infinite - 1
+    if start <= end:
+        intervals.append((start, end))
+    if len(waits) == 0:
+        return intervals
+    split: list[tuple[int, float]] = []
+    for first, last in intervals:
+        for step in waits:
+            if first < step <= last:
+                split.append((first, step - 1))
+                first = step
+        split.append((first, last))
+    return split
+
+
+def sipp(my_map: npt.NDArray[bool],
+         start_loc: tuple[int, int],
+         goal_loc: tuple[int, int],
+         h_values: abc.Mapping[tuple[int, int], int],
+         agent: int,
+         constraint_list: list[constraints.Constraint],
+         constraint_table: typing.Optional[constraints.ConstraintTable] = None,
+         stats: typing.Optional[SearchStats] = None,
+         limits: typing.Optional[SearchLimits] = None
+         ) -> typing.Optional[list[tuple[int, int]]]:
+    """
+        Safe interval path planning with the same inputs and outputs as single_agent_planner.a_star. Every search node
+        is a location together with one of its safe intervals and the earliest known arrival time within that interval.
+        A move into a neighbouring interval arrives as early as both intervals and the edge constraints allow, the time
+        in between is spent waiting at the current location. Constraints forbidding to wait split the safe intervals,
+        see safe_intervals. The goal is reached once the agent arrives in the final, unbounded interval of the goal
+        location, which starts after the last timestep at which staying at the goal is constrained.
+
+    :param my_map:              {np.ndarray}    binary obstacle map
+    :param start_loc:           {tuple}         start position
+    :param goal_loc:            {tuple}         goal position
+    :param h_values:            {dict}          heuristic values indexed by location
+    :param agent:               {int}           the agent that is being re-planned
+    :param constraint_list:     {list}          constraints defining where robot should or cannot go at each timestep
+    :param constraint_table:    {ConstraintTable}   optional table of the agent that already contains the compiled
+                                                    constraints, replaces constraint_list when given
+    :param stats:               {SearchStats}   optional counters of expanded and generated nodes
+    :param limits:              {SearchLimits}  optional node budget, deadline and cancellation token, raises a
+                                                search_limits.SearchAborted exception when exceeded
+
+    :return:                    {list}          path of the agent with one location per timestep
+    :return:                    {None}          no path exists
+    """
+    if constraint_table is None:
+        constraint_table = constraints.ConstraintTable(constraint_list, agent)
+    if constraint_table.goal_hold_step(goal_loc) is None:
+        return None  # an infinite constraint blocks the goal, no path can end there
+    h_rows = heuristics.as_table(h_values, my_map).rows
+    graph = map_graph.get(my_map)
+    interval_map: dict[tuple[int, int], list[tuple[int, float]]] = dict()
+
+    # edge constraints between a location and itself forbid waiting, they split the safe intervals of the location
+    wait_steps: dict[tuple[int, int], list[int]] = dict()
+    for t, moves in sorted(constraint_table.edge.items()):
+        for loc_1, loc_2 in moves:
+            if loc_1 == loc_2:
+                wait_steps.setdefault(loc_1, []).append(t)
+
+    def intervals(loc: tuple[int, int]) -> list[tuple[int, float]]:
+        if loc not in interval_map:
+            interval_map[loc] = safe_intervals(constraint_table.blocked_steps(loc), constraint_table.infinite.get(loc),
+                                               wait_steps.get(loc, ()))
+        return interval_map[loc]
+
+    locs = [start_loc]
+    arrivals = [0]
+    parents = [-1]
+    slots = [0]
+    open_list = [(h_rows[start_loc[0]][start_loc[1]], h_rows[start_loc[0]][start_loc[1]], start_loc, 0, 0)]
+    best_arrival = {(start_loc, 0): 0}
+    expanded = 0
+    check_at = limits.check() if limits is not None else math.inf
+
+    while len(open_list) > 0:
+        _, _, loc, arrival, node = heapq.heappop(open_list)
+        slot = slots[node]
+        if best_arrival[(loc, slot)] < arrival:
+            continue
+        if expanded >= check_at:
+            check_at = limits.check(expanded, len(locs))
+        expanded += 1
+        end = intervals(loc)[slot][1]
+
+        if loc == goal_loc and end == math.inf:
+            record_search(stats, limits, expanded, len(locs), arrival)
+            return get_path(locs, arrivals, parents, node)
+
+        cell = graph.cell(loc)
+        for child_cell in graph.adjacency[cell]:
+            if child_cell == cell:  # waiting is implicit in the safe intervals
+                continue
+            child_loc = graph.coords[child_cell]
+            for child_slot, (child_start, child_end) in enumerate(intervals(child_loc)):
+                step = max(arrival + 1, child_start)
+                if step > end + 1:
+                    break
+                latest = min(end + 1, child_end)
+                while step <= latest and constraint_table.is_constrained(loc, child_loc, step):
+                    step += 1
+                if step > latest:
+                    continue
+                if best_arrival.get((child_loc, child_slot), math.inf) <= step:
+                    continue
+                best_arrival[(child_loc, child_slot)] = step
+                locs.append(child_loc)
+                arrivals.append(step)
+                parents.append(node)
+                slots.append(child_slot)
+                h_val = h_rows[child_loc[0]][child_loc[1]]
+                heapq.heappush(open_list, (step + h_val, h_val, child_loc, step, len(locs) - 1))
+
+    record_search(stats, limits, expanded, len(locs))
+    return None  # Failed to find solutions
+
+
+def get_path(locs: list[tuple[int, int]],
+             arrivals: list[int],
+             parents: list[int],
+             node: int) -> list[tuple[int, int]]:
+    """
+        Builds the path ending in the given node by walking up the parents and inserting the implicit wait actions
+
+    :param locs:        {list}  location of every search node
+    :param arrivals:    {list}  arrival time of every search node
+    :param parents:     {list}  index of the parent of every search node, -1 for the root
+    :param node:        {int}   index of the final search node
+
+    :return:            {list}  path with one location per timestep
+    """
+    path = [locs[node]]
+    while parents[node] != -1:
+        parent = parents[node]
+        path.extend([locs[parent]] * (arrivals[node] - arrivals[parent]))
+        node = parent
+    path.reverse()
+    return path
@@ -1,7 +1,7 @@
 import unittest
 import sys
 
-from tests.test_integration.test_cbs import Test_Integration_CBS_Disjoint, Test_Integration_CBS_Standard
+from tests.test_integration.test_cbs import Test_Integration_CBS_Disjoint, Test_Integration_CBS_Standard, Test_Integration_ECBS
 from tests.test_integration.test_distributed import Test_Integration_Distributed_CBS_Disjoint, Test_Integration_Distributed_CBS_Standard, Test_Integration_Distributed_Prioritized
 from tests.test_integration.test_independent import Test_Integration_Independent
 from tests.test_integration.test_prioritized import Test_Integration_Prioritized
@@ -25,6 +25,7 @@ if __name__ == '__main__':
     test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_Prioritized))
     test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_CBS_Standard))
     test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_CBS_Disjoint))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_ECBS))
     test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_Independent))
     test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_Distributed_Prioritized))
     test_suite.addTests(test_loader.loadTestsFromTestCase(Test_Integration_Distributed_CBS_Standard))
@@ -115,6 +115,62 @@ class Test_Integration_CBS_Disjoint(unittest.TestCase):
                 self.assertFalse(collision, msg=f"Failed to find solution using {self.mode}-{self.submode} for map {my_map}.")
 
 
+class Test_Integration_ECBS(unittest.TestCase):
+    """
+    Test class for testing the bounded suboptimal enhanced CBS (ECBS) solver with a suboptimality of 1.5, using
+    Disjoint splitting.
+
+    Test Scenarios
+    --------------
+
+    Running in all test_*.txt files within the instances directory, checking that the solution is collision free and
+    its cost is within the certified bound
+
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    @classmethod
+    def setUpClass(cls):
+        os.chdir(pathlib.Path(__file__).parent.parent.parent)
+
+        # Get all files in the instances folder which are named test
+        cls.scenarios = glob.glob("instances/test_*.txt")
+
+        # Sort output https://stackoverflow.com/a/5967539
+        def natural_key(str_):
+            return [int(el) if el.isdigit() else el for el in re.split(r'(\d+)', str_)]
+
+        cls.scenarios.sort(key= natural_key)
+
+        # Solver mode
+        cls.mode = "ECBS"
+        cls.submode = "Disjoint"
+        cls.suboptimality = 1.5
+
+    def test_tests(self):
+
+        for my_map in self.scenarios:
+
+            with self.subTest(msg= f"{my_map} - {self.mode}"):
+
+                # Map: my_map
+                print(f"==> Solving: {my_map} using {self.mode}-{self.submode} <==")
+
+                # Solve
+                my_map_arr, starts, goals = run_experiments.import_mapf_instance(my_map)
+                solver = CBSSolver(my_map_arr, starts, goals, printing=False, suboptimality=self.suboptimality)
+                paths = solver.find_solution([])
+
+                # Check paths
+                collision = bool(collisions.detect_collisions(paths))
+
+                self.assertFalse(collision, msg=f"Failed to find solution using {self.mode}-{self.submode} for map {my_map}.")
+                self.assertLessEqual(solver.certified_bound, self.suboptimality)
+                self.assertLessEqual(get_sum_of_cost(paths), self.suboptimality * solver.lower_bound)
+
+
 if __name__ == "__main__":
     unittest.main()
     sys.exit()
\ No newline at end of file
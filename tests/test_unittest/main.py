@@ -4,6 +4,20 @@ from tests.test_unittest import test_view_nonblocking
 from tests.test_unittest import test_view_blocking
 from tests.test_unittest import test_mapgen
 from tests.test_unittest import test_collision
+from tests.test_unittest import test_heuristics
+from tests.test_unittest import test_constraints
+from tests.test_unittest import test_sipp
+from tests.test_unittest import test_single_agent_planner
+from tests.test_unittest import test_map_graph
+from tests.test_unittest import test_search_limits
+from tests.test_unittest import test_mdd
+from tests.test_unittest import test_conflict_graph
+from tests.test_unittest import test_joint_planner
+from tests.test_unittest import test_node_store
+from tests.test_unittest import test_worker_pool
+from tests.test_unittest import test_independence_detection
+from tests.test_unittest import test_prioritized
+from tests.test_unittest import test_cbs
 
 ## Run test instruction
 # -- UNITTEST --
@@ -38,6 +52,26 @@ if __name__ == '__main__':
     test_suite.addTests(test_loader.loadTestsFromTestCase(test_mapgen.Test_MapGenerator))
     test_suite.addTests(test_loader.loadTestsFromTestCase(test_mapgen.Test_MapGenerator_RampUp))
     test_suite.addTests(test_loader.loadTestsFromTestCase(test_collision.Test_Collision))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_collision.Test_Collision_Vectorized))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_collision.Test_OccupancyIndex))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_heuristics.Test_Heuristics))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_heuristics.Test_HeuristicCache))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_constraints.Test_ConstraintTable))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_single_agent_planner.Test_AStar))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_map_graph.Test_MapGraph))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_search_limits.Test_SearchLimits))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_sipp.Test_SafeIntervals))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_sipp.Test_SIPP))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_mdd.Test_MDD))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_conflict_graph.Test_VertexCover))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_conflict_graph.Test_Dependency))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_joint_planner.Test_JointPlanner))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_node_store.Test_NodeStore))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_worker_pool.Test_WorkerPool))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_independence_detection.Test_IndependenceDetection))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_prioritized.Test_Prioritized))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_prioritized.Test_PrioritizedPortfolio))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(test_cbs.Test_CBS))
 
     runner = unittest.TextTestRunner()
     result = runner.run(test_suite)
\ No newline at end of file
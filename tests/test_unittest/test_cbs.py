@@ -0,0 +1,143 @@
+import unittest
+from unittest import mock
+
+import collisions
+import run_experiments
+import sipp
+
+from cbs import CBSNode, CBSSolver
+from constraints import Constraint, ConstraintTable
+from single_agent_planner import get_sum_of_cost
+
+
+class Test_CBS(unittest.TestCase):
+    """
+    Test the options of the conflict based search solver `cbs.CBSSolver()`.
+
+    Outline of tests:
+    ------------------
+
+    test_low_level : Check if options requiring single_agent_planner.a_star are rejected for another low-level search
+
+    test_incremental_collisions : Check if only the root computes all collisions while the collisions of the children
+                                  equal a full recomputation
+
+    test_conflict_avoidance : Check if breaking ties by conflicts keeps the cost and generates and expands fewer nodes
+
+    test_bypass : Check if bypassing splits keeps the cost and avoids generating and expanding the bypassed children
+
+    test_is_duplicate : Check if a node with the constraints of an earlier node in a different order is a duplicate,
+                        unless its meta-agents differ
+
+    test_duplicates : Check if pruning duplicates keeps the cost and generates fewer nodes
+
+    test_shared_tables : Check if a child only copies the constraint tables its constraint affects, sharing the sets of
+                         the other timesteps with its parent, and answers like tables built from all its constraints
+
+    test_node_stats : Check if the time and memory spent on the generated nodes are recorded
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.my_map, self.starts, self.goals = run_experiments.import_mapf_instance("instances/test_30.txt")
+
+    def test_low_level(self):
+        with self.assertRaises(ValueError):
+            CBSSolver(self.my_map, self.starts, self.goals, printing=False, low_level=sipp.sipp, suboptimality=1.5)
+        with self.assertRaises(ValueError):
+            CBSSolver(self.my_map, self.starts, self.goals, printing=False, low_level=sipp.sipp,
+                      conflict_avoidance=True)
+        solver = CBSSolver(self.my_map, self.starts, self.goals, printing=False, low_level=sipp.sipp)
+        self.assertFalse(solver.conflict_avoidance)
+
+    def test_incremental_collisions(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_1.txt")
+        for debug in (False, True):
+            with mock.patch.object(collisions, "detect_collisions", wraps=collisions.detect_collisions) as detect:
+                solver = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, debug=debug)
+                paths = solver.find_solution([])
+            self.assertDictEqual(collisions.detect_collisions(paths), dict())
+            self.assertGreater(solver.num_of_generated, 1)
+            # with debug every child is checked against a full recomputation, without only the root computes them
+            self.assertEqual(detect.call_count, solver.num_of_generated if debug else 1)
+
+    def test_conflict_avoidance(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_1.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, conflict_avoidance=False)
+        avoiding = CBSSolver(my_map, starts, goals, printing=False, disjoint=False)
+        self.assertTrue(avoiding.conflict_avoidance)
+        self.assertEqual(get_sum_of_cost(avoiding.find_solution([])), get_sum_of_cost(plain.find_solution([])))
+        self.assertLess(avoiding.num_of_generated, plain.num_of_generated)
+        self.assertLess(avoiding.num_of_expanded, plain.num_of_expanded)
+
+    def test_bypass(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_1.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False)
+        bypassing = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, bypass=True, debug=True)
+        self.assertEqual(get_sum_of_cost(bypassing.find_solution([])), get_sum_of_cost(plain.find_solution([])))
+        self.assertEqual(plain.num_of_bypasses, 0)
+        self.assertGreater(bypassing.num_of_bypasses, 0)
+        self.assertEqual(bypassing.solver_stats()["bypasses"], bypassing.num_of_bypasses)
+        self.assertLess(bypassing.num_of_generated, plain.num_of_generated)
+        self.assertLess(bypassing.num_of_expanded, plain.num_of_expanded)
+
+    def test_is_duplicate(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_10.txt")
+        solver = CBSSolver(my_map, starts, goals, printing=False)
+        root = CBSNode(0, [], [], dict(), 0, tables=[ConstraintTable([], i) for i in range(len(starts))])
+        first, second = Constraint(False, 0, 1, (3, 5)), Constraint(True, 1, 2, (5, 6))
+        node = CBSNode(0, [second], [], dict(), 0, CBSNode(0, [first], [], dict(), 0, root), root.tables)
+        solver.push_node(node)
+        other = CBSNode(0, [first], [], dict(), 0, CBSNode(0, [second], [], dict(), 0, root), root.tables)
+        self.assertEqual(other.key, node.key)
+        self.assertTrue(solver.is_duplicate(other))
+        self.assertFalse(solver.is_duplicate(CBSNode(0, [first], [], dict(), 0, other, root.tables)))
+        merged = CBSNode(0, [], [], dict(), 0, other, root.tables, groups=[(0, 1), (0, 1), *root.groups[2:]])
+        self.assertFalse(solver.is_duplicate(merged))
+        self.assertEqual(solver.num_of_pruned, 1)
+
+    def test_duplicates(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_41.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, detect_duplicates=False)
+        pruning = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, debug=True)
+        self.assertEqual(get_sum_of_cost(pruning.find_solution([])), get_sum_of_cost(plain.find_solution([])))
+        self.assertEqual(plain.num_of_pruned, 0)
+        self.assertGreater(pruning.num_of_pruned, 0)
+        self.assertEqual(pruning.solver_stats()["pruned nodes"], pruning.num_of_pruned)
+        self.assertEqual(pruning.num_of_generated, plain.num_of_generated - pruning.num_of_pruned)
+
+    def test_shared_tables(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_10.txt")
+        solver = CBSSolver(my_map, starts, goals, printing=False)
+        root = CBSNode(0, [], [[start] for start in starts], dict(), 0,
+                       tables=[ConstraintTable([], i) for i in range(len(starts))])
+        parent, _, _ = solver.prepare_children(root, [Constraint(False, 0, 1, (3, 5))], None)[0]
+        children = solver.prepare_children(parent, [Constraint(False, 0, 3, (3, 4)), Constraint(True, 1, 2, (5, 6))],
+                                           None)
+        negative, positive = children[0][0], children[1][0]
+        self.assertIsNot(negative.tables[0], parent.tables[0])
+        self.assertIs(negative.tables[0].vertex[1], parent.tables[0].vertex[1])
+        for agent in range(1, len(starts)):
+            self.assertIs(negative.tables[agent], parent.tables[agent])
+        for agent in range(len(starts)):
+            self.assertIsNot(positive.tables[agent], parent.tables[agent])
+
+        locs = [(y, x) for y in range(len(my_map)) for x in range(len(my_map[0])) if not my_map[y][x]]
+        for child in (negative, positive):
+            self.assertEqual(len(child.constraints), 2)
+            for agent in range(len(starts)):
+                expected = ConstraintTable(child.constraints, agent)
+                for step in range(5):
+                    for loc in locs:
+                        for next_loc in ((loc[0], loc[1] + 1), (loc[0] + 1, loc[1]), loc):
+                            self.assertEqual(child.tables[agent].is_constrained(loc, next_loc, step),
+                                             expected.is_constrained(loc, next_loc, step))
+
+    def test_node_stats(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_1.txt")
+        solver = CBSSolver(my_map, starts, goals, printing=False, disjoint=False)
+        solver.find_solution([])
+        self.assertGreater(solver.node_time, 0)
+        self.assertGreater(solver.node_memory, 0)
+        self.assertAlmostEqual(solver.time_per_node, solver.node_time / solver.num_of_generated)
+        self.assertAlmostEqual(solver.memory_per_node, solver.node_memory / solver.num_of_generated)
@@ -1,3 +1,5 @@
+import numpy as np
+
 import unittest
 
 import collisions
@@ -116,7 +118,142 @@ class Test_Collision(unittest.TestCase):
             with self.subTest(msg= f"i"):
 
                 self.assertIn(expected[i], str(out[i]))
-        
+
+
+class Test_Collision_Vectorized(unittest.TestCase):
+    """
+    Test the numpy based detection of `collisions.detect_collisions()` against checking every agent pair with
+    `collisions.detect_collision()`, on random walks of random length on small grids with many collisions.
+
+    Outline of tests:
+    ------------------
+
+    test_random : Check if the same first collision is found for every pair and the pairs are in the same order
+
+    test_multiple : Check if all pairs of three agents sharing a location are found
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    def setUp(self):
+        self.threshold = collisions.VECTORIZE_MIN_AGENTS
+        collisions.VECTORIZE_MIN_AGENTS = 0
+
+    def tearDown(self):
+        collisions.VECTORIZE_MIN_AGENTS = self.threshold
+
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (0, 0)]
+        for _ in range(500):
+            paths = []
+            for _ in range(rng.integers(2, 10)):
+                path = [(int(rng.integers(3)), int(rng.integers(3)))]
+                for _ in range(rng.integers(0, 8)):
+                    direction = directions[rng.integers(5)]
+                    path.append((path[-1][0] + direction[0], path[-1][1] + direction[1]))
+                paths.append(path)
+
+            expected = dict()
+            for a0 in range(len(paths)):
+                for a1 in range(a0 + 1, len(paths)):
+                    collision = collisions.detect_collision(a0, a1, paths[a0], paths[a1])
+                    if collision:
+                        expected[(a0, a1)] = collision
+
+            result = collisions.detect_collisions(paths)
+            self.assertListEqual(list(result.keys()), list(expected.keys()))
+            for pair, collision in expected.items():
+                self.assertEqual(result[pair], collision)
+
+    def test_multiple(self):
+        paths = [[(0, 0), (1, 1)], [(0, 2), (1, 1)], [(2, 2), (2, 1), (1, 1)]]
+        result = collisions.detect_collisions(paths)
+        self.assertListEqual(list(result.keys()), [(0, 1), (0, 2), (1, 2)])
+        self.assertEqual(result[(0, 2)].step, 2)
+
+
+class Test_OccupancyIndex(unittest.TestCase):
+    """
+    Test the space-time occupancy index used to re-check only the paths of replanned agents.
+
+    Outline of tests:
+    ------------------
+
+    test_goal_tail : Check if agents are found at their goal after their path ended without storing the tail
+
+    test_swap : Check if only agents moving in the opposite direction are returned by the edge query
+
+    test_remove : Check if removing a path leaves an empty index
+
+    test_agent_first : Check if collisions are oriented like detect_collision with the queried agent first
+
+    test_random : Check if the first conflicts of a path equal detect_collision for every other agent after random
+                  replacements of paths
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    def test_goal_tail(self):
+        index = collisions.OccupancyIndex([[(0, 0), (0, 1)], [(1, 1), (1, 1), (1, 1)]])
+        self.assertSetEqual(index.agents_at((0, 1), 100), {0})
+        self.assertSetEqual(index.agents_at((0, 0), 1), set())
+        self.assertSetEqual(index.agents_at((1, 1), 0), {1})
+        self.assertEqual(len(index.cells[(1, 1)]), 2)
+
+    def test_swap(self):
+        index = collisions.OccupancyIndex([[(0, 0), (0, 1)], [(0, 1), (0, 1)]])
+        self.assertSetEqual(index.swapping_agents((0, 1), (0, 0), 1), {0})
+        self.assertSetEqual(index.swapping_agents((0, 0), (0, 1), 1), set())
+        self.assertSetEqual(index.swapping_agents((0, 1), (0, 1), 1), set())
+
+    def test_remove(self):
+        index = collisions.OccupancyIndex([[(0, 0), (0, 1), (1, 1)], [(0, 1), (0, 0)]])
+        index.remove(0)
+        index.remove(1)
+        self.assertDictEqual(index.cells, dict())
+        self.assertDictEqual(index.goals, dict())
+        self.assertDictEqual(index.moves, dict())
+
+    def test_agent_first(self):
+        index = collisions.OccupancyIndex([[(0, 0), (0, 1)], [(1, 1)]])
+        path = [(0, 1), (0, 0)]
+        self.assertEqual(index.first_conflicts(2, path)[0], collisions.detect_collision(0, 2, [(0, 0), (0, 1)], path))
+        self.assertEqual(index.first_conflicts(2, path, agent_first=True)[0],
+                         collisions.detect_collision(2, 0, path, [(0, 0), (0, 1)]))
+
+    def test_random(self):
+        rng = np.random.default_rng(1)
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (0, 0)]
+
+        def random_path():
+            path = [(int(rng.integers(3)), int(rng.integers(3)))]
+            for _ in range(rng.integers(0, 8)):
+                direction = directions[rng.integers(5)]
+                path.append((path[-1][0] + direction[0], path[-1][1] + direction[1]))
+            return path
+
+        for _ in range(200):
+            paths = [random_path() for _ in range(rng.integers(2, 8))]
+            index = collisions.OccupancyIndex(paths)
+            for _ in range(5):
+                agent = int(rng.integers(len(paths)))
+                path = random_path()
+                expected = dict()
+                for other in range(len(paths)):
+                    if other != agent:
+                        if agent < other:
+                            collision = collisions.detect_collision(agent, other, path, paths[other])
+                        else:
+                            collision = collisions.detect_collision(other, agent, paths[other], path)
+                        if collision:
+                            expected[other] = collision
+                self.assertDictEqual(index.first_conflicts(agent, path), expected)
+                paths[agent] = path
+                index.sync(paths)
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,141 @@
+import numpy as np
+
+import itertools
+import unittest
+from unittest import mock
+
+import conflict_graph
+import constraints
+import mdd
+import run_experiments
+import single_agent_planner
+
+from cbs import CBSNode, CBSSolver
+
+
+class Test_VertexCover(unittest.TestCase):
+    """
+    Test the minimum vertex cover `conflict_graph.minimum_vertex_cover()` used by the high-level heuristics.
+
+    Outline of tests:
+    ------------------
+
+    test_empty : Check if a graph without edges of positive weight has a cover of weight 0
+
+    test_star : Check if the center of a star covers all its edges
+
+    test_random : Check random weighted graphs against an enumeration of all vertex values
+
+    test_matching : Check if the matching bound of a large component is a lower bound of the cover
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    @staticmethod
+    def brute_force(vertices, weights):
+        best = None
+        for values in itertools.product(range(max(weights.values(), default=0) + 1), repeat=len(vertices)):
+            assignment = dict(zip(vertices, values))
+            if all(assignment[v0] + assignment[v1] >= w for (v0, v1), w in weights.items()):
+                best = sum(values) if best is None else min(best, sum(values))
+        return best
+
+    def test_empty(self):
+        self.assertEqual(conflict_graph.minimum_vertex_cover(dict()), 0)
+        self.assertEqual(conflict_graph.minimum_vertex_cover({(0, 1): 0}), 0)
+
+    def test_star(self):
+        self.assertEqual(conflict_graph.minimum_vertex_cover({(0, 1): 1, (0, 2): 1, (0, 3): 1, (4, 5): 1}), 2)
+
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            vertices = list(range(rng.integers(2, 6)))
+            weights = {(v0, v1): int(rng.integers(0, 3)) for v0, v1 in itertools.combinations(vertices, 2)
+                       if rng.random() < 0.5}
+            self.assertEqual(conflict_graph.minimum_vertex_cover(weights), self.brute_force(vertices, weights))
+
+    def test_matching(self):
+        path = {(v, v + 1): 1 for v in range(conflict_graph.EXACT_COVER_LIMIT + 3)}
+        bound = conflict_graph.minimum_vertex_cover(path)
+        self.assertLessEqual(bound, (conflict_graph.EXACT_COVER_LIMIT + 4) // 2)
+        self.assertGreater(bound, 0)
+
+
+class Test_Dependency(unittest.TestCase):
+    """
+    Test the dependency check of two MDDs `conflict_graph.dependent()` and the high-level heuristics of CBS.
+
+    Outline of tests:
+    ------------------
+
+    test_corridor : Check if two agents crossing in a corridor are dependent
+
+    test_independent : Check if agents that can avoid each other at their optimal cost are independent
+
+    test_heuristics : Check if all heuristics find the optimal cost with at most as many expanded nodes
+
+    test_disjoint : Check if the heuristics are rejected with disjoint splitting, the default of CBSSolver
+
+    test_pair_errors : Check if only a two agent problem without solution gets weight 1 and other errors are raised
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    @staticmethod
+    def build(my_map, start, goal):
+        h_values = single_agent_planner.compute_heuristics(my_map, goal)
+        table = constraints.ConstraintTable([], 0)
+        path = single_agent_planner.a_star(my_map, start, goal, h_values, 0, [])
+        return mdd.MDD(my_map, start, goal, h_values, table, len(path) - 1)
+
+    def test_corridor(self):
+        corridor = np.zeros((1, 4), dtype=bool)
+        self.assertTrue(conflict_graph.dependent(self.build(corridor, (0, 0), (0, 3)),
+                                                 self.build(corridor, (0, 3), (0, 0))))
+
+    def test_independent(self):
+        open_map = np.zeros((3, 3), dtype=bool)
+        self.assertFalse(conflict_graph.dependent(self.build(open_map, (0, 0), (2, 2)),
+                                                  self.build(open_map, (0, 2), (2, 0))))
+        self.assertTrue(conflict_graph.dependent(self.build(open_map, (0, 0), (0, 2)),
+                                                 self.build(open_map, (0, 2), (0, 0))))
+
+    def test_heuristics(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_41.txt")
+        expanded = dict()
+        for heuristic in CBSSolver.HEURISTICS:
+            solver = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, heuristic=heuristic)
+            self.assertEqual(single_agent_planner.get_sum_of_cost(solver.find_solution([])), 45)
+            expanded[heuristic] = solver.num_of_expanded
+        self.assertLessEqual(expanded["cg"], expanded["none"])
+        self.assertLessEqual(expanded["wdg"], expanded["none"])
+        with self.assertRaises(ValueError):
+            CBSSolver(my_map, starts, goals, printing=False, disjoint=False, heuristic="wdg", suboptimality=1.5)
+
+    def test_disjoint(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_7.txt")
+        for heuristic in CBSSolver.HEURISTICS[1:]:
+            with self.assertRaises(ValueError):
+                CBSSolver(my_map, starts, goals, printing=False, heuristic=heuristic, seed=0)
+            solver = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, heuristic=heuristic)
+            self.assertEqual(single_agent_planner.get_sum_of_cost(solver.find_solution([])), 34)
+        solver = CBSSolver(my_map, starts, goals, printing=False, seed=0)
+        self.assertEqual(single_agent_planner.get_sum_of_cost(solver.find_solution([])), 34)
+
+    def test_pair_errors(self):
+        corridor = np.zeros((1, 4), dtype=bool)
+        starts, goals = [(0, 0), (0, 3)], [(0, 3), (0, 0)]
+        solver = CBSSolver(corridor, starts, goals, printing=False, disjoint=False, heuristic="wdg")
+        for exception in (BaseException('No solutions'), KeyboardInterrupt(), SystemExit()):
+            # new constraint tables for every node, as the weights are cached by the tables of both agents
+            node = CBSNode(0, [], [[(0, 0)], [(0, 3)]], dict(), 0,
+                           tables=[constraints.ConstraintTable([], i) for i in range(2)])
+            with mock.patch.object(CBSSolver, "find_solution", side_effect=exception):
+                if type(exception) is BaseException:
+                    self.assertEqual(solver.pair_weight(node, 0, 1, None), 1)
+                    continue
+                with self.assertRaises(type(exception)):
+                    solver.pair_weight(node, 0, 1, None)
@@ -0,0 +1,161 @@
+import numpy as np
+
+import unittest
+
+import constraints
+
+
+def reference_is_constrained(constraint_list, agent, current_loc, next_loc, step):
+    """
+    Reference implementation checking every compiled constraint one after another
+    """
+    for constraint in constraint_list:
+        for c in constraint.compile_constraint(agent):
+            if c.infinite:
+                if step >= c.step and c.loc_1 == next_loc:
+                    return True
+            elif c.step != step:
+                continue
+            elif c.positive:
+                if c.loc_1 != next_loc:
+                    return True
+            elif c.loc_2 is None:
+                if c.loc_1 == next_loc:
+                    return True
+            elif c.loc_1 == current_loc and c.loc_2 == next_loc:
+                return True
+    return False
+
+
+class Test_ConstraintTable(unittest.TestCase):
+    """
+    Test the reservation table `constraints.ConstraintTable()` against a reference implementation that checks all
+    constraints linearly.
+
+    Outline of tests:
+    ------------------
+
+    test_vertex : Check negative vertex constraints
+
+    test_edge : Check negative edge constraints and positive edge constraints of other agents
+
+    test_positive : Check positive vertex constraints of the agent itself
+
+    test_infinite : Check infinite constraints and the is_infinite property
+
+    test_random : Check random constraint sets against the reference implementation
+
+    test_goal_hold : Check the last timestep at which staying at the goal is constrained
+
+    test_goal_blocked : Check if an infinite constraint on the goal is reported as permanently blocked
+
+    test_reserve : Check if reserving paths equals adding the positive constraints of the prioritized solver
+
+    test_key : Check if constraints restricting the agents in the same way have the same key
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    def test_vertex(self):
+        table = constraints.ConstraintTable([constraints.Constraint(False, 0, 2, (1, 1))], 0)
+        self.assertTrue(table.is_constrained((1, 0), (1, 1), 2))
+        self.assertFalse(table.is_constrained((1, 0), (1, 1), 3))
+        self.assertEqual(len(table), 3)
+
+    def test_edge(self):
+        table = constraints.ConstraintTable([constraints.Constraint(False, 0, 2, (1, 0), (1, 1)),
+                                             constraints.Constraint(True, 1, 4, (2, 0), (2, 1))], 0)
+        self.assertTrue(table.is_constrained((1, 0), (1, 1), 2))
+        self.assertFalse(table.is_constrained((1, 1), (1, 0), 2))
+        self.assertTrue(table.is_constrained((2, 1), (2, 0), 4))
+        self.assertTrue(table.is_constrained((3, 0), (2, 0), 3))
+        self.assertTrue(table.is_constrained((3, 1), (2, 1), 4))
+
+    def test_positive(self):
+        table = constraints.ConstraintTable([constraints.Constraint(True, 0, 3, (1, 0), (1, 1))], 0)
+        self.assertTrue(table.is_constrained((1, 0), (0, 0), 2))
+        self.assertFalse(table.is_constrained((0, 0), (1, 0), 2))
+        self.assertFalse(table.is_constrained((1, 0), (1, 1), 3))
+
+    def test_infinite(self):
+        table = constraints.ConstraintTable([constraints.Constraint(True, 1, 5, (2, 2), infinite=True)], 0)
+        self.assertTrue(table.is_infinite)
+        self.assertFalse(table.is_constrained((2, 1), (2, 2), 4))
+        self.assertTrue(table.is_constrained((2, 1), (2, 2), 50))
+        self.assertEqual(len(table), 0)
+
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        locs = [(x, y) for x in range(3) for y in range(3)]
+        for _ in range(50):
+            constraint_list = []
+            for _ in range(rng.integers(1, 12)):
+                loc_1 = locs[rng.integers(len(locs))]
+                loc_2 = locs[rng.integers(len(locs))] if rng.random() < 0.4 else None
+                constraint_list.append(constraints.Constraint(bool(rng.random() < 0.3),
+                                                              int(rng.integers(3)),
+                                                              int(rng.integers(1, 6)),
+                                                              loc_1,
+                                                              loc_2,
+                                                              loc_2 is None and bool(rng.random() < 0.2)))
+            table = constraints.ConstraintTable(constraint_list, 0)
+            for current_loc in locs:
+                for next_loc in locs:
+                    for step in range(8):
+                        self.assertEqual(table.is_constrained(current_loc, next_loc, step),
+                                         reference_is_constrained(constraint_list, 0, current_loc, next_loc, step))
+            for goal in locs:
+                if goal in table.infinite:
+                    self.assertIsNone(table.goal_hold_step(goal))
+                else:
+                    expected = max([t for t in range(1, 8)
+                                    if reference_is_constrained(constraint_list, 0, goal, goal, t)], default=0)
+                    self.assertEqual(table.goal_hold_step(goal), expected)
+
+    def test_goal_hold(self):
+        table = constraints.ConstraintTable([constraints.Constraint(False, 0, 2, (1, 1)),
+                                             constraints.Constraint(False, 0, 4, (1, 1), (1, 1)),
+                                             constraints.Constraint(False, 0, 7, (2, 2))], 0)
+        self.assertEqual(table.goal_hold_step((1, 1)), 4)
+        self.assertEqual(table.goal_hold_step((0, 0)), 0)
+        table.add(constraints.Constraint(True, 0, 9, (1, 0)))
+        self.assertEqual(table.goal_hold_step((1, 1)), 9)
+
+    def test_goal_blocked(self):
+        table = constraints.ConstraintTable([constraints.Constraint(True, 1, 5, (2, 2), infinite=True)], 0)
+        self.assertIsNone(table.goal_hold_step((2, 2)))
+        self.assertEqual(table.goal_hold_step((2, 1)), 0)
+
+    def test_reserve(self):
+        rng = np.random.default_rng(2)
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0), (0, 0)]
+        for _ in range(50):
+            constraint_list = []
+            reservations = constraints.ConstraintTable([], -1)
+            for a in range(1, rng.integers(2, 5)):
+                path = [(int(rng.integers(3)), int(rng.integers(3)))]
+                for _ in range(rng.integers(0, 6)):
+                    direction = directions[rng.integers(5)]
+                    path.append((path[-1][0] + direction[0], path[-1][1] + direction[1]))
+                for t, path_vertex in enumerate(path[:-1]):
+                    constraint_list.append(constraints.Constraint(True, a, t + 1, path_vertex, path[t + 1]))
+                constraint_list.append(constraints.Constraint(True, a, len(path), path[-1], infinite=True))
+                reservations.reserve(path)
+            expected = constraints.ConstraintTable(constraint_list, 0)
+            table = reservations.copy(0)
+            self.assertEqual(table.agent, 0)
+            self.assertDictEqual(table.vertex, expected.vertex)
+            self.assertDictEqual(table.edge, expected.edge)
+            self.assertDictEqual(table.infinite, expected.infinite)
+            self.assertEqual(len(table), len(expected))
+
+    def test_key(self):
+        self.assertEqual(constraints.Constraint(False, 0, 2, [1, 1]).key,
+                         constraints.Constraint(False, 0, 2, (1, 1)).key)
+        self.assertEqual(constraints.Constraint(True, 1, 3, (0, 0), (0, 1)).key,
+                         (True, 1, 3, (0, 0), (0, 1), False))
+        self.assertNotEqual(constraints.Constraint(False, 0, 2, (1, 1)).key,
+                            constraints.Constraint(False, 0, 2, (1, 1), infinite=True).key)
+        self.assertNotEqual(constraints.Constraint(False, 0, 2, (1, 1), (1, 2)).key,
+                            constraints.Constraint(False, 0, 2, (1, 2), (1, 1)).key)
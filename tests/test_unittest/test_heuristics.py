@@ -0,0 +1,130 @@
+import numpy as np
+
+import unittest
+
+import heuristics
+import single_agent_planner
+
+
+class Test_Heuristics(unittest.TestCase):
+    """
+    Test the dense goal distance tables generated by `single_agent_planner.compute_heuristics()`.
+
+    Map used within the tests:
+    ---------------------
+    . . . @
+    . @ . @
+    . @ . .
+    @ @ @ .
+
+    Outline of tests:
+    ------------------
+
+    test_distances : Check the distances of the wavefront against hand computed values
+
+    test_unreachable : Check if unreachable cells contain the sentinel and are not part of the dict view
+
+    test_dict_view : Check if the table can be used as the dictionary it replaces
+
+    test_read_only : Check if the shared grid can not be modified
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 0, 1],
+                             [0, 1, 0, 1],
+                             [0, 1, 0, 0],
+                             [1, 1, 1, 0]], dtype=bool)
+        self.goal = (3, 3)
+        self.table = single_agent_planner.compute_heuristics(self.map, self.goal)
+
+    def test_distances(self):
+        expected = np.array([[6, 5, 4, 0],
+                             [7, 0, 3, 0],
+                             [8, 0, 2, 1],
+                             [0, 0, 0, 0]])
+        mask = ~self.map
+        self.assertTrue(np.array_equal(self.table.grid[mask], expected[mask]))
+        self.assertEqual(self.table.grid.dtype, np.int32)
+
+    def test_unreachable(self):
+        self.assertEqual(self.table.grid[1, 1], heuristics.UNREACHABLE)
+        self.assertNotIn((1, 1), self.table)
+        self.assertNotIn((4, 0), self.table)
+        with self.assertRaises(KeyError):
+            _ = self.table[(-1, 0)]
+
+    def test_dict_view(self):
+        self.assertEqual(len(self.table), 9)
+        self.assertEqual(self.table[(0, 0)], 6)
+        self.assertEqual(self.table.get((1, 1), -1), -1)
+        self.assertEqual(dict(self.table)[(2, 3)], 1)
+
+    def test_read_only(self):
+        with self.assertRaises(ValueError):
+            self.table.grid[0, 0] = 1
+
+
+class Test_HeuristicCache(unittest.TestCase):
+    """
+    Test the least recently used heuristics cache `heuristics.HeuristicCache()`.
+
+    Outline of tests:
+    ------------------
+
+    test_hits : Check if a repeated lookup is answered from the cache
+
+    test_fingerprint : Check if equal maps of different dtype share their tables while different maps do not
+
+    test_eviction : Check if the least recently used table is evicted once the cache is full
+
+    test_disabled : Check if a disabled cache always calls the heuristics function
+
+    test_get_all : Check if the tables missing for several goals are computed together and returned in goal order
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.zeros((3, 3), dtype=bool)
+        self.cache = heuristics.HeuristicCache(maxsize=2)
+
+    def test_hits(self):
+        table = self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics)
+        self.assertIs(self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics), table)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_fingerprint(self):
+        table = self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics)
+        self.assertIs(self.cache.get(self.map.astype(int), (0, 0), single_agent_planner.compute_heuristics), table)
+        other_map = self.map.copy()
+        other_map[1, 1] = True
+        self.assertIsNot(self.cache.get(other_map, (0, 0), single_agent_planner.compute_heuristics), table)
+
+    def test_eviction(self):
+        for goal in [(0, 0), (1, 1), (0, 0), (2, 2)]:
+            self.cache.get(self.map, goal, single_agent_planner.compute_heuristics)
+        self.assertEqual(len(self.cache), 2)
+        self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 3))
+
+    def test_disabled(self):
+        self.cache.enabled = False
+        table = self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics)
+        self.assertIsNot(self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics), table)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_get_all(self):
+        computed = []
+
+        def compute(goals):
+            computed.append(goals)
+            return [single_agent_planner.compute_heuristics(self.map, goal) for goal in goals]
+
+        table = self.cache.get(self.map, (0, 0), single_agent_planner.compute_heuristics)
+        tables = self.cache.get_all(self.map, [(1, 1), (0, 0), (1, 1)], single_agent_planner.compute_heuristics,
+                                    compute)
+        self.assertListEqual(computed, [[(1, 1)]])
+        self.assertIs(tables[1], table)
+        self.assertIs(tables[0], tables[2])
+        self.assertEqual(tables[0][(0, 0)], 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
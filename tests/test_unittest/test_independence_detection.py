@@ -0,0 +1,91 @@
+import numpy as np
+
+import unittest
+
+import collisions
+import constraints
+import run_experiments
+import single_agent_planner
+
+from cbs import CBSSolver
+from independence_detection import IndependenceDetectionSolver, group_constraints
+from prioritized import PrioritizedPlanningSolver
+
+
+class Test_IndependenceDetection(unittest.TestCase):
+    """
+    Test the independence detection solver `independence_detection.IndependenceDetectionSolver()`.
+
+    Map used within the tests:
+    ---------------------
+    . . . .
+    . . . .
+    @ @ @ @
+    . . . .
+    . . . .
+
+    Outline of tests:
+    ------------------
+
+    test_group_constraints : Check if constraints are renumbered for a group and positive ones of other agents kept
+
+    test_groups : Check if only the agents swapping their positions within the same room are merged into a group
+
+    test_optimal : Check if the solutions cost as much as the optimal CBS solutions
+
+    test_workers : Check if solving the groups in worker processes returns the same paths
+
+    test_inner_solver : Check if another solver can be used for the merged groups
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 0, 0],
+                             [0, 0, 0, 0],
+                             [1, 1, 1, 1],
+                             [0, 0, 0, 0],
+                             [0, 0, 0, 0]], dtype=bool)
+        self.starts = [(0, 0), (3, 0), (0, 3), (3, 3)]
+        self.goals = [(0, 3), (3, 3), (0, 0), (3, 0)]
+
+    def test_group_constraints(self):
+        base = [constraints.Constraint(False, 2, 1, (0, 1)),
+                constraints.Constraint(True, 0, 2, (0, 2)),
+                constraints.Constraint(False, 0, 3, (0, 3))]
+        translated = group_constraints(base, (1, 2))
+        self.assertListEqual([c.key for c in translated],
+                             [(False, 1, 1, (0, 1), None, False),
+                              (False, 0, 2, (0, 2), None, False),
+                              (False, 1, 2, (0, 2), None, False)])
+
+    def test_groups(self):
+        solver = IndependenceDetectionSolver(self.map, self.starts, self.goals, printing=False,
+                                             inner_kwargs={"disjoint": False})
+        paths = solver.find_solution([])
+        self.assertDictEqual(collisions.detect_collisions(paths), dict())
+        self.assertListEqual(solver.groups, [(0, 2), (1, 3), (0, 2), (1, 3)])
+        self.assertEqual(solver.solver_stats()["largest group"], 2)
+        self.assertEqual(single_agent_planner.get_sum_of_cost(paths), single_agent_planner.get_sum_of_cost(
+            CBSSolver(self.map, self.starts, self.goals, printing=False).find_solution([])))
+
+    def test_optimal(self):
+        for instance in ("instances/test_1.txt", "instances/test_30.txt", "instances/test_41.txt"):
+            my_map, starts, goals = run_experiments.import_mapf_instance(instance)
+            paths = IndependenceDetectionSolver(my_map, starts, goals, printing=False).find_solution([])
+            expected = CBSSolver(my_map, starts, goals, printing=False, disjoint=False).find_solution([])
+            self.assertDictEqual(collisions.detect_collisions(paths), dict())
+            self.assertEqual(single_agent_planner.get_sum_of_cost(paths),
+                             single_agent_planner.get_sum_of_cost(expected))
+
+    def test_workers(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_41.txt")
+        serial = IndependenceDetectionSolver(my_map, starts, goals, printing=False, inner_kwargs={"disjoint": False})
+        parallel = IndependenceDetectionSolver(my_map, starts, goals, printing=False, inner_kwargs={"disjoint": False},
+                                               workers=2)
+        self.assertListEqual(parallel.find_solution([]), serial.find_solution([]))
+        self.assertListEqual(parallel.groups, serial.groups)
+
+    def test_inner_solver(self):
+        solver = IndependenceDetectionSolver(self.map, self.starts, self.goals, printing=False,
+                                             inner_solver=PrioritizedPlanningSolver)
+        self.assertDictEqual(collisions.detect_collisions(solver.find_solution([])), dict())
@@ -0,0 +1,99 @@
+import numpy as np
+
+import unittest
+
+import collisions
+import constraints
+import joint_planner
+import run_experiments
+import single_agent_planner
+
+from cbs import CBSSolver
+
+
+class Test_JointPlanner(unittest.TestCase):
+    """
+    Test the coupled low-level search `joint_planner.joint_a_star()` of meta-agents and the merging of agents in CBS.
+
+    Map used within the tests:
+    ---------------------
+    . . . .
+    @ . @ @
+
+    Outline of tests:
+    ------------------
+
+    test_swap : Check if two agents swap their positions using the side pocket at the optimal sum of costs
+
+    test_corridor : Check if two agents that cannot pass each other have no joint paths
+
+    test_constrained : Check if the constraints of every agent are respected by the joint paths
+
+    test_random : Check if the joint paths of three random agents cost as much as the optimal CBS solution
+
+    test_merge : Check if merging agents in CBS keeps the cost of the solution
+
+    test_merge_arguments : Check if invalid merge thresholds are rejected
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 0, 0],
+                             [1, 0, 1, 1]], dtype=bool)
+
+    def solve(self, my_map, starts, goals, constraint_list=()):
+        h_values = [single_agent_planner.compute_heuristics(my_map, goal) for goal in goals]
+        tables = [constraints.ConstraintTable(list(constraint_list), i) for i in range(len(goals))]
+        return joint_planner.joint_a_star(my_map, starts, goals, h_values, tables)
+
+    def test_swap(self):
+        paths = self.solve(self.map, [(0, 0), (0, 3)], [(0, 3), (0, 0)])
+        self.assertEqual(single_agent_planner.get_sum_of_cost(paths), 8)
+        self.assertDictEqual(collisions.detect_collisions(paths), dict())
+        self.assertEqual(paths[0][0], (0, 0))
+        self.assertEqual(paths[1][-1], (0, 0))
+
+    def test_corridor(self):
+        self.assertIsNone(self.solve(np.zeros((1, 4), dtype=bool), [(0, 0), (0, 3)], [(0, 3), (0, 0)]))
+
+    def test_constrained(self):
+        paths = self.solve(self.map, [(0, 0), (0, 2)], [(0, 1), (0, 3)], [constraints.Constraint(False, 0, 1, (0, 1)),
+                                                                           constraints.Constraint(False, 1, 2, (0, 3))])
+        self.assertListEqual(paths[0], [(0, 0), (0, 0), (0, 1)])
+        self.assertEqual(len(paths[1]), 4)
+        self.assertNotEqual(paths[1][2], (0, 3))
+        self.assertIsNone(self.solve(self.map, [(0, 0)], [(0, 1)], [constraints.Constraint(False, 0, 1, (0, 1),
+                                                                                           infinite=True)]))
+
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        my_map = np.zeros((3, 3), dtype=bool)
+        locs = [(y, x) for y in range(3) for x in range(3) if not my_map[y, x]]
+        for _ in range(20):
+            picks = rng.choice(len(locs), 6, replace=False)
+            starts, goals = [locs[i] for i in picks[:3]], [locs[i] for i in picks[3:]]
+            paths = self.solve(my_map, starts, goals)
+            expected = CBSSolver(my_map, starts, goals, printing=False).find_solution([])
+            self.assertEqual(single_agent_planner.get_sum_of_cost(paths),
+                             single_agent_planner.get_sum_of_cost(expected))
+            self.assertDictEqual(collisions.detect_collisions(paths), dict())
+
+    def test_merge(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_1.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False)
+        expected = single_agent_planner.get_sum_of_cost(plain.find_solution([]))
+        for disjoint in (False, True):
+            merging = CBSSolver(my_map, starts, goals, printing=False, disjoint=disjoint, merge_threshold=0,
+                                debug=True)
+            paths = merging.find_solution([])
+            self.assertEqual(single_agent_planner.get_sum_of_cost(paths), expected)
+            self.assertDictEqual(collisions.detect_collisions(paths), dict())
+            self.assertGreater(merging.num_of_merges, 0)
+        self.assertEqual(plain.num_of_merges, 0)
+
+    def test_merge_arguments(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_1.txt")
+        with self.assertRaises(ValueError):
+            CBSSolver(my_map, starts, goals, printing=False, merge_threshold=-1)
+        with self.assertRaises(ValueError):
+            CBSSolver(my_map, starts, goals, printing=False, merge_threshold=2, heuristic="cg")
@@ -0,0 +1,90 @@
+import gc
+import numpy as np
+
+import unittest
+from unittest import mock
+
+import heuristics
+import map_graph
+
+
+class Test_MapGraph(unittest.TestCase):
+    """
+    Test the preprocessed map `map_graph.MapGraph()`.
+
+    Map used within the tests:
+    ---------------------
+    . . @
+    . @ .
+    . . .
+
+    Outline of tests:
+    ------------------
+
+    test_padded : Check if the map is surrounded by sentinel walls
+
+    test_neighbours : Check the neighbour table, including the wait action and the order of utils.DIRECTIONS
+
+    test_walls : Check if walls have no neighbours and are never a neighbour
+
+    test_is_wall : Check the wall lookup, including points outside the map
+
+    test_cache : Check if equal maps share one graph
+
+    test_identity : Check if a map is only hashed on its first lookup and forgotten once it is garbage collected
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 1],
+                             [0, 1, 0],
+                             [0, 0, 0]], dtype=bool)
+        self.graph = map_graph.MapGraph(self.map)
+
+    def test_padded(self):
+        self.assertEqual(self.graph.padded.shape, (5, 5))
+        self.assertTrue(self.graph.padded[0, :].all() and self.graph.padded[-1, :].all())
+        self.assertTrue(self.graph.padded[:, 0].all() and self.graph.padded[:, -1].all())
+        self.assertTrue(np.array_equal(self.graph.padded[1:-1, 1:-1], self.map))
+
+    def test_neighbours(self):
+        corner = self.graph.cell((0, 0))
+        self.assertTupleEqual(self.graph.adjacency[corner], (self.graph.cell((1, 0)), self.graph.cell((0, 1)), corner))
+        centre_bottom = self.graph.cell((2, 1))
+        self.assertTupleEqual(self.graph.adjacency[centre_bottom],
+                              (self.graph.cell((2, 0)), self.graph.cell((2, 2)), centre_bottom))
+        self.assertEqual(self.graph.offsets[-1], len(self.graph.targets))
+        for c in range(9):
+            self.assertTupleEqual(self.graph.adjacency[c],
+                                  tuple(self.graph.targets[self.graph.offsets[c]:self.graph.offsets[c + 1]]))
+
+    def test_walls(self):
+        wall = self.graph.cell((1, 1))
+        self.assertTupleEqual(self.graph.adjacency[wall], ())
+        self.assertNotIn(wall, self.graph.targets)
+
+    def test_is_wall(self):
+        self.assertTrue(self.graph.is_wall((0, 2)))
+        self.assertFalse(self.graph.is_wall((0, 1)))
+        self.assertFalse(self.graph.is_wall((-1, 0)))
+        self.assertFalse(self.graph.is_wall((3, 3)))
+
+    def test_cache(self):
+        graph = map_graph.get(self.map)
+        self.assertIs(map_graph.get(self.map.astype(int)), graph)
+        self.assertIsNot(map_graph.get(~self.map), graph)
+
+    def test_identity(self):
+        cache = map_graph.MapGraphCache()
+        my_map = self.map.copy()
+        with mock.patch.object(heuristics, "map_fingerprint", wraps=heuristics.map_fingerprint) as fingerprint:
+            graph = cache.get(my_map)
+            self.assertIs(cache.get(my_map), graph)
+            self.assertIs(cache.get(self.map.tolist()), graph)
+            self.assertIs(cache.get(self.map.tolist()), graph)
+        self.assertEqual(fingerprint.call_count, 3)
+        self.assertIn(id(my_map), cache.identities)
+        identity = id(my_map)
+        del my_map, fingerprint  # the mock keeps its call arguments alive
+        gc.collect()
+        self.assertNotIn(identity, cache.identities)
@@ -0,0 +1,126 @@
+import numpy as np
+
+import unittest
+
+import constraints
+import mdd
+import run_experiments
+import single_agent_planner
+
+from cbs import CBSNode, CBSSolver, CARDINAL, SEMI_CARDINAL, NON_CARDINAL
+from collisions import Collision
+
+
+def reference_levels(my_map, start, goal, table, cost):
+    """
+    Reference implementation enumerating every path of the given cost
+    """
+    paths = [[start]]
+    for step in range(1, cost + 1):
+        extended = []
+        for path in paths:
+            for direction in [(0, -1), (1, 0), (0, 1), (-1, 0), (0, 0)]:
+                loc = (path[-1][0] + direction[0], path[-1][1] + direction[1])
+                if not (0 <= loc[0] < my_map.shape[0] and 0 <= loc[1] < my_map.shape[1]) or my_map[loc]:
+                    continue
+                if not table.is_constrained(path[-1], loc, step):
+                    extended.append(path + [loc])
+        paths = extended
+    paths = [path for path in paths if path[-1] == goal]
+    return [{path[step] for path in paths} for step in range(cost + 1)] if paths else []
+
+
+class Test_MDD(unittest.TestCase):
+    """
+    Test the multi-valued decision diagram `mdd.MDD()` and the conflict classification of CBS based on it.
+
+    Map used within the tests:
+    ---------------------
+    . . . .
+    . @ @ .
+    . . . .
+
+    Outline of tests:
+    ------------------
+
+    test_corridor : Check if a single optimal path results in a level of width one at every timestep
+
+    test_open : Check the levels of an agent with several optimal paths and an MDD of a cost below the optimum
+
+    test_constrained : Check if constraints remove the blocked locations from the levels
+
+    test_random : Check the levels against an enumeration of all paths for random constraints
+
+    test_classify : Check if collisions are classified as cardinal, semi-cardinal and non-cardinal
+
+    test_icbs : Check if prioritizing cardinal collisions keeps the cost and reduces the CBS nodes
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 0, 0],
+                             [0, 1, 1, 0],
+                             [0, 0, 0, 0]], dtype=bool)
+
+    def build(self, start, goal, constraint_list, cost):
+        h_values = single_agent_planner.compute_heuristics(self.map, goal)
+        table = constraints.ConstraintTable(constraint_list, 0)
+        return mdd.MDD(self.map, start, goal, h_values, table, cost), table
+
+    def test_corridor(self):
+        diagram, _ = self.build((0, 0), (0, 3), [], 3)
+        self.assertListEqual(diagram.levels, [{(0, 0)}, {(0, 1)}, {(0, 2)}, {(0, 3)}])
+        self.assertTrue(all(diagram.width(step) == 1 for step in range(6)))
+
+    def test_open(self):
+        diagram, _ = self.build((0, 0), (2, 0), [], 2)
+        self.assertListEqual(diagram.levels, [{(0, 0)}, {(1, 0)}, {(2, 0)}])
+        diagram, _ = self.build((0, 0), (1, 0), [], 3)
+        self.assertEqual(diagram.width(1), 3)
+        self.assertEqual(len(diagram), 4)
+        diagram, _ = self.build((0, 0), (2, 0), [], 1)
+        self.assertEqual(len(diagram), 0)
+        self.assertEqual(diagram.width(5), 0)
+
+    def test_constrained(self):
+        diagram, _ = self.build((0, 0), (0, 3), [constraints.Constraint(False, 0, 2, (0, 2))], 4)
+        self.assertSetEqual(diagram.levels[2], {(0, 1)})
+        self.assertSetEqual(diagram.levels[1], {(0, 0), (0, 1)})
+        self.assertEqual(diagram.width(1), 2)
+
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        locs = [(y, x) for y in range(3) for x in range(4) if not self.map[y, x]]
+        for _ in range(50):
+            start = locs[rng.integers(len(locs))]
+            goal = locs[rng.integers(len(locs))]
+            constraint_list = [constraints.Constraint(False, 0, int(rng.integers(1, 6)), locs[rng.integers(len(locs))])
+                               for _ in range(rng.integers(0, 5))]
+            h_values = single_agent_planner.compute_heuristics(self.map, goal)
+            path = single_agent_planner.a_star(self.map, start, goal, h_values, 0, constraint_list)
+            if path is None:
+                continue
+            for cost in (len(path) - 1, len(path)):
+                diagram, table = self.build(start, goal, constraint_list, cost)
+                self.assertListEqual(diagram.levels, reference_levels(self.map, start, goal, table, cost))
+
+    def test_classify(self):
+        my_map = np.zeros((3, 3), dtype=bool)
+        starts, goals = [(0, 0), (0, 2), (1, 1), (1, 0)], [(0, 2), (0, 0), (0, 0), (0, 1)]
+        solver = CBSSolver(my_map, starts, goals, printing=False)
+        paths = [[(0, 0), (0, 1), (0, 2)], [(0, 2), (0, 1), (0, 0)], [(1, 1), (0, 1), (0, 0)],
+                 [(1, 0), (1, 1), (0, 1)]]
+        node = CBSNode(0, [], paths, dict(), 0, tables=[constraints.ConstraintTable([], i) for i in range(4)])
+        self.assertEqual(solver.classify_collision(node, Collision(0, 1, 1, (0, 1))), CARDINAL)
+        self.assertEqual(solver.classify_collision(node, Collision(0, 2, 1, (0, 1))), SEMI_CARDINAL)
+        self.assertEqual(solver.classify_collision(node, Collision(2, 3, 1, (1, 1), (0, 1))), NON_CARDINAL)
+        self.assertEqual(solver.num_of_mdds, 4)
+
+    def test_icbs(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_30.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, prioritize_conflicts=False)
+        icbs = CBSSolver(my_map, starts, goals, printing=False, disjoint=False)
+        self.assertEqual(single_agent_planner.get_sum_of_cost(icbs.find_solution([])),
+                         single_agent_planner.get_sum_of_cost(plain.find_solution([])))
+        self.assertLess(icbs.num_of_expanded, plain.num_of_expanded)
+        self.assertGreater(icbs.num_of_mdds, 0)
@@ -0,0 +1,124 @@
+import numpy as np
+
+import itertools
+import unittest
+
+import constraints
+import node_store
+import run_experiments
+import single_agent_planner
+
+from cbs import CBSSolver
+
+
+class Test_NodeStore(unittest.TestCase):
+    """
+    Test the compact node records `node_store.NodeRecord()`, the memory-bounded open list
+    `node_store.BoundedOpenList()` and the memory-bounded mode of CBS.
+
+    Outline of tests:
+    ------------------
+
+    test_full_paths : Check if the paths of a record are collected from the closest ancestor that replanned them
+
+    test_detach : Check if a record keeps its constraints, paths and costs when written to the disk and loaded again
+
+    test_spill : Check if records are popped in the order of their keys while half of them are spilled to the disk
+
+    test_threshold : Check if the next spill waits until the resident memory grew beyond the one after the last spill
+
+    test_cbs : Check if the memory-bounded mode of CBS expands the same nodes as the search with complete nodes
+
+    test_pair_weights : Check if the memory-bounded mode only caches the WDG weights of the node that is expanded
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    @staticmethod
+    def chain_of_records():
+        first, second = constraints.Constraint(False, 0, 1, (0, 1)), constraints.Constraint(False, 1, 2, (1, 1))
+        root = node_store.NodeRecord(None, ([], None), {0: [(0, 0)], 1: [(1, 0)], 2: [(2, 0)]}, 0, 0, 0,
+                                     [(0,), (1,), (2,)], 0, 0)
+        child = node_store.NodeRecord(root, ([first], root.chain), {0: [(0, 0), (0, 0)]}, 1, 0, 1,
+                                      root.groups, 1, 1)
+        grandchild = node_store.NodeRecord(child, ([second], child.chain), {1: [(1, 0), (1, 0), (1, 0)]}, 3, 1, 3,
+                                           root.groups, 2, 2)
+        return root, child, grandchild
+
+    def test_full_paths(self):
+        root, child, grandchild = self.chain_of_records()
+        self.assertListEqual(root.full_paths(3), [[(0, 0)], [(1, 0)], [(2, 0)]])
+        self.assertListEqual(child.full_paths(3), [[(0, 0), (0, 0)], [(1, 0)], [(2, 0)]])
+        self.assertListEqual(grandchild.full_paths(3), [[(0, 0), (0, 0)], [(1, 0), (1, 0), (1, 0)], [(2, 0)]])
+
+    def test_detach(self):
+        _, _, grandchild = self.chain_of_records()
+        record = node_store.NodeRecord.attach(grandchild.detach(3))
+        self.assertIsNone(record.parent)
+        self.assertListEqual([c.key for c in record.chain[0]],
+                             [constraints.Constraint(False, 0, 1, (0, 1)).key,
+                              constraints.Constraint(False, 1, 2, (1, 1)).key])
+        self.assertListEqual(record.full_paths(3), grandchild.full_paths(3))
+        self.assertTupleEqual((record.cost, record.h_value, record.lower_bound, record.key, record.idx),
+                              (3, 1, 3, 2, 2))
+
+    def test_spill(self):
+        rng = np.random.default_rng(0)
+        open_list = node_store.BoundedOpenList(0, rss=itertools.count(1).__next__, num_of_agents=1)
+        keys = []
+        for idx in range(500):
+            key = (int(rng.integers(10)), int(rng.integers(3)), idx)
+            keys.append(key)
+            open_list.push(key, node_store.NodeRecord(None, ([], None), {0: [(idx, 0)]}, key[0], 0, key[0], [(0,)],
+                                                      0, idx))
+            if idx % 7 == 0:
+                keys.sort()
+                self.assertEqual(open_list.pop().idx, keys.pop(0)[2])
+        self.assertGreater(open_list.num_of_spilled, 0)
+        self.assertEqual(len(open_list), len(keys))
+        keys.sort()
+        for key in keys:
+            record = open_list.pop()
+            self.assertEqual(record.idx, key[2])
+            self.assertListEqual(record.full_paths(1), [[(key[2], 0)]])
+        open_list.close()
+
+    def test_threshold(self):
+        rss = [200]
+        open_list = node_store.BoundedOpenList(100, rss=lambda: rss[0], num_of_agents=1)
+        for idx in range(4 * open_list.CHECK_INTERVAL):
+            open_list.push((idx,), node_store.NodeRecord(None, ([], None), {0: [(idx, 0)]}, idx, 0, idx, [(0,)], 0,
+                                                         idx))
+        self.assertEqual(open_list.num_of_spilled, open_list.CHECK_INTERVAL // 2)
+        self.assertEqual(open_list.threshold, 200)
+        rss[0] = 201
+        for idx in range(4 * open_list.CHECK_INTERVAL, 5 * open_list.CHECK_INTERVAL):
+            open_list.push((idx,), node_store.NodeRecord(None, ([], None), {0: [(idx, 0)]}, idx, 0, idx, [(0,)], 0,
+                                                         idx))
+        self.assertGreater(open_list.num_of_spilled, open_list.CHECK_INTERVAL // 2)
+        self.assertEqual(open_list.threshold, 201)
+        self.assertEqual(len(open_list), 5 * open_list.CHECK_INTERVAL)
+        open_list.close()
+
+    def test_cbs(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_30.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, bypass=True)
+        bounded = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, bypass=True, memory_budget=0,
+                            debug=True)
+        self.assertEqual(single_agent_planner.get_sum_of_cost(bounded.find_solution([])),
+                         single_agent_planner.get_sum_of_cost(plain.find_solution([])))
+        self.assertEqual(bounded.num_of_expanded, plain.num_of_expanded)
+        self.assertEqual(bounded.num_of_generated, plain.num_of_generated)
+        with self.assertRaises(ValueError):
+            CBSSolver(my_map, starts, goals, printing=False, memory_budget=0, suboptimality=1.5)
+
+    def test_pair_weights(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_41.txt")
+        plain = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, heuristic="wdg")
+        bounded = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, heuristic="wdg", memory_budget=0)
+        self.assertEqual(single_agent_planner.get_sum_of_cost(bounded.find_solution([])),
+                         single_agent_planner.get_sum_of_cost(plain.find_solution([])))
+        self.assertEqual(bounded.num_of_expanded, plain.num_of_expanded)
+        self.assertGreater(len(plain.pair_weights), 0)
+        self.assertEqual(len(bounded.pair_weights), 0)
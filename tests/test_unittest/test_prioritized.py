@@ -0,0 +1,164 @@
+import numpy as np
+
+import concurrent.futures.process
+import unittest
+from unittest import mock
+
+import collisions
+import run_experiments
+import single_agent_planner
+
+from prioritized import PrioritizedPlanningSolver, PrioritizedPortfolioSolver
+from search_limits import DeadlineExceeded
+
+
+class Test_Prioritized(unittest.TestCase):
+    """
+    Test the reordering of priorities of `prioritized.PrioritizedPlanningSolver()`.
+
+    Map used within the tests:
+    ---------------------
+    . . . . .
+    @ . @ @ .
+
+    Outline of tests:
+    ------------------
+
+    test_swap : Check if an agent that can not be planned is swapped with the agent before it
+
+    test_prefix : Check if the agents before the swapped ones are not planned again
+
+    test_restart : Check if a reordering that repeats itself is restarted with a random order
+
+    test_no_reordering : Check if the solver fails without reordering or restarts
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 0, 0, 0],
+                             [1, 0, 1, 1, 0]], dtype=bool)
+
+    def test_swap(self):
+        starts, goals = [(0, 0), (0, 2)], [(0, 1), (1, 1)]
+        solver = PrioritizedPlanningSolver(self.map, list(starts), list(goals), printing=False)
+        paths = solver.find_solution([])
+        self.assertDictEqual(collisions.detect_collisions(paths), dict())
+        self.assertListEqual([(path[0], path[-1]) for path in paths], list(zip(starts, goals)))
+        self.assertListEqual(solver.order, [1, 0])
+        self.assertEqual(solver.num_of_swaps, 1)
+        self.assertListEqual(solver.starts, starts)
+
+    def test_prefix(self):
+        solver = PrioritizedPlanningSolver(self.map, [(0, 0), (0, 2), (0, 1)], [(1, 1), (0, 2), (0, 1)],
+                                           printing=False)
+        paths = solver.find_solution([])
+        self.assertDictEqual(collisions.detect_collisions(paths), dict())
+        self.assertListEqual(solver.order, [0, 2, 1])
+        self.assertEqual(solver.num_of_searches, 5)
+
+    def test_restart(self):
+        starts, goals = [(0, 2), (0, 0), (0, 1)], [(0, 2), (1, 1), (0, 0)]
+        solver = PrioritizedPlanningSolver(self.map, list(starts), list(goals), printing=False, seed=0)
+        paths = solver.find_solution([])
+        self.assertDictEqual(collisions.detect_collisions(paths), dict())
+        self.assertListEqual([(path[0], path[-1]) for path in paths], list(zip(starts, goals)))
+        self.assertGreater(solver.num_of_restarts, 0)
+        self.assertEqual(solver.solver_stats()["restarts"], solver.num_of_restarts)
+
+    def test_no_reordering(self):
+        with self.assertRaises(BaseException):
+            PrioritizedPlanningSolver(self.map, [(0, 0), (0, 2)], [(0, 1), (1, 1)], printing=False,
+                                      recursive=False).find_solution([])
+        with self.assertRaises(BaseException):
+            PrioritizedPlanningSolver(self.map, [(0, 2), (0, 0), (0, 1)], [(0, 2), (1, 1), (0, 0)], printing=False,
+                                      restarts=0).find_solution([])
+
+
+class Test_PrioritizedPortfolio(unittest.TestCase):
+    """
+    Test the portfolio of priority orders `prioritized.PrioritizedPortfolioSolver()` on instances/test_47.txt.
+
+    Outline of tests:
+    ------------------
+
+    test_orders : Check if the portfolio holds the given, shortest first, longest first and random orders
+
+    test_first_success : Check if the first solution is returned and the remaining orderings are not started
+
+    test_best : Check if the cheapest solution of all orderings is returned together with the stats of every ordering
+
+    test_workers : Check if solving the orderings in worker processes returns the same solution and stats
+
+    test_time_limit : Check if an exceeded time limit without a solution raises DeadlineExceeded carrying the stats
+
+    test_errors : Check if only the missing solution of an ordering is recorded as failed and other errors are raised
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.my_map, self.starts, self.goals = run_experiments.import_mapf_instance("instances/test_47.txt")
+
+    def test_orders(self):
+        solver = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False, orderings=5, seed=1)
+        orders = solver.priority_orders()
+        distances = [solver.heuristics[i][self.starts[i]] for i in range(solver.num_of_agents)]
+        self.assertListEqual([name for name, _ in orders],
+                             ["given", "shortest first", "longest first", "random 1", "random 2"])
+        self.assertListEqual(orders[0][1], list(range(solver.num_of_agents)))
+        self.assertListEqual([distances[i] for i in orders[1][1]], sorted(distances))
+        self.assertListEqual([distances[i] for i in orders[2][1]], sorted(distances, reverse=True))
+        for _, order in orders[3:]:
+            self.assertListEqual(sorted(order), list(range(solver.num_of_agents)))
+        with self.assertRaises(ValueError):
+            PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False, orderings=0)
+
+    def test_first_success(self):
+        solver = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False)
+        paths = solver.find_solution([])
+        self.assertListEqual(paths, PrioritizedPlanningSolver(self.my_map, self.starts, self.goals,
+                                                              printing=False).find_solution([]))
+        self.assertEqual(solver.best, 0)
+        self.assertListEqual([entry["status"] for entry in solver.portfolio_stats],
+                             ["solved", "cancelled", "cancelled", "cancelled"])
+
+    def test_best(self):
+        solver = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False, orderings=5,
+                                            first_success=False, seed=1)
+        paths = solver.find_solution([])
+        self.assertDictEqual(collisions.detect_collisions(paths), dict())
+        costs = [entry["cost"] for entry in solver.portfolio_stats]
+        self.assertEqual(single_agent_planner.get_sum_of_cost(paths), min(costs))
+        self.assertEqual(solver.solver_stats()["best ordering"], solver.portfolio_stats[solver.best]["ordering"])
+        self.assertEqual(solver.solver_stats()["solved orderings"], 5)
+        for entry in solver.portfolio_stats:
+            self.assertGreaterEqual(entry["searches"], solver.num_of_agents)
+
+    def test_workers(self):
+        serial = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False, orderings=5,
+                                            first_success=False, seed=1)
+        parallel = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False, orderings=5,
+                                              first_success=False, seed=1, workers=2)
+        self.assertListEqual(parallel.find_solution([]), serial.find_solution([]))
+        for parallel_entry, serial_entry in zip(parallel.portfolio_stats, serial.portfolio_stats):
+            self.assertEqual((parallel_entry["order"], parallel_entry["cost"], parallel_entry["searches"]),
+                             (serial_entry["order"], serial_entry["cost"], serial_entry["searches"]))
+
+    def test_time_limit(self):
+        solver = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False, time_limit=0)
+        with self.assertRaises(DeadlineExceeded) as error:
+            solver.find_solution([])
+        self.assertEqual(len(error.exception.solver_stats["portfolio"]), 4)
+        self.assertEqual(error.exception.solver_stats["solved orderings"], 0)
+
+    def test_errors(self):
+        solver = PrioritizedPortfolioSolver(self.my_map, self.starts, self.goals, printing=False)
+        with mock.patch.object(PrioritizedPlanningSolver, "find_solution", side_effect=BaseException('No solutions')):
+            with self.assertRaises(BaseException) as error:
+                solver.find_solution([])
+        self.assertIs(type(error.exception), BaseException)
+        self.assertListEqual([entry["status"] for entry in solver.portfolio_stats], ["failed"] * 4)
+        for exception in (KeyboardInterrupt(), concurrent.futures.process.BrokenProcessPool("worker terminated")):
+            with mock.patch.object(PrioritizedPlanningSolver, "find_solution", side_effect=exception) as find_solution:
+                with self.assertRaises(type(exception)):
+                    solver.find_solution([])
+            self.assertEqual(find_solution.call_count, 1)
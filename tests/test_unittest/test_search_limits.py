@@ -0,0 +1,89 @@
+import numpy as np
+
+import unittest
+import os
+import pathlib
+import time as timer
+
+import run_experiments
+import search_limits
+import sipp
+import single_agent_planner
+
+from cbs import CBSSolver
+from prioritized import PrioritizedPlanningSolver
+
+
+class Test_SearchLimits(unittest.TestCase):
+    """
+    Test aborting searches with `search_limits.SearchLimits()`.
+
+    Outline of tests:
+    ------------------
+
+    test_budget : Check if a_star stops after exactly the node budget and reports the expanded nodes
+
+    test_shared_budget : Check if the node budget is shared by all searches using the same limits
+
+    test_deadline : Check if a passed deadline aborts the search
+
+    test_cancel : Check if a cancelled token aborts the search
+
+    test_unlimited : Check if limits that are not exceeded do not change the result
+
+    test_sipp : Check if sipp respects the node budget
+
+    test_solvers : Check if the solvers attach their counters to the exception
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.zeros((20, 20), dtype=bool)
+        self.h_values = single_agent_planner.compute_heuristics(self.map, (19, 19))
+
+    def plan(self, limits, low_level=single_agent_planner.a_star):
+        return low_level(self.map, (0, 0), (19, 19), self.h_values, 0, [], limits=limits)
+
+    def test_budget(self):
+        with self.assertRaises(search_limits.BudgetExceeded) as context:
+            self.plan(search_limits.SearchLimits(node_budget=10))
+        self.assertEqual(context.exception.stats.expanded, 10)
+        self.assertGreater(context.exception.stats.generated, 10)
+
+    def test_shared_budget(self):
+        limits = search_limits.SearchLimits(node_budget=60)
+        self.plan(limits)
+        self.assertEqual(limits.stats.expanded, 39)
+        with self.assertRaises(search_limits.BudgetExceeded) as context:
+            self.plan(limits)
+        self.assertEqual(context.exception.stats.expanded, 60)
+
+    def test_deadline(self):
+        with self.assertRaises(search_limits.DeadlineExceeded):
+            self.plan(search_limits.SearchLimits(deadline=timer.perf_counter() - 1))
+
+    def test_cancel(self):
+        token = search_limits.CancellationToken()
+        token.cancel()
+        with self.assertRaises(search_limits.SearchCancelled):
+            self.plan(search_limits.SearchLimits(token=token))
+
+    def test_unlimited(self):
+        limits = search_limits.SearchLimits(node_budget=1000, time_limit=60, token=search_limits.CancellationToken())
+        self.assertListEqual(self.plan(limits), self.plan(None))
+
+    def test_sipp(self):
+        with self.assertRaises(search_limits.BudgetExceeded) as context:
+            self.plan(search_limits.SearchLimits(node_budget=5), sipp.sipp)
+        self.assertEqual(context.exception.stats.expanded, 5)
+
+    def test_solvers(self):
+        os.chdir(pathlib.Path(__file__).parent.parent.parent)
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_47.txt")
+        with self.assertRaises(search_limits.BudgetExceeded) as context:
+            CBSSolver(my_map, starts, goals, printing=False).find_solution([], search_limits.SearchLimits(2000))
+        self.assertGreater(context.exception.solver_stats["expanded nodes"], 0)
+        with self.assertRaises(search_limits.BudgetExceeded) as context:
+            PrioritizedPlanningSolver(my_map, list(starts), list(goals), printing=False).find_solution(
+                [], search_limits.SearchLimits(20))
+        self.assertIn("CPU time", context.exception.solver_stats)
@@ -0,0 +1,110 @@
+import numpy as np
+
+import unittest
+
+import constraints
+import search_limits
+import single_agent_planner
+
+
+class Test_AStar(unittest.TestCase):
+    """
+    Test the low-level search `single_agent_planner.a_star()` on a small map.
+
+    Map used within the tests:
+    ---------------------
+    . . . .
+    . @ @ .
+    . . . .
+
+    Outline of tests:
+    ------------------
+
+    test_shortest : Check if the unconstrained path is the tie broken shortest path
+
+    test_wait : Check if a vertex constraint on the only free path forces a wait action
+
+    test_goal_constraint : Check if the goal is only accepted after the last constraint on it
+
+    test_blocked : Check if None is returned when the goal can not be reached
+
+    test_stats : Check if expanded and generated nodes are counted
+
+    test_focal : Check if focal search avoids the path of another agent within the suboptimality bound
+
+    test_focal_bound : Check if focal search does not exceed the suboptimality bound to avoid a conflict
+
+    test_conflict_table : Check the vertex, edge and goal conflicts counted by the conflict avoidance table
+
+    test_tie_breaking : Check if a conflict avoidance table selects the optimal path with the fewest conflicts
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.map = np.array([[0, 0, 0, 0],
+                             [0, 1, 1, 0],
+                             [0, 0, 0, 0]], dtype=bool)
+        self.h_values = single_agent_planner.compute_heuristics(self.map, (0, 3))
+
+    def plan(self, constraint_list, start=(0, 0), goal=(0, 3), stats=None):
+        return single_agent_planner.a_star(self.map, start, goal, self.h_values, 0, constraint_list, stats=stats)
+
+    def test_shortest(self):
+        self.assertListEqual(self.plan([]), [(0, 0), (0, 1), (0, 2), (0, 3)])
+
+    def test_wait(self):
+        corridor = np.array([[0, 0, 0, 0]], dtype=bool)
+        h_values = single_agent_planner.compute_heuristics(corridor, (0, 3))
+        path = single_agent_planner.a_star(corridor, (0, 0), (0, 3), h_values, 0,
+                                           [constraints.Constraint(False, 0, 2, (0, 2))])
+        self.assertListEqual(path, [(0, 0), (0, 1), (0, 1), (0, 2), (0, 3)])
+
+    def test_goal_constraint(self):
+        path = self.plan([constraints.Constraint(False, 0, 6, (0, 3))])
+        self.assertEqual(len(path), 8)
+        self.assertEqual(path[-1], (0, 3))
+        self.assertNotEqual(path[6], (0, 3))
+
+    def test_blocked(self):
+        self.assertIsNone(self.plan([constraints.Constraint(False, 0, 1, (0, 1)),
+                                     constraints.Constraint(False, 0, 1, (1, 0)),
+                                     constraints.Constraint(False, 0, 1, (0, 0))]))
+
+    def test_stats(self):
+        stats = search_limits.SearchStats()
+        self.plan([], stats=stats)
+        self.assertEqual(stats.expanded, 4)
+        self.assertGreaterEqual(stats.generated, stats.expanded)
+
+    def test_focal(self):
+        conflict_table = single_agent_planner.ConflictAvoidanceTable([[(0, 3), (0, 2), (0, 1), (0, 0)]])
+        stats = search_limits.SearchStats()
+        path = single_agent_planner.a_star(self.map, (0, 0), (0, 3), self.h_values, 0, [], None, stats, 2.5,
+                                           conflict_table)
+        self.assertListEqual(path, [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (1, 3), (0, 3)])
+        self.assertEqual(stats.lower_bound, 3)
+
+    def test_focal_bound(self):
+        conflict_table = single_agent_planner.ConflictAvoidanceTable([[(0, 3), (0, 2), (0, 1), (0, 0)]])
+        path = single_agent_planner.a_star(self.map, (0, 0), (0, 3), self.h_values, 0, [], None, None, 1.5,
+                                           conflict_table)
+        self.assertLessEqual(len(path) - 1, 4)
+
+    def test_conflict_table(self):
+        conflict_table = single_agent_planner.ConflictAvoidanceTable([[(0, 0), (0, 1)], [(1, 0), (0, 0)]])
+        self.assertEqual(conflict_table.conflicts((0, 1), (0, 0), 0), 1)
+        self.assertEqual(conflict_table.conflicts((0, 1), (0, 0), 1), 2)
+        self.assertEqual(conflict_table.conflicts((0, 2), (0, 1), 5), 1)
+        self.assertEqual(conflict_table.conflicts((0, 2), (0, 2), 1), 0)
+
+    def test_tie_breaking(self):
+        open_map = np.zeros((3, 3), dtype=bool)
+        h_values = single_agent_planner.compute_heuristics(open_map, (2, 2))
+        conflict_table = single_agent_planner.ConflictAvoidanceTable([[(1, 2), (0, 2), (0, 1)]])
+        path = single_agent_planner.a_star(open_map, (0, 0), (2, 2), h_values, 0, [])
+        self.assertListEqual(path, [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)])
+        stats = search_limits.SearchStats()
+        path = single_agent_planner.a_star(open_map, (0, 0), (2, 2), h_values, 0, [], None, stats,
+                                           conflict_table=conflict_table)
+        self.assertListEqual(path, [(0, 0), (0, 1), (1, 1), (1, 2), (2, 2)])
+        self.assertEqual(stats.lower_bound, 4)
@@ -0,0 +1,120 @@
+import unittest
+import glob
+import os
+import pathlib
+import math
+import numpy as np
+
+import run_experiments
+import constraints
+import sipp
+
+from single_agent_planner import a_star, compute_heuristics
+
+
+class Test_SafeIntervals(unittest.TestCase):
+    """
+    Test the conversion of blocked timesteps into safe intervals in `sipp.safe_intervals()`.
+
+    Outline of tests:
+    ------------------
+
+    test_unblocked : Check if an unconstrained location has one unbounded interval
+
+    test_blocked : Check if blocked timesteps split the intervals
+
+    test_infinite : Check if an infinite constraint bounds the final interval
+
+    test_waits : Check if timesteps at which waiting is forbidden split the intervals
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    def test_unblocked(self):
+        self.assertListEqual(sipp.safe_intervals([], None), [(0, math.inf)])
+
+    def test_blocked(self):
+        self.assertListEqual(sipp.safe_intervals([0, 2, 3, 6], None), [(0, 1), (4, 5), (7, math.inf)])
+
+    def test_infinite(self):
+        self.assertListEqual(sipp.safe_intervals([2, 9], 5), [(0, 1), (3, 4)])
+
+    def test_waits(self):
+        self.assertListEqual(sipp.safe_intervals([2], None, [1, 2, 5]), [(0, 0), (1, 1), (3, 4), (5, math.inf)])
+
+
+class Test_SIPP(unittest.TestCase):
+    """
+    Test `sipp.sipp()` against `single_agent_planner.a_star()`. For every test_*.txt instance the agents are planned
+    one after another with the constraints of the prioritized solver, where each agent is planned with both low-level
+    searches using the same constraints.
+
+    Outline of tests:
+    ------------------
+
+    test_costs : Check if both searches find paths of equal, optimal cost
+
+    test_valid : Check if the paths of sipp only contain valid moves that do not violate any constraint
+
+    test_goal_wait : Check if a constraint forbidding to wait at the goal delays reaching the goal
+
+    test_wait_arrival : Check if a later arrival that may wait is not pruned by an earlier one that may not
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+
+    @classmethod
+    def setUpClass(cls):
+        os.chdir(pathlib.Path(__file__).parent.parent.parent)
+        cls.scenarios = sorted(glob.glob("instances/test_*.txt"))
+
+    def plan(self, scenario):
+        my_map, starts, goals = run_experiments.import_mapf_instance(scenario)
+        constraint_list = []
+        for a in range(len(starts)):
+            h_values = compute_heuristics(my_map, goals[a])
+            expected = a_star(my_map, starts[a], goals[a], h_values, a, constraint_list)
+            path = sipp.sipp(my_map, starts[a], goals[a], h_values, a, constraint_list)
+            yield expected, path, constraints.ConstraintTable(constraint_list, a)
+            if expected is None:
+                continue
+            for t, path_vertex in enumerate(expected[:-1]):
+                constraint_list.append(constraints.Constraint(True, a, t + 1, path_vertex, expected[t + 1]))
+            constraint_list.append(constraints.Constraint(True, a, len(expected), expected[-1], infinite=True))
+
+    def test_costs(self):
+        for scenario in self.scenarios:
+            with self.subTest(msg=scenario):
+                for expected, path, _ in self.plan(scenario):
+                    if expected is None:
+                        self.assertIsNone(path)
+                    else:
+                        self.assertEqual(len(path), len(expected))
+
+    def test_valid(self):
+        for scenario in self.scenarios:
+            with self.subTest(msg=scenario):
+                for _, path, table in self.plan(scenario):
+                    for t in range(1, len(path or [])):
+                        self.assertLessEqual(abs(path[t][0] - path[t - 1][0]) + abs(path[t][1] - path[t - 1][1]), 1)
+                        self.assertFalse(table.is_constrained(path[t - 1], path[t], t))
+
+    def test_goal_wait(self):
+        my_map = np.zeros((1, 3), dtype=bool)
+        constraint_list = [constraints.Constraint(False, 0, 3, (0, 2), (0, 2))]
+        h_values = compute_heuristics(my_map, (0, 2))
+        path = sipp.sipp(my_map, (0, 0), (0, 2), h_values, 0, constraint_list)
+        self.assertListEqual(path, [(0, 0), (0, 1), (0, 1), (0, 2)])
+        self.assertListEqual(path, a_star(my_map, (0, 0), (0, 2), h_values, 0, constraint_list))
+
+    def test_wait_arrival(self):
+        my_map = np.array([[0, 0, 0, 0],
+                           [1, 0, 0, 1]], dtype=bool)
+        constraint_list = [constraints.Constraint(False, 0, 2, (0, 1), (0, 1)),
+                           constraints.Constraint(False, 0, 2, (0, 2))]
+        h_values = compute_heuristics(my_map, (0, 3))
+        path = sipp.sipp(my_map, (0, 0), (0, 3), h_values, 0, constraint_list)
+        self.assertListEqual(path, [(0, 0), (0, 0), (0, 1), (0, 2), (0, 3)])
+        self.assertEqual(len(path), len(a_star(my_map, (0, 0), (0, 3), h_values, 0, constraint_list)))
@@ -0,0 +1,152 @@
+import unittest
+
+import collisions
+import constraints
+import run_experiments
+import single_agent_planner
+import worker_pool
+
+from cbs import CBSSolver
+from independent import IndependentSolver
+from search_limits import SearchStats, SearchLimits, BudgetExceeded, SearchCancelled
+
+
+class Test_WorkerPool(unittest.TestCase):
+    """
+    Test the process pool `worker_pool.PlannerPool()` running low-level searches in parallel and the parallel mode of
+    CBS.
+
+    Outline of tests:
+    ------------------
+
+    test_plan_group : Check if the workers plan single agents and meta-agents like the searches of the calling process
+
+    test_aborted : Check if a search aborted by its node budget in a worker is raised by the calling process
+
+    test_cbs : Check if the parallel mode of CBS with and without speculation expands the same nodes as one process
+
+    test_seed : Check if a seeded parallel search with disjoint splitting returns the same solution on every run
+
+    test_arguments : Check if invalid numbers of workers and speculative nodes are rejected
+
+    test_heuristics : Check if heuristics computed by the workers equal those computed one after another
+
+    test_root : Check if the independent solver and the root of CBS plan the same paths with workers
+
+    test_solver_pool : Check if solvers run by the workers return the paths and counters of a solver run directly
+
+    test_cancel : Check if the tasks of a cancelled solver pool raise SearchCancelled without limits of the caller
+    """
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        self.my_map, self.starts, self.goals = run_experiments.import_mapf_instance("instances/test_30.txt")
+        self.heuristics = [single_agent_planner.compute_heuristics(self.my_map, goal) for goal in self.goals]
+
+    def test_plan_group(self):
+        tables = [constraints.ConstraintTable([constraints.Constraint(False, 0, 1, self.starts[0])], i)
+                  for i in range(len(self.goals))]
+        pool = worker_pool.PlannerPool(2, self.my_map, self.starts, self.goals, self.heuristics,
+                                       single_agent_planner.a_star)
+        try:
+            for group in ((0,), (0, 1)):
+                future = pool.submit(group, [tables[agent] for agent in group])
+                expected = worker_pool.plan_group(self.my_map, self.starts, self.goals, self.heuristics, group,
+                                                  [tables[agent] for agent in group], single_agent_planner.a_star,
+                                                  SearchStats())
+                self.assertEqual(pool.result(future), expected)
+        finally:
+            pool.close()
+
+    def test_aborted(self):
+        pool = worker_pool.PlannerPool(1, self.my_map, self.starts, self.goals, self.heuristics,
+                                       single_agent_planner.a_star)
+        limits = SearchLimits(node_budget=1)
+        try:
+            future = pool.submit((0,), [constraints.ConstraintTable([], 0)], limits)
+            with self.assertRaises(BudgetExceeded):
+                pool.result(future, limits)
+            self.assertEqual(limits.stats.expanded, 1)
+        finally:
+            pool.close()
+
+    def test_cbs(self):
+        my_map, starts, goals = run_experiments.import_mapf_instance("instances/test_47.txt")
+        sequential = CBSSolver(my_map, starts, goals, printing=False, disjoint=False)
+        expected = sequential.find_solution([])
+        for speculation in (0, 3):
+            parallel = CBSSolver(my_map, starts, goals, printing=False, disjoint=False, workers=2,
+                                 speculation=speculation, debug=True)
+            paths = parallel.find_solution([])
+            self.assertListEqual(paths, expected)
+            self.assertEqual(parallel.num_of_expanded, sequential.num_of_expanded)
+            self.assertEqual(parallel.num_of_generated, sequential.num_of_generated)
+            self.assertIsNone(parallel.pool)
+        self.assertGreater(parallel.num_of_speculations, 0)
+
+    def test_seed(self):
+        results = []
+        for _ in range(2):
+            solver = CBSSolver(self.my_map, self.starts, self.goals, printing=False, workers=2, speculation=2, seed=3)
+            paths = solver.find_solution([])
+            self.assertDictEqual(collisions.detect_collisions(paths), dict())
+            results.append((paths, solver.num_of_expanded, solver.num_of_generated))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(single_agent_planner.get_sum_of_cost(results[0][0]), 43)
+
+    def test_arguments(self):
+        with self.assertRaises(ValueError):
+            CBSSolver(self.my_map, self.starts, self.goals, printing=False, workers=0)
+        with self.assertRaises(ValueError):
+            CBSSolver(self.my_map, self.starts, self.goals, printing=False, workers=2, speculation=-1)
+        with self.assertRaises(ValueError):
+            CBSSolver(self.my_map, self.starts, self.goals, printing=False, speculation=2)
+        with self.assertRaises(ValueError):
+            CBSSolver(self.my_map, self.starts, self.goals, printing=False, workers=2, speculation=2,
+                      suboptimality=1.5)
+
+    def test_heuristics(self):
+        parallel = IndependentSolver(self.my_map, self.starts, self.goals, printing=False, cache_heuristics=False,
+                                     workers=2)
+        for table, expected in zip(parallel.heuristics, self.heuristics):
+            self.assertDictEqual(dict(table), dict(expected))
+        with self.assertRaises(ValueError):
+            IndependentSolver(self.my_map, self.starts, self.goals, printing=False, workers=0)
+
+    def test_root(self):
+        expected = IndependentSolver(self.my_map, self.starts, self.goals, printing=False).find_solution([])
+        self.assertListEqual(IndependentSolver(self.my_map, self.starts, self.goals, printing=False,
+                                               workers=2).find_solution([]), expected)
+        sequential = CBSSolver(self.my_map, self.starts, self.goals, printing=False, disjoint=False,
+                               conflict_avoidance=False)
+        parallel = CBSSolver(self.my_map, self.starts, self.goals, printing=False, disjoint=False,
+                             conflict_avoidance=False, workers=2)
+        self.assertListEqual(parallel.find_solution([]), sequential.find_solution([]))
+        self.assertEqual(parallel.num_of_expanded, sequential.num_of_expanded)
+
+    def test_solver_pool(self):
+        pool = worker_pool.SolverPool(2, self.my_map, CBSSolver, {"disjoint": False})
+        limits = SearchLimits(node_budget=1)
+        try:
+            expected = CBSSolver(self.my_map, self.starts, self.goals, printing=False, disjoint=False)
+            paths, solver_stats = pool.result(pool.submit(self.starts, self.goals))
+            self.assertListEqual(paths, expected.find_solution([]))
+            self.assertEqual(solver_stats["expanded nodes"], expected.num_of_expanded)
+            with self.assertRaises(BudgetExceeded) as error:
+                pool.result(pool.submit(self.starts, self.goals, limits=limits), limits)
+            self.assertIn("expanded nodes", error.exception.solver_stats)
+            self.assertGreaterEqual(limits.stats.expanded, 1)
+        finally:
+            pool.close()
+
+    def test_cancel(self):
+        pool = worker_pool.SolverPool(1, self.my_map, CBSSolver, {"disjoint": False}, cancellable=True)
+        try:
+            pool.cancel()
+            with self.assertRaises(SearchCancelled) as error:
+                pool.result(pool.submit(self.starts, self.goals))
+            self.assertIn("expanded nodes", error.exception.solver_stats)
+        finally:
+            pool.close()
+        with self.assertRaises(ValueError):
+            worker_pool.SolverPool(1, self.my_map, CBSSolver).cancel()
@@ -3,6 +3,8 @@ import matplotlib.lines as mline  # type: ignore
 import numpy as np  # type: ignore
 import math
 
+import map_graph
+
 
 def fov(agent: tuple[int, int], view_radius: int, my_map: np.ndarray[int]) -> list[tuple[int, int]]:
     """
@@ -32,8 +34,8 @@ def fov(agent: tuple[int, int], view_radius: int, my_map: np.ndarray[int]) -> li
 
     points_in_vision = []
 
-    # Store the location of the obstacles as tuples in a list
-    obstacles = [tuple(el) for el in np.argwhere(my_map == 1)]
+    # Walls are looked up in the shared preprocessed map, points outside the map are not walls
+    graph = map_graph.get(my_map) if my_map is not None else None
 
     # Evaluate all points based on the view radius. 
     for i in range(-view_radius, view_radius + 1):
@@ -48,7 +50,7 @@ def fov(agent: tuple[int, int], view_radius: int, my_map: np.ndarray[int]) -> li
 
                 point = (agent[0] + j, agent[1] + i)
 
-                if point not in obstacles:
+                if graph is None or not graph.is_wall(point):
                     points_in_vision.append(point)
 
     return points_in_vision
@@ -0,0 +1,475 @@
+"""
+Process pools running the low-level searches or complete solvers of a problem in parallel. The map, the start and goal
+locations, the heuristics and the low-level search of a problem are handed to every worker process once by the
+initializer of the pool, afterwards a task only carries what differs between two searches: the planned agents, their
+constraint tables and the paths of the other agents to avoid. Results are returned through futures, so the caller
+decides in which order they are used and the outcome does not depend on which worker finishes first.
+"""
+import concurrent.futures
+import multiprocessing
+import time as timer
+import typing
+from collections import abc
+import numpy.typing as npt
+
+import constraints
+import joint_planner
+from search_limits import SearchStats, SearchLimits, SearchAborted, CancellationToken
+from single_agent_planner import ConflictAvoidanceTable
+
+# problem of the worker process, filled once by init_worker
+_problem: dict[str, typing.Any] = dict()
+
+
+def plan_agent(my_map: npt.NDArray[bool],
+               start: tuple[int, int],
+               goal: tuple[int, int],
+               h_values: abc.Mapping[tuple[int, int], int],
+               agent: int,
+               table: constraints.ConstraintTable,
+               low_level: abc.Callable[..., typing.Optional[list[tuple[int, int]]]],
+               stats: SearchStats,
+               limits: typing.Optional[SearchLimits] = None,
+               suboptimality: float = 1.0,
+               other_paths: typing.Optional[list[list[tuple[int, int]]]] = None
+               ) -> typing.Optional[list[tuple[int, int]]]:
+    """
+        Plans the path of a single agent under its constraint table. With a suboptimality above 1 the low-level search
+        is run as focal search, otherwise the paths of the other agents only break ties between optimal paths if they
+        are given.
+
+    :param my_map:          {np.ndarray}    binary obstacle map
+    :param start:           {tuple}         start location of the agent
+    :param goal:            {tuple}         goal location of the agent
+    :param h_values:        {dict}          heuristic values of the agent indexed by location
+    :param agent:           {int}           index of the agent
+    :param table:           {ConstraintTable}   constraints of the agent
+    :param low_level:       {function}      low-level search, single_agent_planner.a_star or sipp.sipp
+    :param stats:           {SearchStats}   counters of the low-level search, receive the lower bound on the path cost
+    :param limits:          {SearchLimits}  optional limits passed on to the low-level search
+    :param suboptimality:   {float}         suboptimality factor of the focal search
+    :param other_paths:     {list}          paths of all agents used for conflict avoidance, None to not avoid them
+
+    :return:                {list}          path of the agent
+    :return:                {None}          no path exists
+    """
+    conflict_table = None
+    if other_paths is not None:
+        conflict_table = ConflictAvoidanceTable(path for i, path in enumerate(other_paths) if i != agent)
+    if suboptimality > 1:
+        return low_level(my_map, start, goal, h_values, agent, [], table, stats=stats, suboptimality=suboptimality,
+                         conflict_table=conflict_table, limits=limits)
+    if conflict_table is not None:
+        path = low_level(my_map, start, goal, h_values, agent, [], table, conflict_table=conflict_table,
+                         limits=limits)
+    else:
+        path = low_level(my_map, start, goal, h_values, agent, [], table, limits=limits)
+    if path is not None:
+        stats.lower_bound = len(path) - 1
+    return path
+
+
+def plan_group(my_map: npt.NDArray[bool],
+               starts: list[tuple[int, int]],
+               goals: list[tuple[int, int]],
+               heuristics: list[abc.Mapping[tuple[int, int], int]],
+               group: tuple[int, ...],
+               tables: list[constraints.ConstraintTable],
+               low_level: abc.Callable[..., typing.Optional[list[tuple[int, int]]]],
+               stats: SearchStats,
+               limits: typing.Optional[SearchLimits] = None,
+               suboptimality: float = 1.0,
+               other_paths: typing.Optional[list[list[tuple[int, int]]]] = None
+               ) -> typing.Optional[tuple[list[list[tuple[int, int]]], list[int]]]:
+    """
+        Plans a meta-agent, a single agent with plan_agent and larger groups jointly with joint_planner.joint_a_star
+
+    :param my_map:          {np.ndarray}    binary obstacle map
+    :param starts:          {list}          start location of every agent of the problem
+    :param goals:           {list}          goal location of every agent of the problem
+    :param heuristics:      {list}          heuristic values of every agent of the problem
+    :param group:           {tuple}         agents of the meta-agent
+    :param tables:          {list}          constraint table of every agent of the group
+    :param low_level:       {function}      low-level search of single agents
+    :param stats:           {SearchStats}   counters of the low-level search
+    :param limits:          {SearchLimits}  optional limits passed on to the low-level search
+    :param suboptimality:   {float}         suboptimality factor of the focal search of single agents
+    :param other_paths:     {list}          paths of all agents used for conflict avoidance of single agents or None
+
+    :return:                {tuple}         path and lower bound on the path cost of every agent of the group
+    :return:                {None}          the group has no paths under its constraints
+    """
+    if len(group) == 1:
+        path = plan_agent(my_map, starts[group[0]], goals[group[0]], heuristics[group[0]], group[0], tables[0],
+                          low_level, stats, limits, suboptimality, other_paths)
+        return ([path], [stats.lower_bound]) if path else None
+    paths = joint_planner.joint_a_star(my_map, [starts[agent] for agent in group], [goals[agent] for agent in group],
+                                       [heuristics[agent] for agent in group], tables, stats, limits)
+    return (paths, [len(path) - 1 for path in paths]) if paths is not None else None
+
+
+def limit_arguments(limits: typing.Optional[SearchLimits]) -> tuple[typing.Optional[int], typing.Optional[float]]:
+    """
+        Translates the limits of the caller into the node budget and time limit of a task started now
+
+    :param limits:  {SearchLimits}  limits of the caller or None
+
+    :return:        {tuple}         remaining node budget and seconds until the deadline, None if not limited
+    """
+    node_budget, time_limit = None, None
+    if limits is not None and limits.node_budget is not None:
+        node_budget = max(limits.node_budget - limits.stats.expanded, 0)
+    if limits is not None and limits.deadline is not None:
+        time_limit = limits.deadline - timer.perf_counter()
+    return node_budget, time_limit
+
+
+def init_worker(my_map: npt.NDArray[bool],
+                starts: list[tuple[int, int]],
+                goals: list[tuple[int, int]],
+                heuristics: list[abc.Mapping[tuple[int, int], int]],
+                low_level: abc.Callable[..., typing.Optional[list[tuple[int, int]]]]) -> None:
+    """
+        Initializer of the worker processes storing the problem shared by all tasks
+
+    :param my_map:      {np.ndarray}    binary obstacle map
+    :param starts:      {list}          start location of every agent
+    :param goals:       {list}          goal location of every agent
+    :param heuristics:  {list}          heuristic values of every agent
+    :param low_level:   {function}      low-level search of single agents
+    """
+    _problem.update(my_map=my_map, starts=starts, goals=goals, heuristics=heuristics, low_level=low_level)
+
+
+def init_heuristics_worker(my_map: npt.NDArray[bool],
+                           heuristics_func: abc.Callable[[npt.NDArray[bool], tuple[int, int]],
+                                                         abc.Mapping[tuple[int, int], int]]) -> None:
+    """
+        Initializer of the worker processes of map_heuristics storing the map and the heuristics function
+
+    :param my_map:          {np.ndarray}    binary obstacle map
+    :param heuristics_func: {function}      heuristics function
+    """
+    _problem.update(my_map=my_map, heuristics_func=heuristics_func)
+
+
+def run_heuristics(goal: tuple[int, int]) -> abc.Mapping[tuple[int, int], int]:
+    """
+        Task of a worker process computing the heuristics of a goal on the map given to init_heuristics_worker
+
+    :param goal:    {tuple}     goal location
+
+    :return:        {dict}      heuristic values indexed by location
+    """
+    return _problem["heuristics_func"](_problem["my_map"], goal)
+
+
+def map_heuristics(my_map: npt.NDArray[bool],
+                   goals: list[tuple[int, int]],
+                   heuristics_func: abc.Callable[[npt.NDArray[bool], tuple[int, int]],
+                                                 abc.Mapping[tuple[int, int], int]],
+                   workers: int) -> list[abc.Mapping[tuple[int, int], int]]:
+    """
+        Computes the heuristics of several goals in a pool of worker processes that receive the map once. The
+        heuristics function has to be picklable, so a module level function and not a lambda.
+
+    :param my_map:          {np.ndarray}    binary obstacle map
+    :param goals:           {list}          goal locations
+    :param heuristics_func: {function}      heuristics function
+    :param workers:         {int}           maximum number of worker processes
+
+    :return:                {list}          heuristic values of every goal in the order of the goals
+    """
+    if len(goals) == 0:
+        return []
+    workers = min(workers, len(goals))
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_heuristics_worker,
+                                                initargs=(my_map, heuristics_func)) as executor:
+        return list(executor.map(run_heuristics, goals, chunksize=max(len(goals) // (4 * workers), 1)))
+
+
+def run_plan_group(group: tuple[int, ...],
+                   tables: list[constraints.ConstraintTable],
+                   suboptimality: float,
+                   other_paths: typing.Optional[list[list[tuple[int, int]]]],
+                   node_budget: typing.Optional[int],
+                   time_limit: typing.Optional[float],
+                   limited: bool) -> tuple:
+    """
+        Task of a worker process planning a meta-agent of the problem given to init_worker. A search aborted by its
+        limits is not raised, as the exceptions carry their statistics which are not restored when unpickled, but
+        returned as exception class and message.
+
+    :param group:           {tuple}     agents of the meta-agent
+    :param tables:          {list}      constraint table of every agent of the group
+    :param suboptimality:   {float}     suboptimality factor of the focal search of single agents
+    :param other_paths:     {list}      paths of all agents used for conflict avoidance or None
+    :param node_budget:     {int}       low-level nodes the search may expand or None
+    :param time_limit:      {float}     seconds the search may take or None
+    :param limited:         {bool}      flag if the search of the caller has limits, the nodes are only counted then
+
+    :return:                {tuple}     result of plan_group, expanded and generated nodes and the class and message
+                                        of the SearchAborted exception or None
+    """
+    limits = SearchLimits(node_budget, time_limit) if limited else None
+    stats = SearchStats()
+    try:
+        result = plan_group(_problem["my_map"], _problem["starts"], _problem["goals"], _problem["heuristics"], group,
+                            tables, _problem["low_level"], stats, limits, suboptimality, other_paths)
+    except SearchAborted as error:
+        return None, error.stats.expanded, error.stats.generated, (type(error), str(error))
+    if limits is None:
+        return result, 0, 0, None
+    return result, limits.stats.expanded, limits.stats.generated, None
+
+
+class PlannerPool:
+    """
+        Pool of worker processes planning meta-agents of a single problem in parallel. The limits of the caller are
+        translated into a node budget and a time limit of every task, tasks running at the same time may therefore
+        together expand more nodes than the budget allows before the caller notices. Cancellation tokens are only
+        checked by the caller between tasks.
+
+    :param executor:    {ProcessPoolExecutor}   pool of worker processes initialized with the problem
+    :param workers:     {int}                   number of worker processes
+    """
+
+    def __init__(self,
+                 workers: int,
+                 my_map: npt.NDArray[bool],
+                 starts: list[tuple[int, int]],
+                 goals: list[tuple[int, int]],
+                 heuristics: list[abc.Mapping[tuple[int, int], int]],
+                 low_level: abc.Callable[..., typing.Optional[list[tuple[int, int]]]]) -> None:
+        """
+            Initialization function of the PlannerPool, starting the worker processes
+
+        :param workers:     {int}           number of worker processes
+        :param my_map:      {np.ndarray}    binary obstacle map
+        :param starts:      {list}          start location of every agent
+        :param goals:       {list}          goal location of every agent
+        :param heuristics:  {list}          heuristic values of every agent
+        :param low_level:   {function}      low-level search of single agents
+        """
+        self.workers = workers
+        self.executor = concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker,
+                                                               initargs=(my_map, starts, goals, heuristics, low_level))
+
+    def submit(self,
+               group: tuple[int, ...],
+               tables: list[constraints.ConstraintTable],
+               limits: typing.Optional[SearchLimits] = None,
+               suboptimality: float = 1.0,
+               other_paths: typing.Optional[list[list[tuple[int, int]]]] = None) -> concurrent.futures.Future:
+        """
+            Submits the planning of a meta-agent, see plan_group
+
+        :param group:           {tuple}         agents of the meta-agent
+        :param tables:          {list}          constraint table of every agent of the group
+        :param limits:          {SearchLimits}  optional limits of the caller, the remaining node budget and time are
+                                                passed on to the task
+        :param suboptimality:   {float}         suboptimality factor of the focal search of single agents
+        :param other_paths:     {list}          paths of all agents used for conflict avoidance or None
+
+        :return:                {Future}        future of the task, to be passed to result
+        """
+        node_budget, time_limit = limit_arguments(limits)
+        return self.executor.submit(run_plan_group, group, tables, suboptimality, other_paths, node_budget,
+                                    time_limit, limits is not None)
+
+    @staticmethod
+    def result(future: concurrent.futures.Future,
+               limits: typing.Optional[SearchLimits] = None
+               ) -> typing.Optional[tuple[list[list[tuple[int, int]]], list[int]]]:
+        """
+            Waits for a task and adds its nodes to the limits of the caller
+
+        :param future:  {Future}        future returned by submit
+        :param limits:  {SearchLimits}  limits of the caller passed to submit
+
+        :return:        {tuple}         path and lower bound on the path cost of every agent of the group
+        :return:        {None}          the group has no paths under its constraints
+
+        :raise:                         SearchAborted
+        """
+        result, expanded, generated, error = future.result()
+        if limits is not None:
+            limits.record(expanded, generated)
+            if error is not None:
+                error_type, message = error
+                raise error_type(message, limits.snapshot())
+        return result
+
+    def plan_agents(self,
+                    tables: list[constraints.ConstraintTable],
+                    limits: typing.Optional[SearchLimits] = None
+                    ) -> list[typing.Optional[tuple[list[list[tuple[int, int]]], list[int]]]]:
+        """
+            Plans every agent of the problem on its own under its constraint table, without conflict avoidance. All
+            searches are submitted at once and the results are collected in the order of the agents.
+
+        :param tables:  {list}          constraint table of every agent
+        :param limits:  {SearchLimits}  optional limits of the caller
+
+        :return:        {list}          result of plan_group of every agent
+
+        :raise:                         SearchAborted
+        """
+        futures = [self.submit((agent,), [table], limits) for agent, table in enumerate(tables)]
+        return [self.result(future, limits) for future in futures]
+
+    def close(self) -> None:
+        """
+            Cancels the tasks that did not start yet and stops the worker processes once the running tasks finished
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def init_solver_worker(my_map: npt.NDArray[bool],
+                       solver: type,
+                       solver_kwargs: dict[str, typing.Any],
+                       event: typing.Optional[typing.Any] = None) -> None:
+    """
+        Initializer of the worker processes of a SolverPool storing the map and the solver shared by all tasks
+
+    :param my_map:          {np.ndarray}    binary obstacle map
+    :param solver:          {type}          solver class derived from base_solver.BaseSolver
+    :param solver_kwargs:   {dict}          keyword arguments of every solver instance
+    :param event:           {Event}         multiprocessing.Event set by the pool to cancel the running tasks or None
+    """
+    _problem.update(my_map=my_map, solver=solver, solver_kwargs=solver_kwargs,
+                    token=CancellationToken(event) if event is not None else None)
+
+
+def run_solver(starts: list[tuple[int, int]],
+               goals: list[tuple[int, int]],
+               base_constraints: list[constraints.Constraint],
+               node_budget: typing.Optional[int],
+               time_limit: typing.Optional[float],
+               limited: bool,
+               kwargs: dict[str, typing.Any]) -> tuple:
+    """
+        Task of a worker process solving a problem on the map given to init_solver_worker. Aborted searches are
+        returned like in run_plan_group, a solver finding no solution raises its exception through the future. The
+        searches of a cancellable pool check its token even if the caller has no limits.
+
+    :param starts:              {list}      start location of every agent
+    :param goals:               {list}      goal location of every agent
+    :param base_constraints:    {list}      constraints passed to find_solution
+    :param node_budget:         {int}       low-level nodes the solver may expand or None
+    :param time_limit:          {float}     seconds the solver may take or None
+    :param limited:             {bool}      flag if the caller has limits, the nodes are only counted then
+    :param kwargs:              {dict}      keyword arguments of this solver instance on top of those of the pool
+
+    :return:                    {tuple}     paths, solver_stats of the solver, expanded and generated nodes and the
+                                            class and message of the SearchAborted exception or None
+    """
+    token = _problem["token"]
+    limits = SearchLimits(node_budget, time_limit, token=token) if limited or token is not None else None
+    solver = _problem["solver"](_problem["my_map"], starts, goals, **{**_problem["solver_kwargs"], **kwargs})
+    try:
+        paths = solver.find_solution(base_constraints, limits)
+    except SearchAborted as error:
+        return None, error.solver_stats, error.stats.expanded, error.stats.generated, (type(error), str(error))
+    if limits is None:
+        return paths, solver.solver_stats(), 0, 0, None
+    return paths, solver.solver_stats(), limits.stats.expanded, limits.stats.generated, None
+
+
+class SolverPool:
+    """
+        Pool of worker processes running complete solvers on sub-problems of the same map in parallel, for example the
+        agent groups of independence detection or differently ordered prioritized solvers. The limits of the caller
+        are passed on as in PlannerPool. Worker processes are forked from the caller where available and then find the
+        heuristics computed by the caller in the heuristics cache. A cancellable pool shares a cancellation token with
+        its workers, which stops the tasks that are already running as well.
+
+    :param executor:    {ProcessPoolExecutor}   pool of worker processes initialized with the map and the solver
+    :param workers:     {int}                   number of worker processes
+    :param token:       {CancellationToken}     token checked by the searches of all tasks, None if not cancellable
+    """
+
+    def __init__(self,
+                 workers: int,
+                 my_map: npt.NDArray[bool],
+                 solver: type,
+                 solver_kwargs: typing.Optional[dict[str, typing.Any]] = None,
+                 cancellable: bool = False) -> None:
+        """
+            Initialization function of the SolverPool, starting the worker processes
+
+        :param workers:         {int}           number of worker processes
+        :param my_map:          {np.ndarray}    binary obstacle map
+        :param solver:          {type}          solver class derived from base_solver.BaseSolver
+        :param solver_kwargs:   {dict}          keyword arguments of every solver instance, printing is disabled
+        :param cancellable:     {bool}          flag to share a cancellation token with the workers, see cancel
+        """
+        self.workers = workers
+        self.token = CancellationToken(multiprocessing.Event()) if cancellable else None
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=init_solver_worker,
+            initargs=(my_map, solver, {"printing": False, **(solver_kwargs or dict())},
+                      self.token.event if self.token is not None else None))
+
+    def submit(self,
+               starts: list[tuple[int, int]],
+               goals: list[tuple[int, int]],
+               base_constraints: typing.Optional[list[constraints.Constraint]] = None,
+               limits: typing.Optional[SearchLimits] = None,
+               **kwargs) -> concurrent.futures.Future:
+        """
+            Submits a problem to solve
+
+        :param starts:              {list}          start location of every agent
+        :param goals:               {list}          goal location of every agent
+        :param base_constraints:    {list}          constraints passed to find_solution
+        :param limits:              {SearchLimits}  optional limits of the caller
+        :param kwargs:              {dict}          keyword arguments of this solver instance
+
+        :return:                    {Future}        future of the task, to be passed to result
+        """
+        node_budget, time_limit = limit_arguments(limits)
+        return self.executor.submit(run_solver, starts, goals, base_constraints or [], node_budget, time_limit,
+                                    limits is not None, kwargs)
+
+    @staticmethod
+    def result(future: concurrent.futures.Future,
+               limits: typing.Optional[SearchLimits] = None
+               ) -> tuple[list[list[tuple[int, int]]], dict[str, typing.Any]]:
+        """
+            Waits for a task and adds its nodes to the limits of the caller
+
+        :param future:  {Future}        future returned by submit
+        :param limits:  {SearchLimits}  limits of the caller passed to submit
+
+        :return:        {tuple}         paths of all agents and solver_stats of the solver
+
+        :raise:                         SearchAborted
+        :raise:                         BaseException
+        """
+        paths, solver_stats, expanded, generated, error = future.result()
+        if limits is not None:
+            limits.record(expanded, generated)
+        if error is not None:
+            error_type, message = error
+            aborted = error_type(message, limits.snapshot() if limits is not None else SearchStats())
+            aborted.solver_stats = solver_stats
+            raise aborted
+        return paths, solver_stats
+
+    def cancel(self) -> None:
+        """
+            Aborts the running tasks and those starting afterwards with a SearchCancelled exception, which is raised by
+            result. Only possible for a cancellable pool.
+
+        :raise: ValueError
+        """
+        if self.token is None:
+            raise ValueError("the pool was not created cancellable")
+        self.token.cancel()
+
+    def close(self) -> None:
+        """
+            Cancels the tasks that did not start yet and stops the worker processes once the running tasks finished
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)